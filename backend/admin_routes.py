@@ -0,0 +1,188 @@
+"""Administrative routes for the FastAPI application.
+
+This module defines API endpoints used to operate the system, such as inspecting the
+database connection pool and repairing derived data. Every route requires an authenticated administrator.
+"""
+
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.agregados import incrementar_versoes, reconstruir_contadores
+from backend.database import engines_replicas, estatisticas_pool
+from backend.dependencies import cache_principais, pegar_sessao, verificar_admin
+from backend.exportacao import FORMATOS_COLUNARES, ExportacaoColunar, pedidos_ndjson
+from backend.models import ItemPedido, Pedido, ResumoVendas
+
+admin_router = APIRouter(
+    prefix="/admin", tags=["admin"], dependencies=[Depends(verificar_admin)]
+)
+
+
+@admin_router.get("/banco/pool")
+async def visualizar_pool():
+    """Mostra o uso do pool de conexões do banco de dados.
+
+    Returns:
+        dict: Tamanho do pool, conexões em uso, overflow e estatísticas de espera por conexão,
+        com as mesmas estatísticas para cada réplica de leitura em `replicas`.
+    """
+    return {
+        **estatisticas_pool(),
+        "replicas": [estatisticas_pool(replica) for replica in engines_replicas],
+    }
+
+
+@admin_router.get("/cache/usuarios")
+async def visualizar_cache_usuarios():
+    """Mostra o uso do cache de usuários autenticados de `verificar_token`.
+
+    Returns:
+        dict: Quantidade de entradas, hits, misses, evictions e invalidações do cache.
+    """
+    return cache_principais.estatisticas()
+
+
+@admin_router.get("/vendas/resumo")
+async def resumo_vendas(
+    agrupar_por: list[Literal["sabor", "tamanho", "status"]] = Query(
+        default=["sabor", "tamanho", "status"]
+    ),
+    status: str | None = None,
+    sabor: str | None = None,
+    tamanho: str | None = None,
+    session: AsyncSession = Depends(pegar_sessao),
+):
+    """Mostra quantidade e receita de vendas agrupadas por sabor, tamanho e/ou status.
+
+    Lê a tabela `resumo_vendas`, mantida pelas rotas de pedidos, então o custo depende
+    apenas do número de grupos e não do número de itens.
+
+    Args:
+        agrupar_por (list[str], optional): Dimensões do agrupamento. Por padrão, as três.
+        status (str, optional): Considera apenas pedidos com este status.
+        sabor (str, optional): Considera apenas itens deste sabor.
+        tamanho (str, optional): Considera apenas itens deste tamanho.
+        session (AsyncSession, optional): A sessão do banco de dados. Injetada por dependência.
+
+    Returns:
+        dict: Os grupos, ordenados por receita, e os totais gerais.
+    """
+    dimensoes = [ResumoVendas.__table__.c[nome] for nome in dict.fromkeys(agrupar_por)]
+    somas = [
+        func.sum(ResumoVendas.quantidade).label("quantidade"),
+        func.sum(ResumoVendas.receita).label("receita"),
+        func.sum(ResumoVendas.itens).label("itens"),
+    ]
+    filtros = [
+        coluna == valor
+        for coluna, valor in (
+            (ResumoVendas.status, status),
+            (ResumoVendas.sabor, sabor),
+            (ResumoVendas.tamanho, tamanho),
+        )
+        if valor is not None
+    ]
+    consulta = (
+        select(*dimensoes, *somas)
+        .where(*filtros)
+        .group_by(*dimensoes)
+        .having(func.sum(ResumoVendas.itens) > 0)
+        .order_by(func.sum(ResumoVendas.receita).desc())
+    )
+    grupos = [dict(linha._mapping) for linha in await session.execute(consulta)]
+    return {
+        "grupos": grupos,
+        "totais": {
+            nome: sum(grupo[nome] for grupo in grupos)
+            for nome in ("quantidade", "receita", "itens")
+        },
+    }
+
+
+@admin_router.get("/pedidos/exportar")
+async def exportar_pedidos():
+    """Exporta todos os pedidos com seus itens em NDJSON (um pedido por linha).
+
+    A resposta é enviada em streaming enquanto o banco é lido em lotes, então o uso de
+    memória não cresce com o tamanho da tabela e os primeiros bytes chegam imediatamente.
+    A exportação usa a própria conexão, independente da sessão da requisição.
+
+    Returns:
+        StreamingResponse: Os pedidos em `application/x-ndjson`, ordenados por ID.
+    """
+    return StreamingResponse(pedidos_ndjson(), media_type="application/x-ndjson")
+
+
+@admin_router.get("/exportar/{tabela}")
+async def exportar_tabela_colunar(
+    tabela: Literal["pedidos", "itens_pedido"],
+    formato: Literal["parquet", "arrow"] = "parquet",
+    apos_id: int = 0,
+):
+    """Exporta uma tabela em Parquet ou Arrow IPC, gerada em lotes direto do cursor do banco.
+
+    Args:
+        tabela (str): "pedidos" ou "itens_pedido".
+        formato (str, optional): "parquet" (padrão) ou "arrow" (formato de stream IPC).
+        apos_id (int, optional): Exporta apenas linhas com ID maior, para exportações incrementais.
+
+    Returns:
+        StreamingResponse: O arquivo exportado, enviado à medida que é gerado.
+    """
+    extensao, tipo_midia = FORMATOS_COLUNARES[formato]
+    exportacao = ExportacaoColunar(tabela, formato, apos_id)
+    return StreamingResponse(
+        exportacao.blocos(),
+        media_type=tipo_midia,
+        headers={"Content-Disposition": f'attachment; filename="{tabela}.{extensao}"'},
+    )
+
+
+@admin_router.post("/pedidos/recalcular-precos")
+async def recalcular_precos(
+    id_pedido: int | None = None, session: AsyncSession = Depends(pegar_sessao)
+):
+    """Recalcula o preço dos pedidos a partir dos itens, corrigindo qualquer divergência.
+
+    As rotas de itens mantêm `Pedido.preco` somando apenas a diferença de cada item; esta
+    rota refaz a soma completa em um único UPDATE e só altera os pedidos divergentes. Os
+    contadores de pedidos dos donos dos pedidos corrigidos são recalculados em seguida.
+
+    Args:
+        id_pedido (int, optional): Recalcula apenas este pedido. Por padrão, todos.
+        session (AsyncSession, optional): A sessão do banco de dados. Injetada por dependência.
+
+    Returns:
+        dict: Uma mensagem de sucesso e a quantidade de pedidos corrigidos.
+    """
+    total_itens = (
+        select(
+            func.coalesce(
+                func.sum(ItemPedido.quantidade * ItemPedido.preco_unitario), 0
+            )
+        )
+        .where(ItemPedido.pedido == Pedido.id)
+        .scalar_subquery()
+    )
+    comando = (
+        update(Pedido)
+        .where(Pedido.preco.is_distinct_from(total_itens))
+        .values(preco=total_itens, versao=Pedido.versao + 1)
+        .returning(Pedido.usuario)
+        .execution_options(synchronize_session=False)
+    )
+    if id_pedido is not None:
+        comando = comando.where(Pedido.id == id_pedido)
+    usuarios = (await session.scalars(comando)).all()
+    if usuarios:
+        await reconstruir_contadores(session, set(usuarios))
+        await incrementar_versoes(session, usuarios)
+    await session.commit()
+    return {
+        "mensagem": "Preços dos pedidos recalculados com sucesso",
+        "pedidos_corrigidos": len(usuarios),
+    }
@@ -0,0 +1,310 @@
+"""Incrementally maintained aggregates of orders and items.
+
+The order routes call these helpers inside their own transactions, so the aggregate
+tables change atomically with the rows they summarize. Updates are additive upserts
+(`INSERT ... ON CONFLICT DO UPDATE SET x = x + excluded.x`) and never read the rows
+being summarized one by one. `reconstruir_agregados` recomputes every table from
+scratch, e.g. after bulk loads that bypass the routes:
+
+    python -m backend.agregados
+"""
+
+import asyncio
+import json
+from collections.abc import Iterable
+
+from sqlalchemy import Table, delete, func, literal, select, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.database import SessionLocal, engine
+from backend.models import ContadorPedidos, ItemPedido, Pedido, ResumoVendas, Usuario
+
+_INSERTS_POR_DIALETO = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+    "mysql": mysql.insert,
+}
+
+
+def _insert_acumulando(session: AsyncSession, tabela: Table, chaves: list[str]):
+    """Builds an INSERT that adds its values to the existing row with the same key.
+
+    Args:
+        session (AsyncSession): The session whose dialect the statement targets.
+        tabela (Table): The aggregate table.
+        chaves (list[str]): The primary key columns; every other column is summed.
+
+    Returns:
+        Insert: The dialect-specific upsert statement.
+    """
+    dialeto = session.bind.dialect.name
+    comando = _INSERTS_POR_DIALETO[dialeto](tabela)
+    if dialeto == "mysql":
+        novos = comando.inserted
+    else:
+        novos = comando.excluded
+    somas = {
+        coluna.name: coluna + novos[coluna.name]
+        for coluna in tabela.columns
+        if coluna.name not in chaves
+    }
+    if dialeto == "mysql":
+        return comando.on_duplicate_key_update(somas)
+    return comando.on_conflict_do_update(index_elements=chaves, set_=somas)
+
+
+_CHAVES_VENDAS = ["sabor", "tamanho", "status"]
+_COLUNAS_VENDAS = [*_CHAVES_VENDAS, "quantidade", "receita", "itens"]
+
+
+async def somar_vendas(
+    session: AsyncSession,
+    status: str,
+    adicionados: Iterable = (),
+    removidos: Iterable = (),
+):
+    """Adds and subtracts items in the sales summary of one order status.
+
+    Items of the same flavor and size are combined first, so the summary is touched
+    with a single statement whatever the number of items.
+
+    Args:
+        session (AsyncSession): The session of the transaction changing the items.
+        status (str): The status of the order the items belong to.
+        adicionados (Iterable, optional): Items added to the order.
+        removidos (Iterable, optional): Items removed from the order.
+
+    Items are any objects with `sabor`, `tamanho`, `quantidade` and `preco_unitario`.
+    """
+    grupos = {}
+    for sinal, itens in ((1, adicionados), (-1, removidos)):
+        for item in itens:
+            grupo = grupos.setdefault(
+                (item.sabor, item.tamanho),
+                {
+                    "sabor": item.sabor,
+                    "tamanho": item.tamanho,
+                    "status": status,
+                    "quantidade": 0,
+                    "receita": 0.0,
+                    "itens": 0,
+                },
+            )
+            grupo["quantidade"] += sinal * item.quantidade
+            grupo["receita"] += sinal * item.quantidade * item.preco_unitario
+            grupo["itens"] += sinal
+    if grupos:
+        await session.execute(
+            _insert_acumulando(session, ResumoVendas.__table__, _CHAVES_VENDAS),
+            list(grupos.values()),
+        )
+
+
+def _vendas_dos_pedidos(condicoes: list, status: str | None = None, sinal: int = 1):
+    """Builds a SELECT summing the items of the matching orders per summary group.
+
+    Args:
+        condicoes (list): WHERE clauses on `Pedido` selecting the orders.
+        status (str, optional): Report every group under this status instead of the order's own.
+        sinal (int, optional): -1 to negate the sums, for removing them from the summary.
+
+    Returns:
+        Select: Rows shaped like `resumo_vendas`.
+    """
+    grupo = [ItemPedido.sabor, ItemPedido.tamanho]
+    if status is None:
+        grupo.append(Pedido.status)
+    return (
+        select(
+            *grupo[:2],
+            (Pedido.status if status is None else literal(status)).label("status"),
+            sinal * func.sum(ItemPedido.quantidade),
+            sinal * func.sum(ItemPedido.quantidade * ItemPedido.preco_unitario),
+            sinal * func.count(),
+        )
+        .join(Pedido, ItemPedido.pedido == Pedido.id)
+        .where(*condicoes)
+        .group_by(*grupo)
+    )
+
+
+_CHAVES_CONTADORES = ["usuario", "status"]
+_COLUNAS_CONTADORES = [*_CHAVES_CONTADORES, "pedidos", "preco_total"]
+
+
+async def somar_contadores(
+    session: AsyncSession,
+    usuario: int,
+    status: str,
+    pedidos: int = 0,
+    preco: float = 0.0,
+):
+    """Adds orders and/or price to a user's counters for one status.
+
+    Args:
+        session (AsyncSession): The session of the transaction changing the orders.
+        usuario (int): The user owning the orders.
+        status (str): The status of the orders.
+        pedidos (int, optional): Orders created (negative when removed). Defaults to 0.
+        preco (float, optional): Change of the orders' total price. Defaults to 0.
+    """
+    await session.execute(
+        _insert_acumulando(session, ContadorPedidos.__table__, _CHAVES_CONTADORES),
+        {
+            "usuario": usuario,
+            "status": status,
+            "pedidos": pedidos,
+            "preco_total": preco,
+        },
+    )
+
+
+def _contadores_dos_pedidos(condicoes: list, status: str | None = None, sinal: int = 1):
+    """Builds a SELECT counting the matching orders per user and status.
+
+    Args:
+        condicoes (list): WHERE clauses on `Pedido` selecting the orders.
+        status (str, optional): Report every group under this status instead of the order's own.
+        sinal (int, optional): -1 to negate the sums, for removing them from the counters.
+
+    Returns:
+        Select: Rows shaped like `contadores_pedidos`.
+    """
+    grupo = [Pedido.usuario]
+    if status is None:
+        grupo.append(Pedido.status)
+    return (
+        select(
+            Pedido.usuario,
+            (Pedido.status if status is None else literal(status)).label("status"),
+            sinal * func.count(),
+            sinal * func.coalesce(func.sum(Pedido.preco), 0),
+        )
+        .where(*condicoes)
+        .group_by(*grupo)
+    )
+
+
+async def mover_status(session: AsyncSession, condicoes: list, status_novo: str):
+    """Moves the matching orders to a new status in every aggregate.
+
+    Must run before the orders' status is changed, in the same transaction. The
+    matching orders are locked first (`SELECT ... FOR UPDATE`, a no-op on SQLite,
+    which serializes writers anyway), so a concurrent request cannot change them
+    between the moves and the caller's UPDATE. Every other statement is set-based
+    (`INSERT ... SELECT`), so the cost does not depend on the number of orders being
+    changed.
+
+    Args:
+        session (AsyncSession): The session of the transaction changing the status.
+        condicoes (list): WHERE clauses on `Pedido` selecting the orders being changed.
+        status_novo (str): The status the orders are moving to.
+    """
+    await session.execute(select(Pedido.id).where(*condicoes).with_for_update())
+    condicoes = [*condicoes, Pedido.status.is_distinct_from(status_novo)]
+    movimentos = (
+        (ResumoVendas, _CHAVES_VENDAS, _COLUNAS_VENDAS, _vendas_dos_pedidos),
+        (
+            ContadorPedidos,
+            _CHAVES_CONTADORES,
+            _COLUNAS_CONTADORES,
+            _contadores_dos_pedidos,
+        ),
+    )
+    for modelo, chaves, colunas, consulta in movimentos:
+        for parcela in (
+            consulta(condicoes, sinal=-1),
+            consulta(condicoes, status=status_novo),
+        ):
+            await session.execute(
+                _insert_acumulando(session, modelo.__table__, chaves).from_select(
+                    colunas, parcela
+                )
+            )
+
+
+async def incrementar_versoes(session: AsyncSession, usuarios: Iterable[int]):
+    """Marks the order lists of some users as changed.
+
+    Every route that creates or changes orders calls this in its transaction, so
+    `Usuario.versao_pedidos` identifies the state of a user's orders (see the ETag of
+    `listar_pedidos`).
+
+    Args:
+        session (AsyncSession): The session of the transaction changing the orders.
+        usuarios (Iterable[int]): The owners of the changed orders.
+    """
+    usuarios = set(usuarios)
+    if usuarios:
+        await session.execute(
+            update(Usuario)
+            .where(Usuario.id.in_(usuarios))
+            .values(versao_pedidos=Usuario.versao_pedidos + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+
+async def reconstruir_contadores(
+    session: AsyncSession, usuarios: Iterable[int] | None = None
+) -> int:
+    """Recomputes the order counters, of every user or only of some users.
+
+    Args:
+        session (AsyncSession): The session to run in; the caller commits.
+        usuarios (Iterable[int], optional): Only recompute these users. Defaults to all.
+
+    Returns:
+        int: The number of counter rows written.
+    """
+    tabela = ContadorPedidos.__table__
+    limpeza = delete(tabela)
+    condicoes = []
+    if usuarios is not None:
+        usuarios = list(usuarios)
+        limpeza = limpeza.where(tabela.c.usuario.in_(usuarios))
+        condicoes.append(Pedido.usuario.in_(usuarios))
+    await session.execute(limpeza)
+    resultado = await session.execute(
+        tabela.insert().from_select(
+            _COLUNAS_CONTADORES, _contadores_dos_pedidos(condicoes)
+        )
+    )
+    return resultado.rowcount
+
+
+async def reconstruir_agregados(session: AsyncSession) -> dict:
+    """Recomputes every aggregate table from the orders and items.
+
+    Args:
+        session (AsyncSession): The session to run in; the caller commits.
+
+    Returns:
+        dict: The number of rows written to each aggregate table.
+    """
+    tabela = ResumoVendas.__table__
+    await session.execute(delete(tabela))
+    resultado = await session.execute(
+        tabela.insert().from_select(_COLUNAS_VENDAS, _vendas_dos_pedidos([]))
+    )
+    return {
+        "resumo_vendas": resultado.rowcount,
+        "contadores_pedidos": await reconstruir_contadores(session),
+    }
+
+
+def main():
+    async def _executar():
+        try:
+            async with SessionLocal() as session:
+                resumo = await reconstruir_agregados(session)
+                await session.commit()
+            return resumo
+        finally:
+            await engine.dispose()
+
+    print(json.dumps(asyncio.run(_executar()), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""adicionar indices de consulta
+
+Revision ID: b41d7e9c2a53
+Revises: 26bac5f0b4bf
+Create Date: 2026-10-17 10:02:41.118204
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b41d7e9c2a53"
+down_revision: str | None = "26bac5f0b4bf"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # autenticar_usuario / criar_conta: WHERE usuarios.email = ?
+    op.create_index("ix_usuarios_email", "usuarios", ["email"], unique=True)
+    # listar_pedidos: WHERE pedidos.usuario = ? (ordered by id)
+    op.create_index("ix_pedidos_usuario", "pedidos", ["usuario"], unique=False)
+    op.create_index(
+        "ix_pedidos_usuario_status", "pedidos", ["usuario", "status"], unique=False
+    )
+    # Pedido.itens: WHERE itens_pedido.pedido = ?
+    op.create_index("ix_itens_pedido_pedido", "itens_pedido", ["pedido"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_itens_pedido_pedido", table_name="itens_pedido")
+    op.drop_index("ix_pedidos_usuario_status", table_name="pedidos")
+    op.drop_index("ix_pedidos_usuario", table_name="pedidos")
+    op.drop_index("ix_usuarios_email", table_name="usuarios")
@@ -0,0 +1,49 @@
+"""adicionar resumo de vendas
+
+Revision ID: c7f3a9d2e184
+Revises: b41d7e9c2a53
+Create Date: 2026-10-17 14:21:07.530912
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c7f3a9d2e184"
+down_revision: str | None = "b41d7e9c2a53"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "resumo_vendas",
+        sa.Column("sabor", sa.String(), nullable=False),
+        sa.Column("tamanho", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("quantidade", sa.Integer(), nullable=False),
+        sa.Column("receita", sa.Float(), nullable=False),
+        sa.Column("itens", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("sabor", "tamanho", "status"),
+    )
+    # Preenche o resumo com os pedidos já existentes (mesma consulta de `python -m backend.agregados`).
+    op.execute(
+        """
+        INSERT INTO resumo_vendas (sabor, tamanho, status, quantidade, receita, itens)
+        SELECT itens_pedido.sabor, itens_pedido.tamanho, pedidos.status,
+               sum(itens_pedido.quantidade),
+               sum(itens_pedido.quantidade * itens_pedido.preco_unitario),
+               count(*)
+        FROM itens_pedido JOIN pedidos ON itens_pedido.pedido = pedidos.id
+        GROUP BY itens_pedido.sabor, itens_pedido.tamanho, pedidos.status
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("resumo_vendas")
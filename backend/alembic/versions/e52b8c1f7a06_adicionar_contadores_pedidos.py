@@ -0,0 +1,45 @@
+"""adicionar contadores de pedidos
+
+Revision ID: e52b8c1f7a06
+Revises: c7f3a9d2e184
+Create Date: 2026-10-17 15:02:44.217630
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e52b8c1f7a06"
+down_revision: str | None = "c7f3a9d2e184"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "contadores_pedidos",
+        sa.Column("usuario", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("pedidos", sa.Integer(), nullable=False),
+        sa.Column("preco_total", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(["usuario"], ["usuarios.id"]),
+        sa.PrimaryKeyConstraint("usuario", "status"),
+    )
+    # Preenche os contadores com os pedidos já existentes (mesma consulta de `python -m backend.agregados`).
+    op.execute(
+        """
+        INSERT INTO contadores_pedidos (usuario, status, pedidos, preco_total)
+        SELECT usuario, status, count(*), coalesce(sum(preco), 0)
+        FROM pedidos
+        GROUP BY usuario, status
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("contadores_pedidos")
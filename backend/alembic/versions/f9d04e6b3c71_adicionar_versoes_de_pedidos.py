@@ -0,0 +1,38 @@
+"""adicionar versoes de pedidos
+
+Revision ID: f9d04e6b3c71
+Revises: e52b8c1f7a06
+Create Date: 2026-10-17 15:48:19.604372
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f9d04e6b3c71"
+down_revision: str | None = "e52b8c1f7a06"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "pedidos",
+        sa.Column("versao", sa.Integer(), nullable=False, server_default="1"),
+    )
+    op.add_column(
+        "usuarios",
+        sa.Column("versao_pedidos", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("usuarios") as batch_op:
+        batch_op.drop_column("versao_pedidos")
+    with op.batch_alter_table("pedidos") as batch_op:
+        batch_op.drop_column("versao")
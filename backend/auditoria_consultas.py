@@ -0,0 +1,147 @@
+"""Per-request SQL auditing, to catch N+1 queries and routes that query too much.
+
+When `AUDITORIA_CONSULTAS` is "aviso" or "erro", every statement the engine sends
+(hooked with `auditar_engine`) is recorded for the request being served, and
+`MiddlewareAuditoriaConsultas` checks each finished request for two problems:
+
+- more statements than the route's budget, declared next to the route with
+  `@orcamento_consultas(n)` (`AUDITORIA_CONSULTAS_ORCAMENTO_PADRAO` otherwise);
+- the same statement executed `AUDITORIA_CONSULTAS_REPETICOES` times or more with
+  different parameters, the signature of a lazy load inside a loop.
+
+"aviso" logs a warning; "erro" raises `ConsultasExcessivas` once the response has been
+sent, which makes `TestClient` fail the test. The test suite runs in "erro" mode.
+"""
+
+import logging
+from collections import Counter
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from backend.config import (
+    AUDITORIA_CONSULTAS_ORCAMENTO_PADRAO,
+    AUDITORIA_CONSULTAS_REPETICOES,
+)
+
+MODOS_AUDITORIA = ("desligada", "aviso", "erro")
+"""Accepted values of `AUDITORIA_CONSULTAS`."""
+
+
+class ConsultasExcessivas(Exception):
+    """Raised in "erro" mode when a request breaks its query budget or repeats a query."""
+
+
+def orcamento_consultas(limite: int):
+    """Declares how many SQL statements a route may execute per request.
+
+    Apply it below the router decorator, so the router registers the annotated
+    function:
+
+        @order_router.get("/pedido/{id_pedido}")
+        @orcamento_consultas(3)
+        async def visualizar_pedido(...): ...
+
+    Args:
+        limite (int): The largest number of statements the route may execute.
+
+    Returns:
+        Callable: A decorator that returns the route function unchanged.
+    """
+
+    def _decorar(funcao):
+        funcao.orcamento_consultas = limite
+        return funcao
+
+    return _decorar
+
+
+consultas_auditadas: ContextVar[Counter | None] = ContextVar(
+    "consultas_auditadas", default=None
+)
+"""Executions of each statement in the request being served, if it is audited."""
+
+
+def avaliar_consultas(
+    consultas: Counter, orcamento: int, repeticoes: int = AUDITORIA_CONSULTAS_REPETICOES
+) -> list[str]:
+    """Lists the problems in the statements executed by one request.
+
+    Args:
+        consultas (Counter): Executions of each statement, keyed by its SQL text.
+        orcamento (int): The route's query budget.
+        repeticoes (int, optional): Executions of one statement that count as repeated.
+
+    Returns:
+        list[str]: One description per problem; empty when the request is fine.
+    """
+    problemas = []
+    total = sum(consultas.values())
+    if total > orcamento:
+        problemas.append(f"{total} consultas, acima do orçamento de {orcamento}")
+    for sql, vezes in consultas.most_common():
+        if vezes < repeticoes:
+            break
+        sql_resumido = " ".join(sql.split())[:200]
+        problemas.append(f"consulta repetida {vezes} vezes (N+1?): {sql_resumido}")
+    return problemas
+
+
+class MiddlewareAuditoriaConsultas:
+    """ASGI middleware that audits the statements of every HTTP request.
+
+    Args:
+        app: The ASGI application to wrap.
+        modo (str): "aviso" to log problems, "erro" to raise `ConsultasExcessivas`.
+    """
+
+    def __init__(self, app, modo: str):
+        if modo not in ("aviso", "erro"):
+            raise ValueError(
+                f"Modo de auditoria inválido: {modo!r}; use um de {MODOS_AUDITORIA}"
+            )
+        self.app = app
+        self.modo = modo
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        consultas = Counter()
+        token = consultas_auditadas.set(consultas)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            consultas_auditadas.reset(token)
+
+        rota = scope.get("route")
+        if rota is None:
+            return
+        orcamento = getattr(
+            rota.endpoint, "orcamento_consultas", AUDITORIA_CONSULTAS_ORCAMENTO_PADRAO
+        )
+        problemas = avaliar_consultas(consultas, orcamento)
+        if not problemas:
+            return
+        mensagem = f"{scope['method']} {rota.path}: " + "; ".join(problemas)
+        if self.modo == "erro":
+            raise ConsultasExcessivas(mensagem)
+        logging.warning(mensagem)
+
+
+def auditar_engine(engine_banco: AsyncEngine):
+    """Records every statement of an engine in the audited request, if any.
+
+    A batch sent with `executemany` counts as a single statement.
+
+    Args:
+        engine_banco (AsyncEngine): The engine to audit.
+    """
+
+    @event.listens_for(engine_banco.sync_engine, "before_cursor_execute")
+    def _registrar(conn, cursor, statement, parameters, context, executemany):
+        consultas = consultas_auditadas.get()
+        if consultas is not None:
+            consultas[statement] += 1
@@ -10,20 +10,15 @@ from datetime import UTC, datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
 from jose import JWTError, jwt
-from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.config import ACCESS_TOKEN_EXPIRE_MINUTES, ALGORITHM, SECRET_KEY
 from backend.dependencies import pegar_sessao
 from backend.models import Usuario
 from backend.schemas import LoginSchema, UsuarioSchema
-
-# Importe a função do seu novo arquivo utils.py
-from backend.utils import save_token_to_file
-
-# Criação do contexto bcrypt para hashing e verificação de senhas
-bcrypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
+from backend.security import gerar_hash_senha, verificar_senha
+from backend.token_store import token_store
 
 auth_router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -58,7 +53,7 @@ def criar_token(
         raise HTTPException(status_code=500, detail="Erro interno inesperado") from e
 
 
-def autenticar_usuario(email, senha, session):
+async def autenticar_usuario(email, senha, session):
     """
     Autentica o usuário verificando o email e a senha.
 
@@ -69,7 +64,7 @@ def autenticar_usuario(email, senha, session):
     """
     try:
         # Busca o usuário no banco de dados
-        usuario = session.query(Usuario).filter(Usuario.email == email).first()
+        usuario = await session.scalar(select(Usuario).where(Usuario.email == email))
 
         # Se o usuário não for encontrado, retorna erro
         if not usuario:
@@ -79,8 +74,11 @@ def autenticar_usuario(email, senha, session):
                 detail="Usuário não encontrado ou credenciais inválidas",
             )
 
-        # Verifica a senha
-        if not bcrypt_context.verify(senha, usuario.senha):
+        # Devolve a conexão ao pool antes do bcrypt, que pode esperar na fila
+        await session.commit()
+
+        # Verifica a senha fora do event loop
+        if not await verificar_senha(senha, usuario.senha):
             logging.warning(
                 f"Tentativa de login falhada com senha incorreta para o email: {email}"
             )
@@ -92,6 +90,8 @@ def autenticar_usuario(email, senha, session):
         # Se tudo der certo, retorna o usuário
         return usuario
 
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"Erro ao tentar autenticar usuário {email}: {e}")
         raise HTTPException(
@@ -112,13 +112,13 @@ async def home():
 
 @auth_router.post("/criar_conta")
 async def criar_conta(
-    usuario_schema: UsuarioSchema, session: Session = Depends(pegar_sessao)
+    usuario_schema: UsuarioSchema, session: AsyncSession = Depends(pegar_sessao)
 ):
     """Cria uma nova conta de usuário.
 
     Args:
         usuario_schema (UsuarioSchema): Os dados do novo usuário a ser criado.
-        session (Session, optional): A sessão do banco de dados. Injetada por dependência.
+        session (AsyncSession, optional): A sessão do banco de dados. Injetada por dependência.
 
     Raises:
         HTTPException: Se o e-mail do usuário já estiver cadastrado.
@@ -126,14 +126,14 @@ async def criar_conta(
     Returns:
         dict: Uma mensagem de sucesso após o cadastro do usuário.
     """
-    usuario = (
-        session.query(Usuario).filter(Usuario.email == usuario_schema.email).first()
+    usuario = await session.scalar(
+        select(Usuario).where(Usuario.email == usuario_schema.email)
     )
     if usuario:
         # ja existe um usuario com esse email
         raise HTTPException(status_code=400, detail="E-mail do usuário já cadastrado")
     else:
-        senha_criptografada = bcrypt_context.hash(usuario_schema.senha)
+        senha_criptografada = await gerar_hash_senha(usuario_schema.senha)
         novo_usuario = Usuario(
             usuario_schema.nome,
             usuario_schema.email,
@@ -142,28 +142,33 @@ async def criar_conta(
             usuario_schema.admin,
         )
         session.add(novo_usuario)
-        session.commit()
+        await session.commit()
         return {"mensagem": f"usuário cadastrado com sucesso {usuario_schema.email}"}
 
 
 # login -> email e senha -> token JWT (Json Web Token) ahuyba786dabd86a5vdba865dvad786and
 @auth_router.post("/login")
-async def login(login_schema: LoginSchema, session: Session = Depends(pegar_sessao)):
+async def login(
+    login_schema: LoginSchema, session: AsyncSession = Depends(pegar_sessao)
+):
     """Realiza o login do usuário e retorna tokens de acesso e refresh.
 
     Args:
         login_schema (LoginSchema): Os dados de login do usuário (email e senha).
-        session (Session, optional): A sessão do banco de dados. Injetada por dependência.
+        session (AsyncSession, optional): A sessão do banco de dados. Injetada por dependência.
 
     Raises:
         HTTPException: Se o usuário não for encontrado ou as credenciais forem inválidas.
+        HTTPException: Se a fila de verificação de senhas estiver cheia (503).
         HTTPException: Em caso de erro interno ao realizar o login.
 
     Returns:
         dict: Um dicionário contendo o access_token, refresh_token e o tipo de token.
     """
     try:
-        usuario = autenticar_usuario(login_schema.email, login_schema.senha, session)
+        usuario = await autenticar_usuario(
+            login_schema.email, login_schema.senha, session
+        )
         if not usuario:
             raise HTTPException(
                 status_code=400,
@@ -173,14 +178,16 @@ async def login(login_schema: LoginSchema, session: Session = Depends(pegar_sess
         access_token = criar_token(usuario.id)
         refresh_token = criar_token(usuario.id, duracao_token=timedelta(days=7))
 
-        # Chame a função para salvar o access_token no arquivo.
-        save_token_to_file(access_token, refresh_token)
+        # Entrega os tokens ao token store configurado (sem E/S de disco na requisição)
+        token_store.salvar(access_token, refresh_token)
 
         return {
             "access_token": access_token,
             "refresh_token": refresh_token,
             "token_type": "Bearer",
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"Erro no login: {e}")
         raise HTTPException(
@@ -191,13 +198,13 @@ async def login(login_schema: LoginSchema, session: Session = Depends(pegar_sess
 @auth_router.post("/login-form")
 async def login_form(
     dados_formulario: OAuth2PasswordRequestForm = Depends(),
-    session: Session = Depends(pegar_sessao),
+    session: AsyncSession = Depends(pegar_sessao),
 ):
     """Realiza o login do usuário através de um formulário OAuth2.
 
     Args:
         dados_formulario (OAuth2PasswordRequestForm, optional): Dados do formulário de login.
-        session (Session, optional): A sessão do banco de dados. Injetada por dependência.
+        session (AsyncSession, optional): A sessão do banco de dados. Injetada por dependência.
 
     Raises:
         HTTPException: Se o usuário não for encontrado ou as credenciais forem inválidas.
@@ -205,7 +212,7 @@ async def login_form(
     Returns:
         dict: Um dicionário contendo o access_token e o tipo de token.
     """
-    usuario = autenticar_usuario(
+    usuario = await autenticar_usuario(
         dados_formulario.username, dados_formulario.password, session
     )
     if not usuario:
@@ -219,13 +226,13 @@ async def login_form(
 
 @auth_router.post("/refresh")
 async def refresh_access_token(
-    refresh_token: str, session: Session = Depends(pegar_sessao)
+    refresh_token: str, session: AsyncSession = Depends(pegar_sessao)
 ):
     """Atualiza o token de acesso usando um token de refresh válido.
 
     Args:
         refresh_token (str): O refresh token válido fornecido pelo cliente.
-        session (Session): A sessão do banco de dados. Injetada por dependência.
+        session (AsyncSession): A sessão do banco de dados. Injetada por dependência.
 
     Raises:
         HTTPException: Se o refresh token for inválido, expirado ou o usuário não for encontrado.
@@ -243,7 +250,7 @@ async def refresh_access_token(
             raise HTTPException(status_code=401, detail="Token inválido")
 
         # Verificar se o usuário ainda existe no banco de dados
-        usuario = session.query(Usuario).filter(Usuario.id == user_id).first()
+        usuario = await session.scalar(select(Usuario).where(Usuario.id == user_id))
         if not usuario:
             logging.warning(f"Tentativa de refresh com usuário inexistente: {user_id}")
             raise HTTPException(status_code=401, detail="Usuário não encontrado")
@@ -257,7 +264,7 @@ async def refresh_access_token(
         new_access_token = criar_token(usuario.id)
 
         # Salvar o novo access token (mantendo o mesmo refresh token)
-        save_token_to_file(new_access_token, refresh_token)
+        token_store.salvar(new_access_token, refresh_token)
 
         logging.info(f"Access token renovado com sucesso para usuário: {user_id}")
 
@@ -0,0 +1,297 @@
+"""Load test of the API with realistic mixes of requests.
+
+`--usuarios` virtual users run concurrently. Each one signs up (not measured), logs
+in, and then performs `--operacoes` operations drawn from a weighted mix: create an
+order, add items to it, list its orders, view one, finalize it, or log in again.
+Draws come from a seeded generator, so two runs with the same arguments send the
+same requests.
+
+The application is driven in one of three ways:
+
+- `--transporte asgi` (default): `backend.main.app` is called in-process through
+  `httpx.ASGITransport`, with no network or server in between;
+- `--transporte uvicorn`: a real uvicorn process on localhost;
+- `--url`: a server already running, e.g. an older checkout.
+
+Throughput and p50/p95/p99 latency are reported per route template and in total,
+as JSON with a stable layout (`--saida` writes it to a file) so runs of two versions
+can be diffed.
+
+    python -m backend.benchmarks.carga --mistura misto --usuarios 20 --operacoes 50
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from contextlib import nullcontext
+
+import httpx
+from jose import jwt
+
+from backend.benchmarks.common import (
+    criar_banco_temporario,
+    resumir_latencias,
+    servidor_uvicorn,
+)
+
+SENHA = "senha-benchmark"
+
+ITENS = [
+    {"quantidade": 1, "sabor": "Mussarela", "tamanho": "M", "preco_unitario": 35.0},
+    {"quantidade": 2, "sabor": "Calabresa", "tamanho": "G", "preco_unitario": 42.5},
+    {"quantidade": 1, "sabor": "Portuguesa", "tamanho": "G", "preco_unitario": 45.0},
+    {"quantidade": 3, "sabor": "Margherita", "tamanho": "P", "preco_unitario": 28.0},
+]
+
+MISTURAS = {
+    "misto": {
+        "criar_pedido": 15,
+        "adicionar_item": 25,
+        "listar": 25,
+        "visualizar": 20,
+        "finalizar": 10,
+        "login": 5,
+    },
+    "leitura": {
+        "criar_pedido": 3,
+        "adicionar_item": 5,
+        "listar": 50,
+        "visualizar": 40,
+        "finalizar": 1,
+        "login": 1,
+    },
+    "escrita": {
+        "criar_pedido": 30,
+        "adicionar_item": 45,
+        "listar": 5,
+        "visualizar": 5,
+        "finalizar": 15,
+        "login": 0,
+    },
+}
+"""Weight of each operation in each mix."""
+
+ROTAS = {
+    "login": "POST /auth/login",
+    "criar_pedido": "POST /pedidos/pedido",
+    "adicionar_item": "POST /pedidos/pedido/adicionar-item/{id_pedido}",
+    "listar": "GET /pedidos/listar/pedidos-usuario",
+    "visualizar": "GET /pedidos/pedido/{id_pedido}",
+    "finalizar": "POST /pedidos/pedido/finalizar/{id_pedido}",
+}
+"""Route template each operation is reported under."""
+
+
+class UsuarioVirtual:
+    """One simulated client, with its own token and open orders.
+
+    Args:
+        client (httpx.AsyncClient): Client bound to the application under test.
+        indice (int): Number of the user, used in its e-mail and random seed.
+        semente (int): Seed of the run.
+        execucao (int): Identifies the run in e-mails, so runs can share a database.
+        latencias (dict): Latencies per route, shared by every user.
+        erros (dict): Failed requests per route, shared by every user.
+    """
+
+    def __init__(self, client, indice, semente, execucao, latencias, erros):
+        self.client = client
+        self.email = f"carga-{execucao}-{indice}@teste.com"
+        self.aleatorio = random.Random(semente * 100_003 + indice)
+        self.latencias = latencias
+        self.erros = erros
+        self.id_usuario = None
+        self.headers = {}
+        self.pedidos_abertos: list[int] = []
+
+    async def _medir(self, operacao, metodo, url, **kwargs):
+        rota = ROTAS[operacao]
+        inicio = time.perf_counter()
+        resposta = await self.client.request(
+            metodo, url, headers=self.headers, **kwargs
+        )
+        self.latencias.setdefault(rota, []).append(time.perf_counter() - inicio)
+        if resposta.status_code >= 400:
+            self.erros[rota] = self.erros.get(rota, 0) + 1
+        return resposta
+
+    async def registrar(self):
+        """Creates the user's account; not measured."""
+        resposta = await self.client.post(
+            "/auth/criar_conta",
+            json={
+                "nome": self.email,
+                "email": self.email,
+                "senha": SENHA,
+                "ativo": True,
+                "admin": False,
+            },
+        )
+        resposta.raise_for_status()
+
+    async def login(self):
+        resposta = await self._medir(
+            "login", "POST", "/auth/login", json={"email": self.email, "senha": SENHA}
+        )
+        if resposta.status_code == 200:
+            token = resposta.json()["access_token"]
+            self.headers = {"Authorization": f"Bearer {token}"}
+            if self.id_usuario is None:
+                self.id_usuario = int(jwt.get_unverified_claims(token)["sub"])
+
+    async def criar_pedido(self):
+        resposta = await self._medir(
+            "criar_pedido", "POST", "/pedidos/pedido", json={"usuario": self.id_usuario}
+        )
+        if resposta.status_code == 200:
+            mensagem = resposta.json()["mensagem"]
+            self.pedidos_abertos.append(int(mensagem.rsplit(" ", 1)[-1]))
+
+    async def _pedido_aberto(self) -> int | None:
+        if not self.pedidos_abertos:
+            await self.criar_pedido()
+        if not self.pedidos_abertos:
+            return None
+        return self.aleatorio.choice(self.pedidos_abertos)
+
+    async def adicionar_item(self):
+        id_pedido = await self._pedido_aberto()
+        if id_pedido is not None:
+            await self._medir(
+                "adicionar_item",
+                "POST",
+                f"/pedidos/pedido/adicionar-item/{id_pedido}",
+                json=self.aleatorio.choice(ITENS),
+            )
+
+    async def listar(self):
+        await self._medir("listar", "GET", "/pedidos/listar/pedidos-usuario")
+
+    async def visualizar(self):
+        id_pedido = await self._pedido_aberto()
+        if id_pedido is not None:
+            await self._medir("visualizar", "GET", f"/pedidos/pedido/{id_pedido}")
+
+    async def finalizar(self):
+        id_pedido = await self._pedido_aberto()
+        if id_pedido is not None:
+            self.pedidos_abertos.remove(id_pedido)
+            await self._medir(
+                "finalizar", "POST", f"/pedidos/pedido/finalizar/{id_pedido}"
+            )
+
+    async def executar(self, mistura: dict, operacoes: int):
+        """Logs in and performs `operacoes` operations drawn from `mistura`."""
+        await self.login()
+        nomes = list(mistura)
+        pesos = list(mistura.values())
+        for operacao in self.aleatorio.choices(nomes, pesos, k=operacoes):
+            await getattr(self, operacao)()
+
+
+async def executar(
+    client: httpx.AsyncClient, mistura: str, usuarios: int, operacoes: int, semente: int
+) -> dict:
+    """Runs the load test against the application behind `client`.
+
+    Returns:
+        dict: Total and per-route throughput, latency percentiles and error counts.
+    """
+    latencias: dict[str, list[float]] = {}
+    erros: dict[str, int] = {}
+    execucao = time.time_ns()
+    virtuais = [
+        UsuarioVirtual(client, indice, semente, execucao, latencias, erros)
+        for indice in range(usuarios)
+    ]
+    await asyncio.gather(*(usuario.registrar() for usuario in virtuais))
+
+    inicio = time.perf_counter()
+    await asyncio.gather(
+        *(usuario.executar(MISTURAS[mistura], operacoes) for usuario in virtuais)
+    )
+    duracao = time.perf_counter() - inicio
+
+    todas = [latencia for valores in latencias.values() for latencia in valores]
+    return {
+        "mistura": mistura,
+        "usuarios": usuarios,
+        "operacoes_por_usuario": operacoes,
+        "semente": semente,
+        "duracao_s": round(duracao, 3),
+        "total": {**resumir_latencias(todas, duracao), "erros": sum(erros.values())},
+        "rotas": {
+            rota: {
+                **resumir_latencias(latencias[rota], duracao),
+                "erros": erros.get(rota, 0),
+            }
+            for rota in sorted(latencias)
+        },
+    }
+
+
+async def _executar_asgi(mistura, usuarios, operacoes, semente):
+    # The engine is built from DATABASE_URL when the app is imported
+    os.environ["DATABASE_URL"] = criar_banco_temporario()
+    os.environ.setdefault("SECRET_KEY", "chave-secreta-de-benchmark")
+    os.environ.setdefault("ALGORITHM", "HS256")
+    from backend.database import engine
+    from backend.main import app
+
+    transporte = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transporte, base_url="http://carga", timeout=120
+    ) as client:
+        resultado = await executar(client, mistura, usuarios, operacoes, semente)
+    await engine.dispose()
+    return resultado
+
+
+async def _executar_http(url_base, mistura, usuarios, operacoes, semente):
+    limites = httpx.Limits(max_connections=usuarios)
+    async with httpx.AsyncClient(
+        base_url=url_base, timeout=120, limits=limites
+    ) as client:
+        return await executar(client, mistura, usuarios, operacoes, semente)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mistura", choices=sorted(MISTURAS), default="misto")
+    parser.add_argument("--usuarios", type=int, default=20, help="usuários simultâneos")
+    parser.add_argument(
+        "--operacoes", type=int, default=50, help="operações por usuário"
+    )
+    parser.add_argument("--semente", type=int, default=1)
+    parser.add_argument("--transporte", choices=("asgi", "uvicorn"), default="asgi")
+    parser.add_argument("--url", help="servidor já em execução (ex.: versão anterior)")
+    parser.add_argument("--saida", help="arquivo onde gravar o resultado em JSON")
+    args = parser.parse_args()
+
+    argumentos = (args.mistura, args.usuarios, args.operacoes, args.semente)
+    if args.url or args.transporte == "uvicorn":
+        servidor = (
+            nullcontext(args.url)
+            if args.url
+            else servidor_uvicorn(criar_banco_temporario())
+        )
+        with servidor as url_base:
+            resultado = asyncio.run(_executar_http(url_base, *argumentos))
+        transporte = "http"
+    else:
+        resultado = asyncio.run(_executar_asgi(*argumentos))
+        transporte = "asgi"
+    resultado = {"transporte": transporte, **resultado}
+
+    saida = json.dumps(resultado, indent=2)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            arquivo.write(saida + "\n")
+    print(saida)
+
+
+if __name__ == "__main__":
+    main()
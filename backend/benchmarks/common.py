@@ -0,0 +1,138 @@
+"""Shared helpers for the backend benchmarks.
+
+Benchmarks run against a throwaway SQLite database and either a real uvicorn process
+on localhost or an external server given by URL, so the same script can measure an
+older checkout of the backend for before/after comparisons.
+"""
+
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import httpx
+from jose import jwt
+from sqlalchemy import create_engine
+
+RAIZ_PROJETO = Path(__file__).parent.parent.parent
+"""Project root, used as the working directory of the uvicorn subprocess."""
+
+
+def criar_banco_temporario() -> str:
+    """Creates an empty database with the current schema in a temporary folder.
+
+    Returns:
+        str: The synchronous SQLAlchemy URL of the new database.
+    """
+    from backend.models import Base
+
+    diretorio = Path(tempfile.mkdtemp(prefix="order-system-bench-"))
+    url = f"sqlite:///{diretorio / 'bench.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    return url
+
+
+def _porta_livre() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def servidor_uvicorn(url_banco: str, env_extra: dict | None = None):
+    """Runs `backend.main:app` under uvicorn on a free local port.
+
+    Args:
+        url_banco (str): Value for `DATABASE_URL` in the server process.
+        env_extra (dict, optional): Additional environment variables for the server.
+
+    Yields:
+        str: The base URL of the running server.
+    """
+    porta = _porta_livre()
+    env = {
+        **os.environ,
+        "DATABASE_URL": url_banco,
+        "SECRET_KEY": os.getenv("SECRET_KEY", "chave-secreta-de-benchmark"),
+        "ALGORITHM": os.getenv("ALGORITHM", "HS256"),
+        **(env_extra or {}),
+    }
+    processo = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "backend.main:app",
+            "--port",
+            str(porta),
+            "--log-level",
+            "warning",
+        ],
+        cwd=RAIZ_PROJETO,
+        env=env,
+    )
+    url_base = f"http://127.0.0.1:{porta}"
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(f"{url_base}/auth/", timeout=1)
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+        else:
+            raise RuntimeError("O servidor uvicorn não respondeu a tempo")
+        yield url_base
+    finally:
+        processo.terminate()
+        processo.wait(timeout=10)
+
+
+async def registrar_e_logar(
+    client: httpx.AsyncClient, email: str, senha: str = "senha-benchmark"
+) -> tuple[int, dict]:
+    """Creates an account through the API and logs in with it.
+
+    Returns:
+        tuple[int, dict]: The new user's ID and its `Authorization` header.
+    """
+    await client.post(
+        "/auth/criar_conta",
+        json={
+            "nome": email,
+            "email": email,
+            "senha": senha,
+            "ativo": True,
+            "admin": False,
+        },
+    )
+    resposta = await client.post("/auth/login", json={"email": email, "senha": senha})
+    resposta.raise_for_status()
+    token = resposta.json()["access_token"]
+    id_usuario = int(jwt.get_unverified_claims(token)["sub"])
+    return id_usuario, {"Authorization": f"Bearer {token}"}
+
+
+def percentil(valores: list[float], p: float) -> float:
+    """Returns the `p`-th percentile (0-100) of `valores` by nearest rank."""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, max(0, round(p / 100 * len(ordenados)) - 1))
+    return ordenados[indice]
+
+
+def resumir_latencias(latencias: list[float], duracao: float) -> dict:
+    """Summarizes request latencies (in seconds) as throughput and percentiles in ms."""
+    return {
+        "requisicoes": len(latencias),
+        "rps": round(len(latencias) / duracao, 1) if duracao else 0.0,
+        "p50_ms": round(percentil(latencias, 50) * 1000, 2),
+        "p95_ms": round(percentil(latencias, 95) * 1000, 2),
+        "p99_ms": round(percentil(latencias, 99) * 1000, 2),
+    }
@@ -0,0 +1,115 @@
+"""Concurrency benchmark for the order read routes.
+
+Runs 50+ parallel clients against a live server that mixes order reads with item
+writes, and reports throughput and latency percentiles as JSON. To compare before and
+after a change, start a server from the older checkout and pass its address with
+`--url`; without `--url` the current tree is served by uvicorn on a temporary database.
+
+    python -m backend.benchmarks.concorrencia --clientes 50 --requisicoes 40
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from contextlib import nullcontext
+
+import httpx
+
+from backend.benchmarks.common import (
+    criar_banco_temporario,
+    registrar_e_logar,
+    resumir_latencias,
+    servidor_uvicorn,
+)
+
+
+async def _preparar(url_base: str, pedidos: int, itens_por_pedido: int):
+    async with httpx.AsyncClient(base_url=url_base, timeout=30) as client:
+        id_usuario, headers = await registrar_e_logar(
+            client, f"bench-{time.time_ns()}@teste.com"
+        )
+        ids = []
+        for _ in range(pedidos):
+            resposta = await client.post(
+                "/pedidos/pedido", json={"usuario": id_usuario}, headers=headers
+            )
+            ids.append(int(resposta.json()["mensagem"].rsplit(" ", 1)[-1]))
+            for _ in range(itens_por_pedido):
+                await client.post(
+                    f"/pedidos/pedido/adicionar-item/{ids[-1]}",
+                    json={
+                        "quantidade": 1,
+                        "sabor": "Calabresa",
+                        "tamanho": "M",
+                        "preco_unitario": 30.0,
+                    },
+                    headers=headers,
+                )
+        return headers, ids
+
+
+async def _cliente(client, headers, ids, requisicoes, latencias, indice):
+    for n in range(requisicoes):
+        id_pedido = ids[(indice + n) % len(ids)]
+        if n % 4 == 3:
+            url, metodo = f"/pedidos/pedido/{id_pedido}", "GET"
+        elif n % 4 == 2:
+            url, metodo = f"/pedidos/pedido/adicionar-item/{id_pedido}", "POST"
+        else:
+            url, metodo = "/pedidos/listar/pedidos-usuario", "GET"
+        inicio = time.perf_counter()
+        if metodo == "GET":
+            resposta = await client.get(url, headers=headers)
+        else:
+            resposta = await client.post(
+                url,
+                json={
+                    "quantidade": 1,
+                    "sabor": "Mussarela",
+                    "tamanho": "P",
+                    "preco_unitario": 25.0,
+                },
+                headers=headers,
+            )
+        latencias.append(time.perf_counter() - inicio)
+        resposta.raise_for_status()
+
+
+async def executar(url_base: str, clientes: int, requisicoes: int) -> dict:
+    headers, ids = await _preparar(url_base, pedidos=20, itens_por_pedido=5)
+    latencias: list[float] = []
+    limites = httpx.Limits(max_connections=clientes)
+    async with httpx.AsyncClient(
+        base_url=url_base, timeout=60, limits=limites
+    ) as client:
+        inicio = time.perf_counter()
+        await asyncio.gather(
+            *(
+                _cliente(client, headers, ids, requisicoes, latencias, i)
+                for i in range(clientes)
+            )
+        )
+        duracao = time.perf_counter() - inicio
+    return {"clientes": clientes, **resumir_latencias(latencias, duracao)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clientes", type=int, default=50)
+    parser.add_argument("--requisicoes", type=int, default=40, help="por cliente")
+    parser.add_argument("--url", help="servidor já em execução (ex.: versão anterior)")
+    args = parser.parse_args()
+
+    servidor = (
+        nullcontext(args.url)
+        if args.url
+        else servidor_uvicorn(criar_banco_temporario())
+    )
+    with servidor as url_base:
+        resultado = asyncio.run(executar(url_base, args.clientes, args.requisicoes))
+    print(json.dumps(resultado, indent=2))
+
+
+if __name__ == "__main__":
+    main()
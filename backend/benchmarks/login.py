@@ -0,0 +1,99 @@
+"""Login latency benchmark under a burst of concurrent logins mixed with order reads.
+
+Runs `--logins` concurrent login clients (100 by default) while `--leitores` clients
+keep reading orders, and reports p50/p95/p99 for both kinds of request plus how many
+logins were refused with 503 by the bcrypt queue limit. Pass `--url` to measure a
+server started from another checkout.
+
+    python -m backend.benchmarks.login --logins 100 --leitores 10
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from contextlib import nullcontext
+
+import httpx
+
+from backend.benchmarks.common import (
+    criar_banco_temporario,
+    registrar_e_logar,
+    resumir_latencias,
+    servidor_uvicorn,
+)
+
+SENHA = "senha-benchmark"
+
+
+async def _login(client, email, latencias, recusados):
+    inicio = time.perf_counter()
+    resposta = await client.post("/auth/login", json={"email": email, "senha": SENHA})
+    latencias.append(time.perf_counter() - inicio)
+    if resposta.status_code == 503:
+        recusados.append(resposta)
+    else:
+        resposta.raise_for_status()
+
+
+async def _leitor(client, headers, latencias, parar):
+    while not parar.is_set():
+        inicio = time.perf_counter()
+        resposta = await client.get("/pedidos/listar/pedidos-usuario", headers=headers)
+        latencias.append(time.perf_counter() - inicio)
+        resposta.raise_for_status()
+
+
+async def executar(url_base: str, logins: int, leitores: int) -> dict:
+    limites = httpx.Limits(max_connections=logins + leitores)
+    async with httpx.AsyncClient(
+        base_url=url_base, timeout=120, limits=limites
+    ) as client:
+        email = f"login-{time.time_ns()}@teste.com"
+        id_usuario, headers = await registrar_e_logar(client, email, SENHA)
+        for _ in range(10):
+            await client.post(
+                "/pedidos/pedido", json={"usuario": id_usuario}, headers=headers
+            )
+
+        latencias_login: list[float] = []
+        latencias_leitura: list[float] = []
+        recusados: list = []
+        parar = asyncio.Event()
+        tarefas_leitura = [
+            asyncio.create_task(_leitor(client, headers, latencias_leitura, parar))
+            for _ in range(leitores)
+        ]
+        inicio = time.perf_counter()
+        await asyncio.gather(
+            *(_login(client, email, latencias_login, recusados) for _ in range(logins))
+        )
+        duracao = time.perf_counter() - inicio
+        parar.set()
+        await asyncio.gather(*tarefas_leitura)
+
+    return {
+        "login": {**resumir_latencias(latencias_login, duracao), "503": len(recusados)},
+        "leitura": resumir_latencias(latencias_leitura, duracao),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--leitores", type=int, default=10)
+    parser.add_argument("--url", help="servidor já em execução (ex.: versão anterior)")
+    args = parser.parse_args()
+
+    servidor = (
+        nullcontext(args.url)
+        if args.url
+        else servidor_uvicorn(criar_banco_temporario())
+    )
+    with servidor as url_base:
+        resultado = asyncio.run(executar(url_base, args.logins, args.leitores))
+    print(json.dumps(resultado, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Overhead benchmark of the request metrics middleware.
+
+Calls the application in-process, straight through ASGI, so neither the network nor
+the HTTP client (which costs far more than the middleware and makes over-the-wire
+comparisons mostly noise) hides the cost being measured. Alternates rounds of
+`--requisicoes` requests to the cheapest route (`GET /auth/`, no authentication and
+no queries) with and without `MiddlewareMetricas`, and reports the best time per
+request of each and the relative overhead. A real server adds HTTP parsing on top of
+both, so the overhead seen in production is lower than reported here.
+
+    python -m backend.benchmarks.metricas --requisicoes 5000 --rodadas 7
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+# Build the app without the middleware, which is then added around it by hand
+os.environ["METRICAS_HABILITADAS"] = "false"
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from backend.main import app  # noqa: E402
+from backend.metricas import MiddlewareMetricas  # noqa: E402
+
+ESCOPO = {
+    "type": "http",
+    "asgi": {"version": "3.0"},
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/auth/",
+    "raw_path": b"/auth/",
+    "root_path": "",
+    "query_string": b"",
+    "headers": [(b"host", b"localhost")],
+    "client": ("127.0.0.1", 50000),
+    "server": ("127.0.0.1", 8000),
+}
+
+
+async def _receber():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _enviar(mensagem):
+    if mensagem["type"] == "http.response.start" and mensagem["status"] != 200:
+        raise RuntimeError(f"status inesperado: {mensagem['status']}")
+
+
+async def _rodada(aplicacao, requisicoes: int) -> float:
+    inicio = time.perf_counter()
+    for _ in range(requisicoes):
+        await aplicacao(dict(ESCOPO), _receber, _enviar)
+    return (time.perf_counter() - inicio) / requisicoes
+
+
+async def executar(requisicoes: int, rodadas: int) -> dict:
+    com_metricas = MiddlewareMetricas(app)
+    await _rodada(app, requisicoes)  # warm-up: builds the middleware stack
+    tempos = {"sem_metricas": [], "com_metricas": []}
+    for _ in range(rodadas):
+        tempos["sem_metricas"].append(await _rodada(app, requisicoes))
+        tempos["com_metricas"].append(await _rodada(com_metricas, requisicoes))
+    sem = min(tempos["sem_metricas"])
+    com = min(tempos["com_metricas"])
+    return {
+        "rota": "GET /auth/",
+        "sem_metricas_us": round(sem * 1e6, 2),
+        "com_metricas_us": round(com * 1e6, 2),
+        "sobrecarga_us": round((com - sem) * 1e6, 2),
+        "sobrecarga_pct": round((com - sem) / sem * 100, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requisicoes", type=int, default=5000)
+    parser.add_argument("--rodadas", type=int, default=7)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(executar(args.requisicoes, args.rodadas)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
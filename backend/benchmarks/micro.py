@@ -0,0 +1,281 @@
+"""Microbenchmarks of the backend's hot functions, compared against stored baselines.
+
+Each case times one function in a loop whose size is calibrated so a run lasts at
+least `--tempo-minimo` seconds, repeats the run `--repeticoes` times and keeps the
+best and the median time per call. The cases are:
+
+- `Pedido.calcular_preco` on orders of 10, 100 and 1,000 items;
+- `criar_token`;
+- `verificar_token`, decoding the JWT and reading the user (cache cleared every
+  call), and answered from `cache_principais`;
+- `ResponsePedidoSchema` validation of lists of 100 and 1,000 orders of 3 items;
+- `autenticar_usuario`, dominated by bcrypt.
+
+Results are compared with the baseline in `baselines/micro.json` (or `--baseline`):
+a case whose best time grew more than `--limite` (20% by default) is flagged as a
+regression and the command exits with status 1. Baselines only mean something on
+the machine that recorded them, so they are kept out of git: the first run on a
+machine records one, and a baseline recorded on another host or interpreter is
+refused (exit status 2) instead of compared. Record a fresh one with
+`--salvar-baseline` before changing the code, then run again afterwards.
+
+    python -m backend.benchmarks.micro --salvar-baseline
+    python -m backend.benchmarks.micro --filtro verificar_token
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from backend.benchmarks.common import criar_banco_temporario
+
+BASELINE_PADRAO = Path(__file__).parent / "baselines" / "micro.json"
+"""Baseline file used when `--baseline` is not given."""
+
+SENHA = "senha-benchmark"
+
+
+def ambiente() -> dict:
+    """Fingerprint of the host and interpreter; baselines only compare within one."""
+    return {
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "implementacao": platform.python_implementation(),
+        "maquina": platform.machine(),
+        "sistema": platform.system(),
+        "processador": platform.processor() or None,
+    }
+
+
+def _medir(executar, repeticoes: int, tempo_minimo: float) -> dict:
+    """Times `executar(n)`, which must call the measured function `n` times.
+
+    Returns:
+        dict: Calls per run and the best and median time per call, in microseconds.
+    """
+    chamadas = 1
+    while True:
+        inicio = time.perf_counter()
+        executar(chamadas)
+        if time.perf_counter() - inicio >= tempo_minimo:
+            break
+        chamadas *= 2
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        executar(chamadas)
+        tempos.append((time.perf_counter() - inicio) / chamadas)
+    return {
+        "chamadas": chamadas,
+        "min_us": round(min(tempos) * 1e6, 3),
+        "mediana_us": round(statistics.median(tempos) * 1e6, 3),
+    }
+
+
+def _pedido_com_itens(id_pedido: int, quantidade: int):
+    from backend.models import ItemPedido, Pedido
+
+    pedido = Pedido(usuario=1)
+    pedido.id = id_pedido
+    pedido.versao = 1
+    pedido.itens = [
+        ItemPedido(
+            quantidade=1 + i % 3,
+            sabor="Calabresa",
+            tamanho="G",
+            preco_unitario=42.5,
+            pedido=id_pedido,
+        )
+        for i in range(quantidade)
+    ]
+    for i, item in enumerate(pedido.itens, start=1):
+        item.id = id_pedido * quantidade + i
+    return pedido
+
+
+def _casos(loop, session) -> dict:
+    """Builds every case as `nome -> executar(n)`; needs the database to exist."""
+    from pydantic import TypeAdapter
+    from sqlalchemy import insert
+
+    from backend.auth_routes import autenticar_usuario, criar_token
+    from backend.dependencies import cache_principais, verificar_token
+    from backend.models import Usuario
+    from backend.schemas import ResponsePedidoSchema
+    from backend.security import bcrypt_context
+
+    loop.run_until_complete(
+        session.execute(
+            insert(Usuario),
+            [
+                {
+                    "nome": "micro",
+                    "email": "micro@teste.com",
+                    "senha": bcrypt_context.hash(SENHA),
+                    "ativo": True,
+                    "admin": False,
+                }
+            ],
+        )
+    )
+    loop.run_until_complete(session.commit())
+    token = criar_token(1)
+    lista_pedidos = TypeAdapter(list[ResponsePedidoSchema])
+
+    def _assincrono(funcao):
+        async def _repetir(n):
+            for _ in range(n):
+                await funcao()
+
+        return lambda n: loop.run_until_complete(_repetir(n))
+
+    def _repetir(funcao):
+        def _executar(n):
+            for _ in range(n):
+                funcao()
+
+        return _executar
+
+    async def _verificar_sem_cache():
+        cache_principais.limpar()
+        await verificar_token(token, session)
+
+    casos = {}
+    for quantidade in (10, 100, 1000):
+        pedido = _pedido_com_itens(1, quantidade)
+        casos[f"calcular_preco[{quantidade}]"] = _repetir(pedido.calcular_preco)
+    casos["criar_token"] = _repetir(lambda: criar_token(1))
+    casos["verificar_token[decode+consulta]"] = _assincrono(_verificar_sem_cache)
+    casos["verificar_token[cache]"] = _assincrono(
+        lambda: verificar_token(token, session)
+    )
+    for quantidade in (100, 1000):
+        pedidos = [_pedido_com_itens(i, 3) for i in range(1, quantidade + 1)]
+        casos[f"ResponsePedidoSchema[{quantidade}]"] = _repetir(
+            lambda pedidos=pedidos: lista_pedidos.validate_python(
+                pedidos, from_attributes=True
+            )
+        )
+    casos["autenticar_usuario"] = _assincrono(
+        lambda: autenticar_usuario("micro@teste.com", SENHA, session)
+    )
+    return casos
+
+
+def comparar(resultados: dict, baseline: dict, limite: float) -> dict:
+    """Adds the ratio to the baseline and a regression flag to each result.
+
+    Args:
+        resultados (dict): Current results per case, with `min_us`.
+        baseline (dict): Baseline results per case, with `min_us`.
+        limite (float): Relative growth above which a case is a regression (0.2 = 20%).
+
+    Returns:
+        dict: The results, with `baseline_us`, `razao` and `regressao` where the case
+        has a baseline.
+    """
+    comparados = {}
+    for nome, resultado in resultados.items():
+        anterior = baseline.get(nome)
+        if anterior is None:
+            comparados[nome] = resultado
+            continue
+        razao = resultado["min_us"] / anterior["min_us"]
+        comparados[nome] = {
+            **resultado,
+            "baseline_us": anterior["min_us"],
+            "razao": round(razao, 3),
+            "regressao": razao > 1 + limite,
+        }
+    return comparados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filtro", help="só os casos cujo nome contém este texto")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--tempo-minimo", type=float, default=0.2, help="segundos")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PADRAO)
+    parser.add_argument(
+        "--limite", type=float, default=0.2, help="0.2 = 20%% mais lento"
+    )
+    parser.add_argument("--salvar-baseline", action="store_true")
+    args = parser.parse_args()
+
+    atual = ambiente()
+    baseline = None
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+    if (
+        baseline is not None
+        and baseline["ambiente"] != atual
+        and not args.salvar_baseline
+    ):
+        print(
+            f"A baseline {args.baseline} foi gravada em outro ambiente "
+            f"({baseline['ambiente']}); grave uma nova com --salvar-baseline",
+            file=sys.stderr,
+        )
+        sys.exit(2)
+
+    # The engine is built from DATABASE_URL when the backend is imported
+    os.environ["DATABASE_URL"] = criar_banco_temporario()
+    os.environ.setdefault("SECRET_KEY", "chave-secreta-de-benchmark")
+    os.environ.setdefault("ALGORITHM", "HS256")
+    from backend.database import SessionLocal, engine
+
+    loop = asyncio.new_event_loop()
+    session = SessionLocal()
+    try:
+        resultados = {
+            nome: _medir(executar, args.repeticoes, args.tempo_minimo)
+            for nome, executar in _casos(loop, session).items()
+            if not args.filtro or args.filtro in nome
+        }
+    finally:
+        loop.run_until_complete(session.close())
+        loop.run_until_complete(engine.dispose())
+        loop.close()
+
+    if args.salvar_baseline or baseline is None:
+        anteriores = {}
+        if baseline is not None and baseline["ambiente"] == atual:
+            anteriores = baseline["casos"]
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(
+            json.dumps(
+                {"ambiente": atual, "casos": {**anteriores, **resultados}}, indent=2
+            )
+            + "\n"
+        )
+        if not args.salvar_baseline:
+            print(
+                f"Sem baseline; resultados gravados em {args.baseline}", file=sys.stderr
+            )
+        print(json.dumps({"ambiente": atual, "casos": resultados}, indent=2))
+        return
+
+    comparados = comparar(resultados, baseline["casos"], args.limite)
+    regressoes = [nome for nome, caso in comparados.items() if caso.get("regressao")]
+    print(
+        json.dumps(
+            {
+                "ambiente": atual,
+                "limite": args.limite,
+                "casos": comparados,
+                "regressoes": regressoes,
+            },
+            indent=2,
+        )
+    )
+    sys.exit(1 if regressoes else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Mixed read/write benchmark of the SQLite production profile.
+
+Starts the backend twice on fresh SQLite databases, once with
+`SQLITE_PRODUCTION_PROFILE=false` (rollback journal, default PRAGMAs) and once with
+the profile enabled, and runs the same workload against both: concurrent clients
+create orders with `criar_pedido`, add items with `adicionar_item_pedido` and read the
+orders back. Throughput, latency percentiles and failed requests (e.g. "database is
+locked") are reported as JSON.
+
+    python -m backend.benchmarks.perfil_sqlite --clientes 32 --pedidos 5
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+from backend.benchmarks.common import (
+    criar_banco_temporario,
+    registrar_e_logar,
+    resumir_latencias,
+    servidor_uvicorn,
+)
+
+ITEM = {"quantidade": 2, "sabor": "Portuguesa", "tamanho": "G", "preco_unitario": 42.5}
+
+
+async def _cliente(client, id_usuario, headers, pedidos, itens, latencias, erros):
+    async def _medir(metodo, url, **kwargs):
+        inicio = time.perf_counter()
+        resposta = await client.request(metodo, url, headers=headers, **kwargs)
+        latencias.append(time.perf_counter() - inicio)
+        if resposta.status_code >= 400:
+            erros.append(resposta.status_code)
+        return resposta
+
+    for _ in range(pedidos):
+        resposta = await _medir("POST", "/pedidos/pedido", json={"usuario": id_usuario})
+        if resposta.status_code >= 400:
+            continue
+        id_pedido = int(resposta.json()["mensagem"].rsplit(" ", 1)[-1])
+        for _ in range(itens):
+            await _medir(
+                "POST", f"/pedidos/pedido/adicionar-item/{id_pedido}", json=ITEM
+            )
+            await _medir("GET", f"/pedidos/pedido/{id_pedido}")
+        await _medir("GET", "/pedidos/listar/pedidos-usuario")
+
+
+async def _executar(url_base, clientes, pedidos, itens):
+    limites = httpx.Limits(max_connections=clientes)
+    async with httpx.AsyncClient(
+        base_url=url_base, timeout=120, limits=limites
+    ) as client:
+        usuarios = [
+            await registrar_e_logar(client, f"perfil-{i}@teste.com")
+            for i in range(clientes)
+        ]
+        latencias: list[float] = []
+        erros: list[int] = []
+        inicio = time.perf_counter()
+        await asyncio.gather(
+            *(
+                _cliente(client, id_usuario, headers, pedidos, itens, latencias, erros)
+                for id_usuario, headers in usuarios
+            )
+        )
+        duracao = time.perf_counter() - inicio
+    return {**resumir_latencias(latencias, duracao), "erros": len(erros)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clientes", type=int, default=32)
+    parser.add_argument("--pedidos", type=int, default=5, help="pedidos por cliente")
+    parser.add_argument("--itens", type=int, default=4, help="itens por pedido")
+    args = parser.parse_args()
+
+    resultados = {}
+    for nome, perfil in (("sem_perfil", "false"), ("com_perfil", "true")):
+        env = {"SQLITE_PRODUCTION_PROFILE": perfil}
+        with servidor_uvicorn(criar_banco_temporario(), env) as url_base:
+            resultados[nome] = asyncio.run(
+                _executar(url_base, args.clientes, args.pedidos, args.itens)
+            )
+    print(json.dumps(resultados, indent=2))
+
+
+if __name__ == "__main__":
+    main()
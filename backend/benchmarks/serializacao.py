@@ -0,0 +1,136 @@
+"""Serialization benchmark of the order list response.
+
+Builds `--pedidos` orders with `--itens` items each in an in-memory SQLite database and
+times the two ways of turning them into the JSON body of a page of orders: the ORM
+path FastAPI used before (ORM objects with `selectinload`, `ListaPedidosSchema`
+validation, `jsonable_encoder` and `json.dumps`) and the fast path of
+`backend.serializacao` (column tuples, dicts and orjson). Reports the median time of
+`--repeticoes` runs of each, split into loading and encoding, as JSON.
+
+    python -m backend.benchmarks.serializacao --pedidos 1000 --itens 3
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import selectinload
+
+from backend.models import Base, ItemPedido, Pedido, Usuario
+from backend.schemas import ListaPedidosSchema
+from backend.serializacao import COLUNAS_PEDIDO, anexar_itens, pedido_como_dicionario
+
+
+async def _popular(session, pedidos: int, itens: int):
+    await session.execute(
+        insert(Usuario), [{"nome": "bench", "email": "bench@teste.com", "senha": "x"}]
+    )
+    await session.execute(
+        insert(Pedido),
+        [
+            {"usuario": 1, "status": "PENDENTE", "preco": itens * 42.5, "versao": 1}
+            for _ in range(pedidos)
+        ],
+    )
+    await session.execute(
+        insert(ItemPedido),
+        [
+            {
+                "quantidade": 1,
+                "sabor": "Portuguesa",
+                "tamanho": "G",
+                "preco_unitario": 42.5,
+                "pedido": id_pedido,
+            }
+            for id_pedido in range(1, pedidos + 1)
+            for _ in range(itens)
+        ],
+    )
+    await session.commit()
+
+
+async def _caminho_orm(session):
+    inicio = time.perf_counter()
+    pedidos = (
+        await session.scalars(
+            select(Pedido).order_by(Pedido.id).options(selectinload(Pedido.itens))
+        )
+    ).all()
+    carregado = time.perf_counter()
+    modelo = ListaPedidosSchema.model_validate(
+        {"pedidos": pedidos, "next_cursor": None}
+    )
+    corpo = json.dumps(jsonable_encoder(modelo)).encode()
+    return carregado - inicio, time.perf_counter() - carregado, corpo
+
+
+async def _caminho_rapido(session):
+    inicio = time.perf_counter()
+    linhas = (await session.execute(select(*COLUNAS_PEDIDO).order_by(Pedido.id))).all()
+    pedidos = await anexar_itens(
+        session, [pedido_como_dicionario(linha) for linha in linhas]
+    )
+    carregado = time.perf_counter()
+    corpo = orjson.dumps({"pedidos": pedidos, "next_cursor": None})
+    return carregado - inicio, time.perf_counter() - carregado, corpo
+
+
+async def executar(pedidos: int, itens: int, repeticoes: int) -> dict:
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    fabrica = async_sessionmaker(engine, expire_on_commit=False)
+    async with fabrica() as session:
+        await _popular(session, pedidos, itens)
+
+    resultado = {}
+    corpos = {}
+    for nome, caminho in (("orm", _caminho_orm), ("rapido", _caminho_rapido)):
+        carga, codificacao = [], []
+        for _ in range(repeticoes):
+            # Fresh session per run, so the ORM path pays for building objects every time
+            async with fabrica() as session:
+                tempo_carga, tempo_codificacao, corpos[nome] = await caminho(session)
+            carga.append(tempo_carga)
+            codificacao.append(tempo_codificacao)
+        resultado[nome] = {
+            "carga_ms": round(statistics.median(carga) * 1000, 3),
+            "codificacao_ms": round(statistics.median(codificacao) * 1000, 3),
+            "total_ms": round(
+                statistics.median(
+                    a + b for a, b in zip(carga, codificacao, strict=True)
+                )
+                * 1000,
+                3,
+            ),
+            "bytes": len(corpos[nome]),
+        }
+    await engine.dispose()
+
+    if json.loads(corpos["orm"]) != json.loads(corpos["rapido"]):
+        raise SystemExit("os dois caminhos produziram corpos diferentes")
+    resultado["aceleracao"] = round(
+        resultado["orm"]["total_ms"] / resultado["rapido"]["total_ms"], 2
+    )
+    return {"pedidos": pedidos, "itens_por_pedido": itens, **resultado}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pedidos", type=int, default=1000)
+    parser.add_argument("--itens", type=int, default=3)
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args()
+
+    resultado = asyncio.run(executar(args.pedidos, args.itens, args.repeticoes))
+    print(json.dumps(resultado, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -20,8 +20,78 @@ ALGORITHM = os.getenv("ALGORITHM")
 """The algorithm used for JWT signing (e.g., 'HS256')."""
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 120))
 """The expiration time for access tokens in minutes."""
-DATABASE_URL = os.getenv("DATABASE_URL")
-"""The URL for connecting to the database."""
+DATABASE_URL = os.getenv(
+    "DATABASE_URL", f"sqlite:///{Path(__file__).parent / 'banco.db'}"
+)
+"""The URL for connecting to the database (defaults to `banco.db` in the backend folder)."""
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+"""Number of connections kept open in the database connection pool."""
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+"""Extra connections the pool may open beyond `DB_POOL_SIZE` under load."""
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+"""Seconds a request waits for a free pooled connection before failing."""
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", -1))
+"""Seconds after which a pooled connection is replaced (-1 disables recycling)."""
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+"""Whether pooled connections are tested for liveness before each checkout."""
+DATABASE_REPLICA_URLS = [
+    url.strip()
+    for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",")
+    if url.strip()
+]
+"""Comma-separated URLs of read-only replicas that serve GET requests (none by default)."""
+LEITURA_PROPRIA_SEGUNDOS = float(os.getenv("LEITURA_PROPRIA_SEGUNDOS", 0))
+"""Seconds a user's reads stay on the primary after they write (0 disables the window)."""
+
+SQLITE_PRODUCTION_PROFILE = (
+    os.getenv("SQLITE_PRODUCTION_PROFILE", "true").lower() == "true"
+)
+"""Whether the SQLite tuning PRAGMAs below are applied to every new connection."""
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+"""SQLite journal mode; WAL lets readers run concurrently with a writer."""
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+"""SQLite synchronous level; NORMAL is durable enough for WAL and much faster than FULL."""
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", 268435456))
+"""Bytes of the database file SQLite may memory-map (256 MiB by default)."""
+SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", -65536))
+"""SQLite page cache per connection; negative values are KiB (64 MiB by default)."""
+SQLITE_BUSY_TIMEOUT = int(os.getenv("SQLITE_BUSY_TIMEOUT", 5000))
+"""Milliseconds SQLite waits on a locked database before raising "database is locked"."""
+SQLITE_TEMP_STORE = os.getenv("SQLITE_TEMP_STORE", "MEMORY")
+"""Where SQLite keeps temporary tables and indices (DEFAULT, FILE or MEMORY)."""
+PAGINACAO_LIMITE_PADRAO = int(os.getenv("PAGINACAO_LIMITE_PADRAO", 50))
+"""Number of orders returned per page when the client does not send `limit`."""
+PAGINACAO_LIMITE_MAXIMO = int(os.getenv("PAGINACAO_LIMITE_MAXIMO", 200))
+"""Largest page size the server returns, whatever `limit` the client asks for."""
+BCRYPT_MAX_WORKERS = int(os.getenv("BCRYPT_MAX_WORKERS", min(4, os.cpu_count() or 1)))
+"""Threads that hash and verify passwords concurrently, off the event loop."""
+BCRYPT_MAX_QUEUE = int(os.getenv("BCRYPT_MAX_QUEUE", 64))
+"""Password operations allowed to wait for a thread before requests fail with 503."""
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", 10000))
+"""Maximum number of verified tokens kept in memory (0 disables the cache)."""
+PRINCIPAL_CACHE_TTL = int(os.getenv("PRINCIPAL_CACHE_TTL", 60))
+"""Seconds a verified token is trusted without reading the user again (never past `exp`).
+
+Only ORM changes made in the same process invalidate an entry early. A user demoted or
+deleted through Core/SQL, a CLI or another worker keeps their cached access for up to
+this long, so keep it short.
+"""
+TOKEN_STORE = os.getenv("TOKEN_STORE", "nulo")
+"""Where issued tokens are kept server-side: "nulo" (nowhere), "memoria" or "arquivo"."""
+LOTE_MAX_ITENS = int(os.getenv("LOTE_MAX_ITENS", 500))
+"""Largest number of items accepted by a single batch order request."""
+EXPORTACAO_TAMANHO_LOTE = int(os.getenv("EXPORTACAO_TAMANHO_LOTE", 1000))
+"""Rows fetched from the database per round trip by the streaming exports."""
+METRICAS_HABILITADAS = os.getenv("METRICAS_HABILITADAS", "true").lower() == "true"
+"""Whether requests and queries are measured and exposed on `/metrics`."""
+AUDITORIA_CONSULTAS = os.getenv("AUDITORIA_CONSULTAS", "desligada")
+"""SQL auditing of each request: "desligada", "aviso" (log) or "erro" (raise, for tests)."""
+AUDITORIA_CONSULTAS_ORCAMENTO_PADRAO = int(
+    os.getenv("AUDITORIA_CONSULTAS_ORCAMENTO_PADRAO", 10)
+)
+"""Statements a request may execute when its route declares no budget of its own."""
+AUDITORIA_CONSULTAS_REPETICOES = int(os.getenv("AUDITORIA_CONSULTAS_REPETICOES", 3))
+"""Executions of one statement in a request that are reported as a likely N+1."""
 
 oauth2_schema = OAuth2PasswordBearer(tokenUrl="auth/login-form")
 """OAuth2PasswordBearer instance for handling token-based authentication."""
@@ -1,16 +1,226 @@
-import os
+"""Database engine and session factory for the FastAPI application.
 
-from dotenv import load_dotenv
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+The application talks to the database through SQLAlchemy's asyncio extension, so route
+handlers await their queries instead of blocking the event loop. A single engine and
+session factory are built once per process from `DATABASE_URL`; the synchronous URL
+(also used by Alembic) is mapped to an async driver automatically. Read-only replicas
+listed in `DATABASE_REPLICA_URLS` get an engine and session factory of their own.
+"""
 
-# Carrega as variáveis do .env
-load_dotenv()
+import time
 
-DATABASE_URL = os.getenv("DATABASE_URL")
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
-# pyrefly: ignore  # no-matching-overload
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
-Base = declarative_base()
+from backend.config import (
+    DATABASE_REPLICA_URLS,
+    DATABASE_URL,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    SQLITE_BUSY_TIMEOUT,
+    SQLITE_CACHE_SIZE,
+    SQLITE_JOURNAL_MODE,
+    SQLITE_MMAP_SIZE,
+    SQLITE_PRODUCTION_PROFILE,
+    SQLITE_SYNCHRONOUS,
+    SQLITE_TEMP_STORE,
+)
+
+DRIVERS_ASSINCRONOS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+    "mysql": "aiomysql",
+}
+"""Async DBAPI driver used for each backend when `DATABASE_URL` does not name one."""
+
+PERFIL_SQLITE = {
+    "journal_mode": SQLITE_JOURNAL_MODE,
+    "synchronous": SQLITE_SYNCHRONOUS,
+    "mmap_size": SQLITE_MMAP_SIZE,
+    "cache_size": SQLITE_CACHE_SIZE,
+    "busy_timeout": SQLITE_BUSY_TIMEOUT,
+    "temp_store": SQLITE_TEMP_STORE,
+}
+"""PRAGMAs of the SQLite production profile, applied when each connection is opened."""
+
+
+def url_assincrona(url: str) -> str:
+    """Converts a database URL into one that uses an async DBAPI driver.
+
+    URLs that already name a driver (e.g. `postgresql+psycopg://`) are returned unchanged,
+    so any async-capable driver can be plugged in through the environment.
+
+    Args:
+        url (str): The database URL, usually taken from `DATABASE_URL`.
+
+    Raises:
+        ValueError: If no async driver is known for the URL's backend.
+
+    Returns:
+        str: The URL with an async driver.
+    """
+    url_banco = make_url(url)
+    if "+" in url_banco.drivername:
+        return url
+    backend = url_banco.get_backend_name()
+    driver = DRIVERS_ASSINCRONOS.get(backend)
+    if driver is None:
+        raise ValueError(
+            f"Nenhum driver assíncrono conhecido para '{backend}'; "
+            "informe um driver explicitamente em DATABASE_URL"
+        )
+    return url_banco.set(drivername=f"{backend}+{driver}").render_as_string(
+        hide_password=False
+    )
+
+
+class EstatisticasPool:
+    """Checkout counters for a connection pool, used to size it for the real load.
+
+    Attributes:
+        checkouts (int): Number of connections handed out by the pool.
+        timeouts (int): Checkouts that gave up after `DB_POOL_TIMEOUT` seconds.
+        espera_total (float): Total seconds spent waiting for a connection.
+        espera_maxima (float): Longest single wait for a connection, in seconds.
+    """
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.espera_total = 0.0
+        self.espera_maxima = 0.0
+
+    def registrar_checkout(self, espera: float):
+        """Records a successful checkout that waited `espera` seconds."""
+        self.checkouts += 1
+        self.espera_total += espera
+        self.espera_maxima = max(self.espera_maxima, espera)
+
+
+class PoolMonitorado(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long each checkout waits for a connection.
+
+    The wait includes opening a new connection when the pool grows, since that is
+    time the request spends blocked as well.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.estatisticas = EstatisticasPool()
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            conexao = super()._do_get()
+        except exc.TimeoutError:
+            self.estatisticas.timeouts += 1
+            raise
+        self.estatisticas.registrar_checkout(time.perf_counter() - inicio)
+        return conexao
+
+
+def aplicar_pragmas_sqlite(engine_banco: AsyncEngine, pragmas: dict):
+    """Runs the given PRAGMAs on every new DBAPI connection of a SQLite engine.
+
+    Args:
+        engine_banco (AsyncEngine): The SQLite engine to configure.
+        pragmas (dict): PRAGMA names mapped to their values, e.g. `PERFIL_SQLITE`.
+    """
+
+    @event.listens_for(engine_banco.sync_engine, "connect")
+    def _executar_pragmas(conexao_dbapi, registro_conexao):
+        cursor = conexao_dbapi.cursor()
+        for nome, valor in pragmas.items():
+            cursor.execute(f"PRAGMA {nome}={valor}")
+        cursor.close()
+
+
+def criar_engine(url: str, pragmas_sqlite: dict | None = None) -> AsyncEngine:
+    """Builds an async engine for `url` with the pool settings from `backend.config`.
+
+    In-memory SQLite databases keep SQLAlchemy's default single-connection pool, since
+    a queue pool would give each connection its own empty database. SQLite engines get
+    the production profile PRAGMAs when `SQLITE_PRODUCTION_PROFILE` is enabled.
+
+    Args:
+        url (str): The synchronous or async database URL.
+        pragmas_sqlite (dict, optional): PRAGMAs for SQLite connections. Defaults to
+            `PERFIL_SQLITE`, or none when the production profile is disabled.
+
+    Returns:
+        AsyncEngine: The configured engine.
+    """
+    url = url_assincrona(url)
+    url_banco = make_url(url)
+    if url_banco.get_backend_name() != "sqlite":
+        return _criar_engine_com_pool(url)
+    if pragmas_sqlite is None:
+        pragmas_sqlite = PERFIL_SQLITE if SQLITE_PRODUCTION_PROFILE else {}
+    if url_banco.database in (None, "", ":memory:"):
+        engine_banco = create_async_engine(url)
+    else:
+        engine_banco = _criar_engine_com_pool(url)
+    if pragmas_sqlite:
+        aplicar_pragmas_sqlite(engine_banco, pragmas_sqlite)
+    return engine_banco
+
+
+def _criar_engine_com_pool(url: str) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        poolclass=PoolMonitorado,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+    )
+
+
+def estatisticas_pool(engine_banco: AsyncEngine | None = None) -> dict:
+    """Returns a snapshot of the connection pool usage of an engine.
+
+    Args:
+        engine_banco (AsyncEngine, optional): The engine to inspect. Defaults to `engine`.
+
+    Returns:
+        dict: Pool size, connections in use, overflow and checkout/wait counters.
+    """
+    pool = (engine_banco or engine).pool
+    if not isinstance(pool, PoolMonitorado):
+        return {"pool": type(pool).__name__}
+    estatisticas = pool.estatisticas
+    return {
+        "pool": type(pool).__name__,
+        "tamanho": pool.size(),
+        "em_uso": pool.checkedout(),
+        "disponiveis": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "max_overflow": pool._max_overflow,
+        "checkouts": estatisticas.checkouts,
+        "timeouts": estatisticas.timeouts,
+        "espera_total_ms": round(estatisticas.espera_total * 1000, 3),
+        "espera_media_ms": round(
+            estatisticas.espera_total * 1000 / max(estatisticas.checkouts, 1), 3
+        ),
+        "espera_maxima_ms": round(estatisticas.espera_maxima * 1000, 3),
+    }
+
+
+engine = criar_engine(DATABASE_URL)
+"""Async SQLAlchemy engine shared by the whole application."""
+SessionLocal = async_sessionmaker(bind=engine, expire_on_commit=False)
+"""Factory for `AsyncSession` objects bound to `engine`, reused by every request."""
+
+engines_replicas = [criar_engine(url) for url in DATABASE_REPLICA_URLS]
+"""Async engines of the read-only replicas, one per URL in `DATABASE_REPLICA_URLS`."""
+SessoesReplicas = [
+    async_sessionmaker(bind=engine_replica, expire_on_commit=False)
+    for engine_replica in engines_replicas
+]
+"""Session factories bound to each of `engines_replicas`, in the same order."""
@@ -1,50 +1,289 @@
 """Module for common dependencies used in the FastAPI application.
 
 This module provides functions for managing database sessions and verifying JWT tokens,
-which are used as dependencies in various API routes.
+which are used as dependencies in various API routes. Verified tokens are kept in a
+small in-process cache, so cheap reads do not pay for a user lookup on every request.
+When read-only replicas are configured, GET requests get a replica session, unless
+their user wrote within the last `LEITURA_PROPRIA_SEGUNDOS` seconds.
 """
 
-from fastapi import Depends, HTTPException
+import itertools
+import time
+from collections import OrderedDict
+
+from fastapi import Depends, HTTPException, Request
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.config import (
+    ALGORITHM,
+    LEITURA_PROPRIA_SEGUNDOS,
+    PRINCIPAL_CACHE_SIZE,
+    PRINCIPAL_CACHE_TTL,
+    SECRET_KEY,
+    oauth2_schema,
+)
+from backend.database import SessionLocal, SessoesReplicas
+from backend.models import Usuario
 
-from backend.config import ALGORITHM, SECRET_KEY, oauth2_schema
-from backend.models import Usuario, db
 
+class UsuarioAutenticado:
+    """The authenticated user of a request, as returned by `verificar_token`.
 
-def pegar_sessao():
-    """Dependency that provides a SQLAlchemy database session.
+    Attributes:
+        id (int): The ID of the user.
+        admin (bool): Whether the user has administrative privileges.
+        ativo (bool): Whether the user account is active.
+    """
 
-    This function creates a new database session for each request and ensures it is closed after the request is completed.
+    __slots__ = ("id", "admin", "ativo")
 
-    Yields:
-        Session: A SQLAlchemy database session.
+    def __init__(self, id, admin, ativo):
+        self.id = id
+        self.admin = admin
+        self.ativo = ativo
+
+
+class CachePrincipais:
+    """Bounded LRU cache of verified tokens and the users they belong to.
+
+    Each entry expires after `ttl` seconds or at the token's `exp`, whichever comes first,
+    so a cached token is never accepted after it has expired.
+
+    Entries are invalidated early only by ORM `after_update`/`after_delete` events in
+    this process. Changes made through Core or raw SQL, by a CLI or by another worker
+    go unnoticed until the entry expires, so `ttl` bounds how long a demoted or deleted
+    user keeps access.
+
+    Attributes:
+        max_entradas (int): Entries kept before the least recently used is evicted.
+        ttl (int): Seconds an entry stays valid.
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that had to read the database.
+        evictions (int): Entries dropped to respect `max_entradas`.
+        invalidacoes (int): Entries dropped because their user changed.
+    """
+
+    def __init__(self, max_entradas: int, ttl: int):
+        self.max_entradas = max_entradas
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidacoes = 0
+        self._entradas = OrderedDict()
+        self._tokens_por_usuario = {}
+
+    def obter(self, token: str) -> UsuarioAutenticado | None:
+        """Returns the cached user of `token`, or None if absent or expired."""
+        entrada = self._entradas.get(token)
+        if entrada is None or entrada[1] <= time.time():
+            if entrada is not None:
+                self._remover(token)
+            self.misses += 1
+            return None
+        self._entradas.move_to_end(token)
+        self.hits += 1
+        return entrada[0]
+
+    def guardar(self, token: str, usuario: UsuarioAutenticado, expiracao_token: float):
+        """Caches `usuario` for `token` until `ttl` passes or the token expires."""
+        if self.max_entradas <= 0:
+            return
+        self._remover(token)
+        self._entradas[token] = (usuario, min(time.time() + self.ttl, expiracao_token))
+        self._tokens_por_usuario.setdefault(usuario.id, set()).add(token)
+        while len(self._entradas) > self.max_entradas:
+            self._remover(next(iter(self._entradas)))
+            self.evictions += 1
+
+    def invalidar_usuario(self, id_usuario: int):
+        """Drops every cached token of a user, e.g. after it was changed or deactivated."""
+        for token in list(self._tokens_por_usuario.get(id_usuario, ())):
+            self._remover(token)
+            self.invalidacoes += 1
+
+    def limpar(self):
+        """Drops every entry, keeping the counters."""
+        self._entradas.clear()
+        self._tokens_por_usuario.clear()
+
+    def estatisticas(self) -> dict:
+        """Returns the size of the cache and its hit/miss counters."""
+        consultas = self.hits + self.misses
+        return {
+            "entradas": len(self._entradas),
+            "max_entradas": self.max_entradas,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "taxa_acerto": round(self.hits / consultas, 4) if consultas else 0.0,
+            "evictions": self.evictions,
+            "invalidacoes": self.invalidacoes,
+        }
+
+    def _remover(self, token: str):
+        entrada = self._entradas.pop(token, None)
+        if entrada is None:
+            return
+        tokens = self._tokens_por_usuario.get(entrada[0].id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_por_usuario[entrada[0].id]
+
+
+cache_principais = CachePrincipais(PRINCIPAL_CACHE_SIZE, PRINCIPAL_CACHE_TTL)
+"""Process-wide cache used by `verificar_token`."""
+
+
+@event.listens_for(Usuario, "after_update")
+@event.listens_for(Usuario, "after_delete")
+def _invalidar_usuario_alterado(mapper, conexao, usuario):
+    # ORM flushes of this process only; see the limits in `CachePrincipais`
+    cache_principais.invalidar_usuario(usuario.id)
+
+
+METODOS_LEITURA = frozenset({"GET", "HEAD"})
+"""HTTP methods whose requests may be served by a read-only replica."""
+
+
+class JanelaLeituraPropria:
+    """Users who wrote recently, whose reads stay on the primary ("read your writes").
+
+    The window is kept in process memory, like `cache_principais`, so with several
+    workers it only covers the requests a user sends to the same worker.
+
+    Attributes:
+        segundos (float): Seconds after a write during which the user's reads go to
+            the primary; 0 disables the window.
     """
+
+    def __init__(self, segundos: float):
+        self.segundos = segundos
+        self._prazos = {}
+
+    def registrar_escrita(self, id_usuario: int):
+        """Keeps the user's reads on the primary for the next `segundos` seconds."""
+        if self.segundos <= 0:
+            return
+        agora = time.monotonic()
+        # Every deadline is `segundos` after its write, so re-inserting keeps the dict
+        # ordered by deadline and expired users are always at its start
+        self._prazos.pop(id_usuario, None)
+        self._prazos[id_usuario] = agora + self.segundos
+        for usuario, prazo in list(itertools.islice(self._prazos.items(), 16)):
+            if prazo > agora:
+                break
+            del self._prazos[usuario]
+
+    def recente(self, id_usuario: int) -> bool:
+        """Whether the user wrote less than `segundos` seconds ago."""
+        prazo = self._prazos.get(id_usuario)
+        return prazo is not None and prazo > time.monotonic()
+
+
+class RoteadorSessoes:
+    """Chooses the database of each request: the primary or one of the replicas.
+
+    Requests that may write always use the primary. Reads are spread over the replicas
+    in turn, except for users inside their read-your-writes window.
+
+    Args:
+        primaria (async_sessionmaker): Session factory of the primary database.
+        replicas (list[async_sessionmaker]): Session factories of the read-only replicas.
+        janela (JanelaLeituraPropria): Users whose reads must stay on the primary.
+    """
+
+    def __init__(self, primaria, replicas, janela: JanelaLeituraPropria):
+        self.primaria = primaria
+        self.replicas = list(replicas)
+        self.janela = janela
+        self._proximas = itertools.cycle(self.replicas)
+
+    def escolher(self, metodo: str, id_usuario: int | None = None):
+        """Returns the session factory for a request.
+
+        Args:
+            metodo (str): The HTTP method of the request.
+            id_usuario (int, optional): The user sending it, when known.
+
+        Returns:
+            async_sessionmaker: The primary's factory or a replica's.
+        """
+        if metodo not in METODOS_LEITURA or not self.replicas:
+            return self.primaria
+        if id_usuario is not None and self.janela.recente(id_usuario):
+            return self.primaria
+        return next(self._proximas)
+
+
+roteador_sessoes = RoteadorSessoes(
+    SessionLocal, SessoesReplicas, JanelaLeituraPropria(LEITURA_PROPRIA_SEGUNDOS)
+)
+"""Process-wide router used by `pegar_sessao`."""
+
+
+def _id_usuario_do_token(request: Request) -> int | None:
+    # The claims are not verified: they only choose the database, while
+    # `verificar_token` still authenticates the request
+    esquema, _, token = request.headers.get("authorization", "").partition(" ")
+    if esquema.lower() != "bearer" or not token:
+        return None
     try:
-        Session = sessionmaker(bind=db)
-        session = Session()
+        return int(jwt.get_unverified_claims(token)["sub"])
+    except (JWTError, KeyError, TypeError, ValueError):
+        return None
+
+
+async def pegar_sessao(request: Request):
+    """Dependency that provides an async SQLAlchemy database session.
+
+    This function opens a new `AsyncSession` for each request and ensures it is closed after the request is completed.
+    GET requests get a session on a read-only replica when `roteador_sessoes` has any;
+    requests of other methods mark their user as a recent writer.
+
+    Args:
+        request (Request): The request being served.
+
+    Yields:
+        AsyncSession: An async SQLAlchemy database session.
+    """
+    id_usuario = None
+    if roteador_sessoes.replicas and roteador_sessoes.janela.segundos > 0:
+        id_usuario = _id_usuario_do_token(request)
+    escrita = id_usuario is not None and request.method not in METODOS_LEITURA
+    if escrita:
+        # Marked before the write as well, so reads sent while it runs see it too
+        roteador_sessoes.janela.registrar_escrita(id_usuario)
+    async with roteador_sessoes.escolher(request.method, id_usuario)() as session:
         yield session
-    finally:
-        session.close()
+    if escrita:
+        roteador_sessoes.janela.registrar_escrita(id_usuario)
 
 
-def verificar_token(
-    token: str = Depends(oauth2_schema), session: Session = Depends(pegar_sessao)
+async def verificar_token(
+    token: str = Depends(oauth2_schema), session: AsyncSession = Depends(pegar_sessao)
 ):
     """Dependency that verifies the authenticity and validity of a JWT token.
 
     This function decodes the provided JWT token, extracts the user ID, and retrieves the corresponding user from the database.
+    Tokens verified recently are answered from `cache_principais` without decoding or querying again.
 
     Args:
         token (str): The JWT token provided in the request header (injected by OAuth2PasswordBearer).
-        session (Session): The database session (injected by pegar_sessao).
+        session (AsyncSession): The database session (injected by pegar_sessao).
 
     Raises:
         HTTPException: If the token is invalid, expired, or the user associated with the token is not found.
 
     Returns:
-        Usuario: The authenticated user object.
+        UsuarioAutenticado: The authenticated user.
     """
+    usuario = cache_principais.obter(token)
+    if usuario is not None:
+        return usuario
     try:
         dic_info = jwt.decode(token, SECRET_KEY, ALGORITHM)
         # pyrefly: ignore  # no-matching-overload
@@ -55,7 +294,34 @@ def verificar_token(
     ) from e
     # verificar se o token é válido
     # extrair o ID do usuário do token
-    usuario = session.query(Usuario).filter(Usuario.id == id_usuario).first()
-    if not usuario:
+    linha = (
+        await session.execute(
+            select(Usuario.id, Usuario.admin, Usuario.ativo).where(
+                Usuario.id == id_usuario
+            )
+        )
+    ).first()
+    if not linha:
         raise HTTPException(status_code=401, detail="Acesso Inválido")
+    usuario = UsuarioAutenticado(*linha)
+    cache_principais.guardar(token, usuario, dic_info.get("exp", float("inf")))
+    return usuario
+
+
+async def verificar_admin(usuario: UsuarioAutenticado = Depends(verificar_token)):
+    """Dependency that only lets administrators through.
+
+    Args:
+        usuario (UsuarioAutenticado): The authenticated user (injected by verificar_token).
+
+    Raises:
+        HTTPException: If the user is not an administrator.
+
+    Returns:
+        UsuarioAutenticado: The authenticated administrator.
+    """
+    if not usuario.admin:
+        raise HTTPException(
+            status_code=401, detail="Voce não tem autorização para fazer esta operação"
+        )
     return usuario
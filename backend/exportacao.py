@@ -0,0 +1,338 @@
+"""Bulk export of orders and their items.
+
+Exports read straight from a database cursor in fixed-size batches, without building
+ORM objects or holding the whole table in memory, so they can run against tables of any size.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import Float, Integer, String, Table, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from backend.config import EXPORTACAO_TAMANHO_LOTE
+from backend.database import engine
+from backend.models import ItemPedido, Pedido
+
+TABELAS_EXPORTAVEIS = {
+    "pedidos": Pedido.__table__,
+    "itens_pedido": ItemPedido.__table__,
+}
+"""Tables available to the columnar exports, by name."""
+
+FORMATOS_COLUNARES = {
+    "parquet": ("parquet", "application/vnd.apache.parquet"),
+    "arrow": ("arrows", "application/vnd.apache.arrow.stream"),
+}
+"""File extension and media type of each columnar format ("arrow" is the IPC stream format)."""
+
+_TIPOS_ARROW = {Integer: pa.int64(), Float: pa.float64(), String: pa.string()}
+
+
+def _consulta_pedidos_com_itens():
+    """Builds the query joining every order to its items, ordered for grouping.
+
+    Returns:
+        Select: One row per item (or one row for an order without items), ordered by order ID.
+    """
+    return (
+        select(
+            Pedido.id,
+            Pedido.usuario,
+            Pedido.status,
+            Pedido.preco,
+            ItemPedido.id.label("item_id"),
+            ItemPedido.quantidade,
+            ItemPedido.sabor,
+            ItemPedido.tamanho,
+            ItemPedido.preco_unitario,
+        )
+        .outerjoin(ItemPedido, ItemPedido.pedido == Pedido.id)
+        .order_by(Pedido.id, ItemPedido.id)
+    )
+
+
+async def pedidos_ndjson(
+    engine_banco: AsyncEngine | None = None,
+    tamanho_lote: int = EXPORTACAO_TAMANHO_LOTE,
+):
+    """Streams every order with its items as newline-delimited JSON.
+
+    The query runs on a server-side cursor and rows are fetched `tamanho_lote` at a
+    time; each order is written as soon as its last item has been read, so memory use
+    does not depend on the size of the table. The export sees a single consistent
+    snapshot of the database.
+
+    Args:
+        engine_banco (AsyncEngine, optional): The engine to read from. Defaults to the application engine.
+        tamanho_lote (int, optional): Rows fetched per round trip.
+
+    Yields:
+        bytes: One JSON document per order, terminated by a newline.
+    """
+    engine_banco = engine_banco or engine
+    async with engine_banco.connect() as conexao:
+        resultado = await conexao.stream(
+            _consulta_pedidos_com_itens().execution_options(yield_per=tamanho_lote)
+        )
+        pedido = None
+        async for particao in resultado.partitions():
+            for linha in particao:
+                if pedido is None or pedido["id"] != linha.id:
+                    if pedido is not None:
+                        yield (json.dumps(pedido, ensure_ascii=False) + "\n").encode()
+                    pedido = {
+                        "id": linha.id,
+                        "usuario": linha.usuario,
+                        "status": linha.status,
+                        "preco": linha.preco,
+                        "itens": [],
+                    }
+                if linha.item_id is not None:
+                    pedido["itens"].append(
+                        {
+                            "id": linha.item_id,
+                            "quantidade": linha.quantidade,
+                            "sabor": linha.sabor,
+                            "tamanho": linha.tamanho,
+                            "preco_unitario": linha.preco_unitario,
+                        }
+                    )
+        if pedido is not None:
+            yield (json.dumps(pedido, ensure_ascii=False) + "\n").encode()
+
+
+def esquema_arrow(tabela: Table) -> pa.Schema:
+    """Builds the Arrow schema of a table from its column types.
+
+    Args:
+        tabela (Table): The table to describe.
+
+    Returns:
+        pa.Schema: One nullable field per column, in table order.
+    """
+    campos = []
+    for coluna in tabela.columns:
+        tipo = next(
+            tipo_arrow
+            for tipo_sql, tipo_arrow in _TIPOS_ARROW.items()
+            if isinstance(coluna.type, tipo_sql)
+        )
+        campos.append(pa.field(coluna.name, tipo))
+    return pa.schema(campos)
+
+
+class _SaidaEmBlocos:
+    """Write-only file object that keeps what was written until it is taken out."""
+
+    closed = False
+
+    def __init__(self):
+        self._blocos = []
+        self._posicao = 0
+
+    def write(self, dados) -> int:
+        self._blocos.append(bytes(dados))
+        self._posicao += len(dados)
+        return len(dados)
+
+    def tell(self) -> int:
+        return self._posicao
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def retirar(self) -> bytes:
+        """Returns and forgets everything written since the last call."""
+        dados = b"".join(self._blocos)
+        self._blocos.clear()
+        return dados
+
+
+class ExportacaoColunar:
+    """Export of one table to Parquet or Arrow IPC, written batch by batch.
+
+    Rows are read through a server-side cursor and each fetched batch becomes one Arrow
+    record batch, with no ORM objects in between. Only rows with an ID greater than
+    `apos_id` are exported, which makes incremental exports possible.
+
+    Attributes:
+        linhas (int): Rows exported so far.
+        ultimo_id (int): Largest ID exported so far (`apos_id` while nothing was exported).
+    """
+
+    def __init__(
+        self,
+        nome_tabela: str,
+        formato: str = "parquet",
+        apos_id: int = 0,
+        engine_banco: AsyncEngine | None = None,
+        tamanho_lote: int = EXPORTACAO_TAMANHO_LOTE,
+    ):
+        """Initializes the export.
+
+        Args:
+            nome_tabela (str): One of `TABELAS_EXPORTAVEIS`.
+            formato (str, optional): "parquet" or "arrow". Defaults to "parquet".
+            apos_id (int, optional): Export only rows with a greater ID. Defaults to 0 (all rows).
+            engine_banco (AsyncEngine, optional): The engine to read from. Defaults to the application engine.
+            tamanho_lote (int, optional): Rows per fetch and per record batch.
+
+        Raises:
+            ValueError: If the table or the format is unknown.
+        """
+        if nome_tabela not in TABELAS_EXPORTAVEIS:
+            raise ValueError(f"Tabela não exportável: {nome_tabela!r}")
+        if formato not in FORMATOS_COLUNARES:
+            raise ValueError(f"Formato de exportação desconhecido: {formato!r}")
+        self.tabela = TABELAS_EXPORTAVEIS[nome_tabela]
+        self.formato = formato
+        self.apos_id = apos_id
+        self.engine_banco = engine_banco or engine
+        self.tamanho_lote = tamanho_lote
+        self.esquema = esquema_arrow(self.tabela)
+        self.linhas = 0
+        self.ultimo_id = apos_id
+
+    def _abrir_escritor(self, saida):
+        if self.formato == "parquet":
+            return pq.ParquetWriter(saida, self.esquema)
+        return pa.ipc.new_stream(saida, self.esquema)
+
+    async def blocos(self):
+        """Runs the export, yielding the encoded file as it is produced.
+
+        Yields:
+            bytes: Consecutive pieces of the Parquet file or Arrow IPC stream.
+        """
+        saida = _SaidaEmBlocos()
+        escritor = self._abrir_escritor(pa.PythonFile(saida, mode="w"))
+        consulta = (
+            select(self.tabela)
+            .where(self.tabela.c.id > self.apos_id)
+            .order_by(self.tabela.c.id)
+            .execution_options(yield_per=self.tamanho_lote)
+        )
+        async with self.engine_banco.connect() as conexao:
+            resultado = await conexao.stream(consulta)
+            async for particao in resultado.partitions():
+                colunas = zip(*particao, strict=True)
+                lote = pa.RecordBatch.from_arrays(
+                    [
+                        pa.array(valores, type=campo.type)
+                        for valores, campo in zip(colunas, self.esquema, strict=True)
+                    ],
+                    schema=self.esquema,
+                )
+                escritor.write_batch(lote)
+                self.linhas += lote.num_rows
+                self.ultimo_id = particao[-1].id
+                yield saida.retirar()
+        escritor.close()
+        yield saida.retirar()
+
+
+async def exportar_snapshot(
+    diretorio: Path,
+    formato: str = "parquet",
+    incremental: bool = False,
+    engine_banco: AsyncEngine | None = None,
+    tamanho_lote: int = EXPORTACAO_TAMANHO_LOTE,
+) -> dict:
+    """Writes `pedidos` and `itens_pedido` to columnar files in a directory.
+
+    Each run writes one file per table with new rows, named after the ID range it holds
+    (e.g. `pedidos_1-5000.parquet`), and records the last exported IDs in
+    `manifesto.json`. Incremental runs read the manifest and export only rows with
+    greater IDs, so the files of a directory together hold every row once. Rows changed
+    after being exported are not exported again.
+
+    Args:
+        diretorio (Path): The destination directory, created if missing.
+        formato (str, optional): "parquet" or "arrow". Defaults to "parquet".
+        incremental (bool, optional): Continue from the manifest instead of exporting everything.
+        engine_banco (AsyncEngine, optional): The engine to read from. Defaults to the application engine.
+        tamanho_lote (int, optional): Rows per fetch and per record batch.
+
+    Returns:
+        dict: Per table, the file written (or None), the rows exported and the last exported ID.
+    """
+    diretorio = Path(diretorio)
+    diretorio.mkdir(parents=True, exist_ok=True)
+    caminho_manifesto = diretorio / "manifesto.json"
+    manifesto = {}
+    if incremental and caminho_manifesto.exists():
+        manifesto = json.loads(caminho_manifesto.read_text())
+    extensao = FORMATOS_COLUNARES[formato][0]
+
+    resumo = {}
+    # Itens antes dos pedidos: todo item exportado tem o seu pedido no mesmo snapshot.
+    for nome_tabela in ("itens_pedido", "pedidos"):
+        exportacao = ExportacaoColunar(
+            nome_tabela,
+            formato,
+            manifesto.get(nome_tabela, 0),
+            engine_banco,
+            tamanho_lote,
+        )
+        parcial = diretorio / f"{nome_tabela}.{extensao}.parcial"
+        with parcial.open("wb") as arquivo:
+            async for bloco in exportacao.blocos():
+                arquivo.write(bloco)
+        arquivo_final = None
+        if exportacao.linhas:
+            arquivo_final = (
+                diretorio
+                / f"{nome_tabela}_{exportacao.apos_id + 1}-{exportacao.ultimo_id}.{extensao}"
+            )
+            os.replace(parcial, arquivo_final)
+        else:
+            parcial.unlink()
+        manifesto[nome_tabela] = exportacao.ultimo_id
+        resumo[nome_tabela] = {
+            "arquivo": arquivo_final and arquivo_final.name,
+            "linhas": exportacao.linhas,
+            "ultimo_id": exportacao.ultimo_id,
+        }
+
+    caminho_manifesto.write_text(json.dumps(manifesto, indent=2))
+    return resumo
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Exporta pedidos e itens para arquivos Parquet ou Arrow."
+    )
+    parser.add_argument("destino", type=Path, help="diretório dos arquivos exportados")
+    parser.add_argument(
+        "--formato", choices=sorted(FORMATOS_COLUNARES), default="parquet"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="exporta apenas IDs maiores que os do manifesto do diretório",
+    )
+    parser.add_argument("--lote", type=int, default=EXPORTACAO_TAMANHO_LOTE)
+    args = parser.parse_args()
+
+    async def _executar():
+        try:
+            return await exportar_snapshot(
+                args.destino, args.formato, args.incremental, tamanho_lote=args.lote
+            )
+        finally:
+            await engine.dispose()
+
+    print(json.dumps(asyncio.run(_executar()), indent=2))
+
+
+if __name__ == "__main__":
+    main()
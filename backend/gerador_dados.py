@@ -0,0 +1,331 @@
+"""Synthetic data generator for load and performance tests.
+
+Fills `usuarios`, `pedidos` and `itens_pedido` with realistic-looking volume: flavors
+follow a Zipf distribution (a few flavors sell most), sizes, quantities, items per
+order and order statuses follow fixed mixes, and prices depend on flavor and size.
+Rows are written with Core bulk INSERTs (`executemany`) in large batches, one
+transaction per `--pedidos-por-transacao` orders, with explicit IDs so nothing is
+read back. The aggregate tables are rebuilt at the end with `reconstruir_agregados`.
+
+The output depends only on the seed and the counts: orders are drawn in blocks of
+`PEDIDOS_POR_BLOCO`, each from its own seeded generator, so the same seed on an
+empty database always produces the same rows whatever the batch sizes. New rows get
+IDs after the existing ones, so the generator can also add volume to a database that
+already has data.
+
+    python -m backend.gerador_dados --usuarios 10000 --pedidos 400000 --semente 42
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from backend.agregados import reconstruir_agregados
+from backend.database import engine
+from backend.models import ItemPedido, Pedido, Usuario
+from backend.security import bcrypt_context
+
+SABORES = {
+    "Mussarela": 38.0,
+    "Calabresa": 42.0,
+    "Portuguesa": 46.0,
+    "Margherita": 44.0,
+    "Frango com Catupiry": 48.0,
+    "Quatro Queijos": 50.0,
+    "Pepperoni": 52.0,
+    "Napolitana": 42.0,
+    "Bacon": 47.0,
+    "Atum": 45.0,
+    "Palmito": 46.0,
+    "Toscana": 45.0,
+    "Vegetariana": 44.0,
+    "Baiana": 43.0,
+    "Chocolate": 40.0,
+    "Romeu e Julieta": 39.0,
+}
+"""Flavors, from most to least popular, and the price of their "M" size."""
+
+EXPOENTE_ZIPF = 1.1
+"""Zipf exponent of flavor popularity; the k-th flavor has weight 1 / k**EXPOENTE_ZIPF."""
+
+TAMANHOS = {"P": (25, 0.75), "M": (40, 1.0), "G": (35, 1.3)}
+"""Weight of each size in the mix and its price factor over the "M" price."""
+
+QUANTIDADES = {1: 70, 2: 22, 3: 8}
+"""Weight of each quantity of a single item."""
+
+ITENS_POR_PEDIDO = {1: 35, 2: 28, 3: 17, 4: 10, 5: 6, 6: 4}
+"""Weight of each number of items in an order (about 2.4 on average)."""
+
+STATUS_PEDIDOS = {"FINALIZADO": 75, "PENDENTE": 15, "CANCELADO": 10}
+"""Weight of each order status."""
+
+SENHA_PADRAO = "senha123"
+"""Password of every generated user (hashed once and shared, bcrypt is slow)."""
+
+PEDIDOS_POR_BLOCO = 50_000
+"""Orders drawn from one generator, seeded with the seed and the block number, so
+the rows do not depend on the batch or transaction sizes."""
+
+_ALFABETO_BCRYPT = "./ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+
+
+def _acumulados(pesos) -> list[float]:
+    return list(itertools.accumulate(pesos))
+
+
+def _hash_senha(aleatorio: random.Random, senha: str) -> str:
+    # The salt comes from the seeded generator, so the hash is deterministic too;
+    # its last character only carries 2 bits, hence the restricted choice
+    sal = "".join(aleatorio.choices(_ALFABETO_BCRYPT, k=21)) + aleatorio.choice(".Oeu")
+    return bcrypt_context.handler("bcrypt").using(salt=sal).hash(senha)
+
+
+class _Distribuicoes:
+    """Cumulative weights of every mix, computed once per run."""
+
+    def __init__(self):
+        self.sabores = list(SABORES)
+        self.pesos_sabores = _acumulados(
+            1 / posicao**EXPOENTE_ZIPF for posicao in range(1, len(SABORES) + 1)
+        )
+        self.tamanhos = list(TAMANHOS)
+        self.pesos_tamanhos = _acumulados(peso for peso, _ in TAMANHOS.values())
+        self.quantidades = list(QUANTIDADES)
+        self.pesos_quantidades = _acumulados(QUANTIDADES.values())
+        self.itens_por_pedido = list(ITENS_POR_PEDIDO)
+        self.pesos_itens_por_pedido = _acumulados(ITENS_POR_PEDIDO.values())
+        self.status = list(STATUS_PEDIDOS)
+        self.pesos_status = _acumulados(STATUS_PEDIDOS.values())
+        self.precos = {
+            (sabor, tamanho): round(preco * fator, 2)
+            for sabor, preco in SABORES.items()
+            for tamanho, (_, fator) in TAMANHOS.items()
+        }
+
+
+def _gerar_pedidos(
+    aleatorio: random.Random,
+    distribuicoes: _Distribuicoes,
+    primeiro_pedido: int,
+    primeiro_item: int,
+    quantidade: int,
+    usuarios: range,
+) -> tuple[list[dict], list[dict]]:
+    """Draws `quantidade` orders and their items.
+
+    Returns:
+        tuple[list[dict], list[dict]]: The order rows and the item rows.
+    """
+    escolher = aleatorio.choices
+    itens_por_pedido = escolher(
+        distribuicoes.itens_por_pedido,
+        cum_weights=distribuicoes.pesos_itens_por_pedido,
+        k=quantidade,
+    )
+    total_itens = sum(itens_por_pedido)
+    sabores = escolher(
+        distribuicoes.sabores, cum_weights=distribuicoes.pesos_sabores, k=total_itens
+    )
+    tamanhos = escolher(
+        distribuicoes.tamanhos, cum_weights=distribuicoes.pesos_tamanhos, k=total_itens
+    )
+    quantidades = escolher(
+        distribuicoes.quantidades,
+        cum_weights=distribuicoes.pesos_quantidades,
+        k=total_itens,
+    )
+    status = escolher(
+        distribuicoes.status, cum_weights=distribuicoes.pesos_status, k=quantidade
+    )
+    donos = escolher(usuarios, k=quantidade)
+    precos = distribuicoes.precos
+
+    pedidos, itens = [], []
+    id_item = primeiro_item
+    posicao = 0
+    for indice in range(quantidade):
+        id_pedido = primeiro_pedido + indice
+        preco_pedido = 0.0
+        for _ in range(itens_por_pedido[indice]):
+            sabor, tamanho = sabores[posicao], tamanhos[posicao]
+            preco_unitario = precos[sabor, tamanho]
+            preco_pedido += quantidades[posicao] * preco_unitario
+            itens.append(
+                {
+                    "id": id_item,
+                    "quantidade": quantidades[posicao],
+                    "sabor": sabor,
+                    "tamanho": tamanho,
+                    "preco_unitario": preco_unitario,
+                    "pedido": id_pedido,
+                }
+            )
+            id_item += 1
+            posicao += 1
+        pedidos.append(
+            {
+                "id": id_pedido,
+                "status": status[indice],
+                "usuario": donos[indice],
+                "preco": round(preco_pedido, 2),
+                "versao": 1,
+            }
+        )
+    return pedidos, itens
+
+
+async def _inserir_em_lotes(conexao, tabela, linhas: list[dict], tamanho_lote: int):
+    for inicio in range(0, len(linhas), tamanho_lote):
+        await conexao.execute(tabela.insert(), linhas[inicio : inicio + tamanho_lote])
+
+
+async def gerar_dados(
+    usuarios: int,
+    pedidos: int,
+    semente: int = 42,
+    engine_banco: AsyncEngine | None = None,
+    tamanho_lote: int = 50_000,
+    pedidos_por_transacao: int = 200_000,
+    senha: str = SENHA_PADRAO,
+) -> dict:
+    """Generates users, orders and items and rebuilds the aggregate tables.
+
+    Args:
+        usuarios (int): Number of users to create; orders are spread among them.
+        pedidos (int): Number of orders to create.
+        semente (int, optional): Seed of the random generator.
+        engine_banco (AsyncEngine, optional): The engine to write to. Defaults to `engine`.
+        tamanho_lote (int, optional): Rows per INSERT batch.
+        pedidos_por_transacao (int, optional): Orders, with their items, per
+            transaction; rounded down to whole blocks of `PEDIDOS_POR_BLOCO`.
+        senha (str, optional): Password of every generated user.
+
+    Raises:
+        ValueError: If orders are requested without any user to own them.
+
+    Returns:
+        dict: Rows created per table, elapsed seconds, item throughput and the rows
+        written to each aggregate table.
+    """
+    if pedidos and not usuarios:
+        raise ValueError("É preciso gerar ao menos um usuário para receber os pedidos")
+    engine_banco = engine_banco or engine
+    aleatorio = random.Random(semente)
+    distribuicoes = _Distribuicoes()
+    inicio = time.perf_counter()
+
+    async with engine_banco.begin() as conexao:
+        ultimo_usuario, ultimo_pedido, ultimo_item = (
+            await conexao.execute(
+                select(
+                    select(func.coalesce(func.max(Usuario.id), 0)).scalar_subquery(),
+                    select(func.coalesce(func.max(Pedido.id), 0)).scalar_subquery(),
+                    select(func.coalesce(func.max(ItemPedido.id), 0)).scalar_subquery(),
+                )
+            )
+        ).one()
+        hash_senha = _hash_senha(aleatorio, senha)
+        ids_usuarios = range(ultimo_usuario + 1, ultimo_usuario + usuarios + 1)
+        await _inserir_em_lotes(
+            conexao,
+            Usuario.__table__,
+            [
+                {
+                    "id": id_usuario,
+                    "nome": f"Cliente {id_usuario}",
+                    "email": f"cliente{id_usuario}@exemplo.com",
+                    "senha": hash_senha,
+                    "ativo": True,
+                    "admin": False,
+                    "versao_pedidos": 0,
+                }
+                for id_usuario in ids_usuarios
+            ],
+            tamanho_lote,
+        )
+
+    total_itens = 0
+    proximo_pedido, proximo_item = ultimo_pedido + 1, ultimo_item + 1
+    blocos = range(0, pedidos, PEDIDOS_POR_BLOCO)
+    blocos_por_transacao = max(1, pedidos_por_transacao // PEDIDOS_POR_BLOCO)
+    for inicio_transacao in range(0, len(blocos), blocos_por_transacao):
+        async with engine_banco.begin() as conexao:
+            for bloco in blocos[
+                inicio_transacao : inicio_transacao + blocos_por_transacao
+            ]:
+                quantidade = min(PEDIDOS_POR_BLOCO, pedidos - bloco)
+                linhas_pedidos, linhas_itens = _gerar_pedidos(
+                    random.Random(f"{semente}:{bloco // PEDIDOS_POR_BLOCO}"),
+                    distribuicoes,
+                    proximo_pedido,
+                    proximo_item,
+                    quantidade,
+                    ids_usuarios,
+                )
+                await _inserir_em_lotes(
+                    conexao, Pedido.__table__, linhas_pedidos, tamanho_lote
+                )
+                await _inserir_em_lotes(
+                    conexao, ItemPedido.__table__, linhas_itens, tamanho_lote
+                )
+                proximo_pedido += quantidade
+                proximo_item += len(linhas_itens)
+                total_itens += len(linhas_itens)
+    duracao_insercao = time.perf_counter() - inicio
+
+    async with AsyncSession(bind=engine_banco) as session:
+        agregados = await reconstruir_agregados(session)
+        await session.commit()
+
+    return {
+        "usuarios": usuarios,
+        "pedidos": pedidos,
+        "itens": total_itens,
+        "semente": semente,
+        "segundos": round(time.perf_counter() - inicio, 2),
+        "itens_por_minuto": round(total_itens / duracao_insercao * 60)
+        if duracao_insercao
+        else 0,
+        "agregados": agregados,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Gera usuários, pedidos e itens sintéticos para testes de carga."
+    )
+    parser.add_argument("--usuarios", type=int, default=1000)
+    parser.add_argument("--pedidos", type=int, default=100_000)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--lote", type=int, default=50_000, help="linhas por INSERT")
+    parser.add_argument("--pedidos-por-transacao", type=int, default=200_000)
+    parser.add_argument(
+        "--senha", default=SENHA_PADRAO, help="senha de todos os usuários"
+    )
+    args = parser.parse_args()
+
+    async def _executar():
+        try:
+            return await gerar_dados(
+                args.usuarios,
+                args.pedidos,
+                args.semente,
+                tamanho_lote=args.lote,
+                pedidos_por_transacao=args.pedidos_por_transacao,
+                senha=args.senha,
+            )
+        finally:
+            await engine.dispose()
+
+    print(json.dumps(asyncio.run(_executar()), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,24 +4,42 @@ It initializes the FastAPI app, configures password hashing, and includes API ro
 """
 
 import os
+from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.security import OAuth2PasswordBearer
 from passlib.context import CryptContext
 
+from backend.admin_routes import admin_router
+from backend.auditoria_consultas import MiddlewareAuditoriaConsultas, auditar_engine
 from backend.auth_routes import auth_router
+from backend.config import AUDITORIA_CONSULTAS, METRICAS_HABILITADAS
+from backend.database import engine, engines_replicas
+from backend.metricas import MiddlewareMetricas, instrumentar_engine, metricas_router
 from backend.order_routes import order_router
+from backend.token_store import token_store
 
 load_dotenv()
 
 SECRET_KEY = os.getenv("SECRET_KEY")
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Flushes pending tokens and closes the pooled database connections on shutdown."""
+    yield
+    token_store.fechar()
+    await engine.dispose()
+    for engine_replica in engines_replicas:
+        await engine_replica.dispose()
+
+
 app = FastAPI(
     title="My FastAPI Application",
     description="This is a sample FastAPI application with authentication and order management.",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 bcrypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -33,6 +51,18 @@ oauth2_scheme = OAuth2PasswordBearer(
 
 app.include_router(auth_router)
 app.include_router(order_router)
+app.include_router(admin_router)
+
+if METRICAS_HABILITADAS:
+    for engine_banco in (engine, *engines_replicas):
+        instrumentar_engine(engine_banco)
+    app.add_middleware(MiddlewareMetricas)
+    app.include_router(metricas_router)
+
+if AUDITORIA_CONSULTAS != "desligada":
+    for engine_banco in (engine, *engines_replicas):
+        auditar_engine(engine_banco)
+    app.add_middleware(MiddlewareAuditoriaConsultas, modo=AUDITORIA_CONSULTAS)
 
 # para rodar o nosso código, executar no terminal: uvicorn main:app --reload
 
@@ -0,0 +1,387 @@
+"""Request and database metrics in the Prometheus text format.
+
+`MiddlewareMetricas` is a pure ASGI middleware that counts requests per route, method
+and status code and records their latency in histograms. SQLAlchemy cursor events,
+hooked with `instrumentar_engine`, add each query's duration to the request being
+served (tracked in a context variable), so every route also gets histograms of how
+many queries it ran and how long they took. `GET /metrics` renders all of it, plus
+connection pool and bcrypt queue gauges read at scrape time.
+
+Routes are labelled with their path template (e.g. `/pedidos/pedido/{id_pedido}`), so
+the number of series stays bounded; requests that match no route share one label.
+"""
+
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from backend.database import estatisticas_pool
+from backend.security import pool_senhas
+
+LIMITES_DURACAO = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.075,
+    0.1,
+    0.25,
+    0.5,
+    0.75,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+"""Upper bounds, in seconds, of the request and query time histogram buckets."""
+
+LIMITES_CONSULTAS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+"""Upper bounds of the queries-per-request histogram buckets."""
+
+ROTA_DESCONHECIDA = "desconhecida"
+"""Route label of requests that matched no route (404s, scanners)."""
+
+
+class Histograma:
+    """Cumulative histogram with fixed buckets, as Prometheus expects.
+
+    Attributes:
+        limites (tuple): Upper bound of each bucket; a final `+Inf` bucket is implied.
+        contagens (list[int]): Observations per bucket (not cumulative).
+        soma (float): Sum of every observed value.
+    """
+
+    def __init__(self, limites: tuple):
+        self.limites = limites
+        self.contagens = [0] * (len(limites) + 1)
+        self.soma = 0.0
+
+    def observar(self, valor: float):
+        """Records one value."""
+        self.contagens[bisect_left(self.limites, valor)] += 1
+        self.soma += valor
+
+    def linhas(self, nome: str, rotulos: str) -> list[str]:
+        """Renders the `_bucket`, `_sum` and `_count` samples of this histogram.
+
+        Args:
+            nome (str): The metric name.
+            rotulos (str): The series labels, already rendered (e.g. `method="GET",route="/x"`).
+
+        Returns:
+            list[str]: One line per sample.
+        """
+        linhas = []
+        acumulado = 0
+        for limite, contagem in zip(
+            (*self.limites, "+Inf"), self.contagens, strict=True
+        ):
+            acumulado += contagem
+            linhas.append(f'{nome}_bucket{{{rotulos},le="{limite}"}} {acumulado}')
+        linhas.append(f"{nome}_sum{{{rotulos}}} {self.soma}")
+        linhas.append(f"{nome}_count{{{rotulos}}} {acumulado}")
+        return linhas
+
+
+class ConsultasRequisicao:
+    """Queries run while serving one request.
+
+    Attributes:
+        quantidade (int): Number of queries executed.
+        duracao (float): Seconds spent executing them.
+    """
+
+    __slots__ = ("quantidade", "duracao")
+
+    def __init__(self):
+        self.quantidade = 0
+        self.duracao = 0.0
+
+
+consultas_requisicao: ContextVar[ConsultasRequisicao | None] = ContextVar(
+    "consultas_requisicao", default=None
+)
+"""Query counter of the request being served in the current context, if any."""
+
+
+class SerieRota:
+    """Metrics of one route and method.
+
+    Attributes:
+        status (dict): Request count per status code.
+        duracao (Histograma): Request latency, in seconds.
+        consultas (Histograma): Queries executed per request.
+        tempo_banco (Histograma): Seconds spent executing queries per request.
+    """
+
+    __slots__ = ("status", "duracao", "consultas", "tempo_banco")
+
+    def __init__(self):
+        self.status: dict[int, int] = {}
+        self.duracao = Histograma(LIMITES_DURACAO)
+        self.consultas = Histograma(LIMITES_CONSULTAS)
+        self.tempo_banco = Histograma(LIMITES_DURACAO)
+
+    def registrar(self, status: int, duracao: float, consultas: ConsultasRequisicao):
+        """Records one finished request.
+
+        Runs on every request, so the histograms are updated inline rather than
+        through `Histograma.observar`.
+        """
+        self.status[status] = self.status.get(status, 0) + 1
+        histograma = self.duracao
+        histograma.contagens[bisect_left(LIMITES_DURACAO, duracao)] += 1
+        histograma.soma += duracao
+        histograma = self.consultas
+        histograma.contagens[bisect_left(LIMITES_CONSULTAS, consultas.quantidade)] += 1
+        histograma.soma += consultas.quantidade
+        histograma = self.tempo_banco
+        histograma.contagens[bisect_left(LIMITES_DURACAO, consultas.duracao)] += 1
+        histograma.soma += consultas.duracao
+
+
+class RegistroMetricas:
+    """Process-wide store of the request and query metrics.
+
+    Attributes:
+        series (dict): The `SerieRota` of each `(metodo, rota)` seen so far.
+        em_andamento (int): Requests currently being served.
+        consultas_total (int): Queries executed, inside requests or not.
+        consultas_segundos (float): Seconds spent executing those queries.
+    """
+
+    def __init__(self):
+        self.limpar()
+
+    def limpar(self):
+        """Resets every metric to zero."""
+        self.series: dict[tuple, SerieRota] = {}
+        self.em_andamento = 0
+        self.consultas_total = 0
+        self.consultas_segundos = 0.0
+
+    def registrar_requisicao(
+        self,
+        metodo: str,
+        rota: str,
+        status: int,
+        duracao: float,
+        consultas: ConsultasRequisicao,
+    ):
+        """Records a finished request and the queries it ran."""
+        serie = self.series.get((metodo, rota))
+        if serie is None:
+            serie = self.series[metodo, rota] = SerieRota()
+        serie.registrar(status, duracao, consultas)
+
+    def registrar_consulta(self, duracao: float):
+        """Records one executed query, adding it to the current request if there is one."""
+        self.consultas_total += 1
+        self.consultas_segundos += duracao
+        atual = consultas_requisicao.get()
+        if atual is not None:
+            atual.quantidade += 1
+            atual.duracao += duracao
+
+    def exposicao(self) -> str:
+        """Renders every metric in the Prometheus text exposition format (0.0.4).
+
+        Returns:
+            str: The body of a `/metrics` response.
+        """
+        linhas = [
+            "# HELP http_requests_total Requests served, by route, method and status.",
+            "# TYPE http_requests_total counter",
+        ]
+        series = sorted(self.series.items())
+        for (metodo, rota), serie in series:
+            for status, total in sorted(serie.status.items()):
+                linhas.append(
+                    f'http_requests_total{{{_rotulos(metodo, rota)},status="{status}"}} '
+                    f"{total}"
+                )
+        linhas += [
+            "# HELP http_requests_in_progress Requests being served right now.",
+            "# TYPE http_requests_in_progress gauge",
+            f"http_requests_in_progress {self.em_andamento}",
+        ]
+        for nome, ajuda, atributo in (
+            (
+                "http_request_duration_seconds",
+                "Request latency, until the last body byte is sent.",
+                "duracao",
+            ),
+            (
+                "http_request_db_queries",
+                "Database queries executed per request.",
+                "consultas",
+            ),
+            (
+                "http_request_db_duration_seconds",
+                "Time spent executing database queries per request.",
+                "tempo_banco",
+            ),
+        ):
+            linhas += [f"# HELP {nome} {ajuda}", f"# TYPE {nome} histogram"]
+            for (metodo, rota), serie in series:
+                linhas += getattr(serie, atributo).linhas(nome, _rotulos(metodo, rota))
+        linhas += [
+            "# HELP db_queries_total Database queries executed, inside requests or not.",
+            "# TYPE db_queries_total counter",
+            f"db_queries_total {self.consultas_total}",
+            "# HELP db_query_duration_seconds_total Time spent executing database queries.",
+            "# TYPE db_query_duration_seconds_total counter",
+            f"db_query_duration_seconds_total {self.consultas_segundos}",
+        ]
+        linhas += _linhas_pool() + _linhas_bcrypt()
+        return "\n".join(linhas) + "\n"
+
+
+def _escapar(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _rotulos(metodo: str, rota: str) -> str:
+    return f'method="{metodo}",route="{_escapar(rota)}"'
+
+
+_METRICAS_POOL = (
+    ("db_pool_size", "gauge", "Connections kept open by the pool.", "tamanho"),
+    ("db_pool_checked_out", "gauge", "Connections in use.", "em_uso"),
+    ("db_pool_checked_in", "gauge", "Idle connections in the pool.", "disponiveis"),
+    ("db_pool_overflow", "gauge", "Connections open beyond the pool size.", "overflow"),
+    ("db_pool_checkouts_total", "counter", "Connections handed out.", "checkouts"),
+    ("db_pool_timeouts_total", "counter", "Checkouts that timed out.", "timeouts"),
+)
+
+
+def _metrica(nome: str, tipo: str, ajuda: str, valor) -> list[str]:
+    return [f"# HELP {nome} {ajuda}", f"# TYPE {nome} {tipo}", f"{nome} {valor}"]
+
+
+def _linhas_pool() -> list[str]:
+    estatisticas = estatisticas_pool()
+    if "em_uso" not in estatisticas:
+        # Pools without checkout tracking (in-memory SQLite) have nothing to report
+        return []
+    linhas = []
+    for nome, tipo, ajuda, chave in _METRICAS_POOL:
+        linhas += _metrica(nome, tipo, ajuda, estatisticas[chave])
+    linhas += _metrica(
+        "db_pool_wait_seconds_total",
+        "counter",
+        "Time spent waiting for a pooled connection.",
+        estatisticas["espera_total_ms"] / 1000,
+    )
+    return linhas
+
+
+def _linhas_bcrypt() -> list[str]:
+    return [
+        *_metrica(
+            "bcrypt_queue_depth",
+            "gauge",
+            "Password operations waiting for a thread.",
+            pool_senhas.profundidade_fila,
+        ),
+        *_metrica(
+            "bcrypt_in_progress",
+            "gauge",
+            "Password operations running or waiting.",
+            pool_senhas.pendentes,
+        ),
+        *_metrica(
+            "bcrypt_rejected_total",
+            "counter",
+            "Password operations refused with 503 because the queue was full.",
+            pool_senhas.rejeitadas,
+        ),
+    ]
+
+
+registro_metricas = RegistroMetricas()
+"""Process-wide metrics store shared by the middleware, the engine hooks and `/metrics`."""
+
+
+class MiddlewareMetricas:
+    """ASGI middleware that measures every HTTP request into `registro_metricas`.
+
+    The latency covers the whole response, including streamed bodies. Requests that
+    raise are recorded with status 500 and the exception is re-raised.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def enviar(mensagem):
+            nonlocal status
+            if mensagem["type"] == "http.response.start":
+                status = mensagem["status"]
+            await send(mensagem)
+
+        consultas = ConsultasRequisicao()
+        token = consultas_requisicao.set(consultas)
+        registro_metricas.em_andamento += 1
+        inicio = time.perf_counter()
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            duracao = time.perf_counter() - inicio
+            registro_metricas.em_andamento -= 1
+            consultas_requisicao.reset(token)
+            # The router stores the matched route in the scope it was given
+            rota = scope.get("route")
+            registro_metricas.registrar_requisicao(
+                scope["method"],
+                rota.path if rota is not None else ROTA_DESCONHECIDA,
+                status,
+                duracao,
+                consultas,
+            )
+
+
+def instrumentar_engine(engine_banco: AsyncEngine):
+    """Times every query of an engine into `registro_metricas`.
+
+    Args:
+        engine_banco (AsyncEngine): The engine to instrument.
+    """
+
+    @event.listens_for(engine_banco.sync_engine, "before_cursor_execute")
+    def _antes(conn, cursor, statement, parameters, context, executemany):
+        context._inicio_metricas = time.perf_counter()
+
+    @event.listens_for(engine_banco.sync_engine, "after_cursor_execute")
+    def _depois(conn, cursor, statement, parameters, context, executemany):
+        registro_metricas.registrar_consulta(
+            time.perf_counter() - context._inicio_metricas
+        )
+
+
+metricas_router = APIRouter(tags=["metricas"])
+
+
+@metricas_router.get("/metrics", response_class=PlainTextResponse)
+async def metricas():
+    """Expõe as métricas da aplicação no formato de texto do Prometheus.
+
+    Returns:
+        PlainTextResponse: Contadores e histogramas das requisições e consultas, além do
+        uso do pool de conexões e da fila do bcrypt.
+    """
+    return PlainTextResponse(
+        registro_metricas.exposicao(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -9,19 +9,19 @@ from sqlalchemy import (
     Column,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
-    create_engine,
 )
+from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlalchemy.orm import declarative_base, relationship
 
-# Database connection engine
-db = create_engine("sqlite:///d:/reposground/work/order-system/backend/banco.db")
-"""SQLAlchemy engine for connecting to the SQLite database."""
-
 # Base class for declarative models
-Base = declarative_base()
-"""Declarative base class for SQLAlchemy models."""
+Base = declarative_base(cls=AsyncAttrs)
+"""Declarative base class for SQLAlchemy models.
+
+`AsyncAttrs` exposes `awaitable_attrs`, which lets async code load lazy relationships.
+"""
 
 
 class Usuario(Base):
@@ -34,16 +34,21 @@ class Usuario(Base):
         senha (str): Hashed password of the user.
         ativo (bool): Indicates if the user account is active.
         admin (bool): Indicates if the user has administrative privileges.
+        versao_pedidos (int): Incremented whenever any order of the user changes; identifies
+            the state of the user's order list (used for its ETag).
     """
 
     __tablename__ = "usuarios"
 
     id = Column("id", Integer, primary_key=True, autoincrement=True)
     nome = Column("nome", String)
-    email = Column("email", String, nullable=False)
+    email = Column("email", String, nullable=False, unique=True, index=True)
     senha = Column("senha", String)
     ativo = Column("ativo", Boolean)
     admin = Column("admin", Boolean, default=False)
+    versao_pedidos = Column(
+        "versao_pedidos", Integer, nullable=False, default=0, server_default="0"
+    )
 
     def __init__(self, nome, email, senha, ativo=True, admin=False):
         """Initializes a new Usuario instance.
@@ -72,15 +77,18 @@ class Pedido(Base):
         status (str): Current status of the order (e.g., "PENDENTE", "CANCELADO", "FINALIZADO").
         usuario (int): Foreign key referencing the ID of the user who placed the order.
         preco (float): Total price of the order.
+        versao (int): Incremented by every change to the order or its items (used for its ETag).
         itens (relationship): Relationship to the ItemPedido model, representing items in this order.
     """
 
     __tablename__ = "pedidos"
+    __table_args__ = (Index("ix_pedidos_usuario_status", "usuario", "status"),)
 
     id = Column("id", Integer, primary_key=True, autoincrement=True)
     status = Column("status", String)
-    usuario = Column("usuario", ForeignKey("usuarios.id"))
+    usuario = Column("usuario", ForeignKey("usuarios.id"), index=True)
     preco = Column("preco", Float)
+    versao = Column("versao", Integer, nullable=False, default=1, server_default="1")
     itens = relationship("ItemPedido", cascade="all, delete")
 
     def __init__(self, usuario, status="PENDENTE", preco=0):
@@ -101,6 +109,7 @@ class Pedido(Base):
         """Calculates and updates the total price of the order based on its items.
 
         The `preco` attribute is updated by summing the quantities multiplied by the unit prices of all associated `ItemPedido` instances.
+        The item routes do not call this on every change; they apply each item's delta in SQL instead.
         """
         # pyrefly: ignore  # bad-assignment
         self.preco = sum(item.quantidade * item.preco_unitario for item in self.itens)
@@ -125,7 +134,7 @@ class ItemPedido(Base):
     sabor = Column("sabor", String)
     tamanho = Column("tamanho", String)
     preco_unitario = Column("preco_unitario", Float)
-    pedido = Column("pedido", ForeignKey("pedidos.id"))
+    pedido = Column("pedido", ForeignKey("pedidos.id"), index=True)
 
     def __init__(self, quantidade, sabor, tamanho, preco_unitario, pedido):
         """Initializes a new ItemPedido instance.
@@ -142,3 +151,82 @@ class ItemPedido(Base):
         self.tamanho = tamanho
         self.preco_unitario = preco_unitario
         self.pedido = pedido
+
+
+class ResumoVendas(Base):
+    """Sales totals per flavor, size and order status.
+
+    Kept up to date by the order routes in the same transaction as each item or status
+    change (see `backend.agregados`), so sales reports read one row per group instead of
+    every item.
+
+    Attributes:
+        sabor (str): Flavor of the items.
+        tamanho (str): Size of the items.
+        status (str): Status of the orders the items belong to.
+        quantidade (int): Sum of the item quantities.
+        receita (float): Sum of quantity times unit price.
+        itens (int): Number of item rows.
+    """
+
+    __tablename__ = "resumo_vendas"
+
+    sabor = Column("sabor", String, primary_key=True)
+    tamanho = Column("tamanho", String, primary_key=True)
+    status = Column("status", String, primary_key=True)
+    quantidade = Column("quantidade", Integer, nullable=False, default=0)
+    receita = Column("receita", Float, nullable=False, default=0)
+    itens = Column("itens", Integer, nullable=False, default=0)
+
+    def __init__(self, sabor, tamanho, status, quantidade=0, receita=0, itens=0):
+        """Initializes a new ResumoVendas instance.
+
+        Args:
+            sabor (str): The flavor of the group.
+            tamanho (str): The size of the group.
+            status (str): The order status of the group.
+            quantidade (int, optional): Sum of quantities. Defaults to 0.
+            receita (float, optional): Sum of quantity times unit price. Defaults to 0.
+            itens (int, optional): Number of items. Defaults to 0.
+        """
+        self.sabor = sabor
+        self.tamanho = tamanho
+        self.status = status
+        self.quantidade = quantidade
+        self.receita = receita
+        self.itens = itens
+
+
+class ContadorPedidos(Base):
+    """Number of orders and their total price per user and status.
+
+    Kept up to date by the order routes in the same transaction as each order change
+    (see `backend.agregados`), so order summaries and totals never count `pedidos`.
+
+    Attributes:
+        usuario (int): The user owning the orders.
+        status (str): The status of the orders.
+        pedidos (int): Number of orders.
+        preco_total (float): Sum of the orders' `preco`.
+    """
+
+    __tablename__ = "contadores_pedidos"
+
+    usuario = Column("usuario", ForeignKey("usuarios.id"), primary_key=True)
+    status = Column("status", String, primary_key=True)
+    pedidos = Column("pedidos", Integer, nullable=False, default=0)
+    preco_total = Column("preco_total", Float, nullable=False, default=0)
+
+    def __init__(self, usuario, status, pedidos=0, preco_total=0):
+        """Initializes a new ContadorPedidos instance.
+
+        Args:
+            usuario (int): The ID of the user.
+            status (str): The order status.
+            pedidos (int, optional): Number of orders. Defaults to 0.
+            preco_total (float, optional): Sum of the orders' prices. Defaults to 0.
+        """
+        self.usuario = usuario
+        self.status = status
+        self.pedidos = pedidos
+        self.preco_total = preco_total
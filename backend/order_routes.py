@@ -6,19 +6,118 @@ It includes routes for both administrative and regular users, with appropriate a
 
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-
-from backend.dependencies import pegar_sessao, verificar_token
-from backend.models import ItemPedido, Pedido, Usuario
-from backend.schemas import ItemPedidoSchema, PedidoSchema, ResponsePedidoSchema
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from backend.agregados import (
+    incrementar_versoes,
+    mover_status,
+    somar_contadores,
+    somar_vendas,
+)
+from backend.auditoria_consultas import orcamento_consultas
+from backend.dependencies import UsuarioAutenticado, pegar_sessao, verificar_token
+from backend.models import ContadorPedidos, ItemPedido, Pedido, Usuario
+from backend.paginacao import Pagina, parametros_paginacao
+from backend.schemas import (
+    AlteracaoItensSchema,
+    EstatisticasPedidosSchema,
+    ItemAdicionadoSchema,
+    ItemPedidoSchema,
+    ItemRemovidoSchema,
+    ItensAlteradosSchema,
+    ListaPedidosSchema,
+    ListaTodosPedidosSchema,
+    MensagemSchema,
+    PedidoAlteradoSchema,
+    PedidoComItensSchema,
+    PedidoCriadoSchema,
+    PedidoDetalhadoSchema,
+    PedidoSchema,
+    TransicaoStatusRespostaSchema,
+    TransicaoStatusSchema,
+)
+from backend.serializacao import (
+    COLUNAS_PEDIDO,
+    RespostaJSON,
+    anexar_itens,
+    pedido_como_dicionario,
+)
 
 order_router = APIRouter(
     prefix="/pedidos", tags=["pedidos"], dependencies=[Depends(verificar_token)]
 )
+# Os orçamentos de @orcamento_consultas incluem a leitura do usuário feita por
+# verificar_token quando o token ainda não está em cache
+
+
+STATUS_FINAIS = ("FINALIZADO", "CANCELADO")
+
+
+async def _aplicar_delta_preco(session: AsyncSession, id_pedido: int, delta: float):
+    """Soma `delta` ao preço do pedido com um único UPDATE atômico no banco.
+
+    O custo não depende da quantidade de itens do pedido, e atualizações concorrentes
+    do mesmo pedido não se sobrescrevem. O mesmo UPDATE incrementa a versão do pedido;
+    os contadores e a versão dos pedidos do dono são atualizados na mesma transação.
 
+    Returns:
+        Row: O novo `preco` e a nova `versao` do pedido, além do dono e do `status` lidos
+        pelo próprio UPDATE; use esse `status` nos demais agregados da transação.
+    """
+    pedido = (
+        await session.execute(
+            update(Pedido)
+            .where(Pedido.id == id_pedido)
+            .values(
+                preco=func.coalesce(Pedido.preco, 0) + delta, versao=Pedido.versao + 1
+            )
+            .returning(Pedido.preco, Pedido.versao, Pedido.usuario, Pedido.status)
+            .execution_options(synchronize_session=False)
+        )
+    ).one()
+    await somar_contadores(session, pedido.usuario, pedido.status, preco=delta)
+    await incrementar_versoes(session, [pedido.usuario])
+    return pedido
+
+
+def _etag_corresponde(if_none_match: str | None, etag: str) -> bool:
+    """Verifica se o cabeçalho `If-None-Match` do cliente inclui a ETag atual.
+
+    Segue a comparação fraca exigida para `If-None-Match` (RFC 9110): o prefixo `W/` é
+    ignorado e `*` corresponde a qualquer ETag.
+    """
+    if not if_none_match:
+        return False
+    return any(
+        valor.strip().removeprefix("W/") in (etag, "*")
+        for valor in if_none_match.split(",")
+    )
 
-@order_router.get("/")
+
+async def _alterar_status(session: AsyncSession, pedido: Pedido, status: str):
+    """Muda o status de um pedido já carregado com um único UPDATE, incrementando sua versão.
+
+    Os agregados e a versão dos pedidos do dono são atualizados na mesma transação, e o
+    objeto `pedido` recebe o novo status e a nova versão sem ser recarregado.
+    """
+    await mover_status(session, [Pedido.id == pedido.id], status)
+    versao = await session.scalar(
+        update(Pedido)
+        .where(Pedido.id == pedido.id)
+        .values(status=status, versao=Pedido.versao + 1)
+        .returning(Pedido.versao)
+        .execution_options(synchronize_session=False)
+    )
+    set_committed_value(pedido, "status", status)
+    set_committed_value(pedido, "versao", versao)
+    await incrementar_versoes(session, [pedido.usuario])
+
+
+@order_router.get("/", response_model=MensagemSchema)
+@orcamento_consultas(1)
 async def pedidos():
     """
     Essa é a rota padrão de pedidos do nosso sistema. Todas as rotas dos pedidos precisam de autenticação
@@ -26,9 +125,10 @@ async def pedidos():
     return {"mensagem": "Você acessou a rota de pedidos"}
 
 
-@order_router.post("/pedido")
+@order_router.post("/pedido", response_model=MensagemSchema)
+@orcamento_consultas(4)
 async def criar_pedido(
-    pedido_schema: PedidoSchema, session: Session = Depends(pegar_sessao)
+    pedido_schema: PedidoSchema, session: AsyncSession = Depends(pegar_sessao)
 ):
     """Cria um novo pedido no sistema."""
     try:
@@ -37,8 +137,9 @@ async def criar_pedido(
         novo_pedido = Pedido(usuario=pedido_schema.usuario, status="PENDENTE")
 
         session.add(novo_pedido)
-        session.commit()
-        session.refresh(novo_pedido)
+        await somar_contadores(session, pedido_schema.usuario, "PENDENTE", pedidos=1)
+        await incrementar_versoes(session, [pedido_schema.usuario])
+        await session.commit()
 
         logging.info(f"Pedido created successfully with ID: {novo_pedido.id}")
         return {
@@ -46,7 +147,7 @@ async def criar_pedido(
         }
 
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         logging.error(f"Error creating pedido: {str(e)}")
         logging.error(f"Error type: {type(e)}")
         import traceback
@@ -55,18 +156,69 @@ async def criar_pedido(
         raise HTTPException(status_code=500, detail=f"Erro ao criar pedido: {str(e)}") from e
 
 
-@order_router.post("/pedido/cancelar/{id_pedido}")
+@order_router.post("/pedido/completo", response_model=PedidoCriadoSchema)
+@orcamento_consultas(7)
+async def criar_pedido_com_itens(
+    pedido_schema: PedidoComItensSchema, session: AsyncSession = Depends(pegar_sessao)
+):
+    """Cria um pedido já com todos os seus itens em uma única requisição e transação.
+
+    Os itens são validados de uma vez, inseridos com um único INSERT em lote e o preço
+    do pedido é calculado uma só vez, antes do commit.
+
+    Args:
+        pedido_schema (PedidoComItensSchema): O usuário do pedido e a lista de itens.
+        session (AsyncSession, optional): A sessão do banco de dados. Injetada por dependência.
+
+    Returns:
+        dict: Uma mensagem de sucesso, o ID do pedido, os IDs dos itens e o preço do pedido.
+    """
+    preco = sum(item.quantidade * item.preco_unitario for item in pedido_schema.itens)
+    novo_pedido = Pedido(usuario=pedido_schema.usuario, status="PENDENTE", preco=preco)
+    session.add(novo_pedido)
+    await session.flush()
+
+    # Um único INSERT com várias linhas; os IDs crescem na ordem dos itens enviados.
+    itens_ids = sorted(
+        await session.scalars(
+            insert(ItemPedido).returning(ItemPedido.id),
+            [
+                {**item.model_dump(), "pedido": novo_pedido.id}
+                for item in pedido_schema.itens
+            ],
+        )
+    )
+    await somar_vendas(session, "PENDENTE", pedido_schema.itens)
+    await somar_contadores(
+        session, pedido_schema.usuario, "PENDENTE", pedidos=1, preco=preco
+    )
+    await incrementar_versoes(session, [pedido_schema.usuario])
+    await session.commit()
+
+    logging.info(
+        f"Pedido {novo_pedido.id} criado com {len(itens_ids)} itens em uma transação"
+    )
+    return {
+        "mensagem": f"Pedido criado com sucesso. ID do pedido: {novo_pedido.id}",
+        "id_pedido": novo_pedido.id,
+        "itens_ids": itens_ids,
+        "preco_pedido": novo_pedido.preco,
+    }
+
+
+@order_router.post("/pedido/cancelar/{id_pedido}", response_model=PedidoAlteradoSchema)
+@orcamento_consultas(8)
 async def cancelar_pedido(
     id_pedido: int,
-    session: Session = Depends(pegar_sessao),
-    usuario: Usuario = Depends(verificar_token),
+    session: AsyncSession = Depends(pegar_sessao),
+    usuario: UsuarioAutenticado = Depends(verificar_token),
 ):
     """Cancela um pedido existente.
 
     Args:
         id_pedido (int): O ID do pedido a ser cancelado.
-        session (Session, optional): A sessão do banco de dados. Injetada por dependência.
-        usuario (Usuario, optional): O usuário autenticado. Injetado por dependência.
+        session (AsyncSession, optional): A sessão do banco de dados. Injetada por dependência.
+        usuario (UsuarioAutenticado, optional): O usuário autenticado. Injetado por dependência.
 
     Raises:
         HTTPException: Se o pedido não for encontrado.
@@ -75,61 +227,89 @@ async def cancelar_pedido(
     Returns:
         dict: Uma mensagem de sucesso e os detalhes do pedido cancelado.
     """
-    pedido = session.query(Pedido).filter(Pedido.id == id_pedido).first()
+    pedido = await session.scalar(select(Pedido).where(Pedido.id == id_pedido))
     if not pedido:
         raise HTTPException(status_code=400, detail="Pedido não encontrado")
     if not usuario.admin and pedido.usuario != usuario.id:
         raise HTTPException(
             status_code=401, detail="Você não tem permissão para cancelar este pedido"
         )
-    pedido.status = "CANCELADO"
-    session.commit()
+    await _alterar_status(session, pedido, "CANCELADO")
+    await session.commit()
     return {
         "mensagem": f"Pedido número: {pedido.id} cancelado com sucesso",
         "pedido": pedido,
     }
 
 
-@order_router.get("/pedidos/listar")
+@order_router.get(
+    "/pedidos/listar",
+    response_model=ListaTodosPedidosSchema,
+    response_class=RespostaJSON,
+)
+@orcamento_consultas(3)
 async def listar_todos_pedidos(
-    session: Session = Depends(pegar_sessao),
-    usuario: Usuario = Depends(verificar_token),
+    pagina: Pagina = Depends(parametros_paginacao),
+    session: AsyncSession = Depends(pegar_sessao),
+    usuario: UsuarioAutenticado = Depends(verificar_token),
 ):
-    """Lista todos os pedidos no sistema (apenas para administradores).
+    """Lista todos os pedidos no sistema (apenas para administradores), paginados por cursor.
 
     Args:
-        session (Session, optional): A sessão do banco de dados. Injetada por dependência.
-        usuario (Usuario, optional): O usuário autenticado. Injetado por dependência.
+        pagina (Pagina, optional): Cursor e limite da página. Injetados por dependência.
+        session (AsyncSession, optional): A sessão do banco de dados. Injetada por dependência.
+        usuario (UsuarioAutenticado, optional): O usuário autenticado. Injetado por dependência.
 
     Raises:
         HTTPException: Se o usuário não for um administrador.
 
     Returns:
-        dict: Uma lista de todos os pedidos.
+        RespostaJSON: Uma página de pedidos, o `next_cursor` da próxima página (None na
+        última) e o total de pedidos do sistema, lido dos contadores de pedidos.
     """
     if not usuario.admin:
         raise HTTPException(
             status_code=401, detail="Voce não tem autorização para fazer esta operação"
         )
     else:
-        pedidos = session.query(Pedido).all()
-        return {"pedidos": pedidos}
+        linhas = (
+            await session.execute(
+                select(*COLUNAS_PEDIDO)
+                .where(Pedido.id > pagina.apos_id)
+                .order_by(Pedido.id)
+                .limit(pagina.limite + 1)
+            )
+        ).all()
+        linhas, next_cursor = pagina.fatiar(linhas)
+        total = await session.scalar(
+            select(func.coalesce(func.sum(ContadorPedidos.pedidos), 0))
+        )
+        return RespostaJSON(
+            {
+                "pedidos": [pedido_como_dicionario(linha) for linha in linhas],
+                "next_cursor": next_cursor,
+                "total": total,
+            }
+        )
 
 
-@order_router.post("/pedido/adicionar-item/{id_pedido}")
+@order_router.post(
+    "/pedido/adicionar-item/{id_pedido}", response_model=ItemAdicionadoSchema
+)
+@orcamento_consultas(7)
 async def adicionar_item_pedido(
     id_pedido: int,
     item_pedido_schema: ItemPedidoSchema,
-    session: Session = Depends(pegar_sessao),
-    usuario: Usuario = Depends(verificar_token),
+    session: AsyncSession = Depends(pegar_sessao),
+    usuario: UsuarioAutenticado = Depends(verificar_token),
 ):
     """Adiciona um item a um pedido existente.
 
     Args:
         id_pedido (int): O ID do pedido ao qual o item será adicionado.
         item_pedido_schema (ItemPedidoSchema): O esquema do item do pedido a ser adicionado.
-        session (Session, optional): A sessão do banco de dados. Injetada por dependência.
-        usuario (Usuario, optional): O usuário autenticado. Injetado por dependência.
+        session (AsyncSession, optional): A sessão do banco de dados. Injetada por dependência.
+        usuario (UsuarioAutenticado, optional): O usuário autenticado. Injetado por dependência.
 
     Raises:
         HTTPException: Se o pedido não existir.
@@ -139,7 +319,7 @@ async def adicionar_item_pedido(
     Returns:
         dict: Uma mensagem de sucesso, o ID do item adicionado e o preço atualizado do pedido.
     """
-    pedido = session.query(Pedido).filter(Pedido.id == id_pedido).first()
+    pedido = await session.scalar(select(Pedido).where(Pedido.id == id_pedido))
     if not pedido:
         raise HTTPException(status_code=400, detail="Pedido não existente")
     if pedido.status in ["FINALIZADO", "CANCELADO"]:
@@ -160,27 +340,39 @@ async def adicionar_item_pedido(
         id_pedido,
     )
     session.add(item_pedido)
-    pedido.calcular_preco()
-    session.commit()
+    await session.flush()
+    pedido_atualizado = await _aplicar_delta_preco(
+        session,
+        id_pedido,
+        item_pedido_schema.quantidade * item_pedido_schema.preco_unitario,
+    )
+    preco_pedido = pedido_atualizado.preco
+    await somar_vendas(
+        session, pedido_atualizado.status, adicionados=[item_pedido_schema]
+    )
+    await session.commit()
     return {
         "mensagem": "Item adicionado com sucesso ao pedido",
         "item_id": item_pedido.id,
-        "preco_pedido": pedido.preco,
+        "preco_pedido": preco_pedido,
     }
 
 
-@order_router.delete("/pedido/remover-item/{id_item_pedido}")
+@order_router.delete(
+    "/pedido/remover-item/{id_item_pedido}", response_model=ItemRemovidoSchema
+)
+@orcamento_consultas(9)
 async def remover_item_pedido(
     id_item_pedido: int,
-    session: Session = Depends(pegar_sessao),
-    usuario: Usuario = Depends(verificar_token),
+    session: AsyncSession = Depends(pegar_sessao),
+    usuario: UsuarioAutenticado = Depends(verificar_token),
 ):
     """Remove um item de um pedido existente.
 
     Args:
         id_item_pedido (int): O ID do item do pedido a ser removido.
-        session (Session, optional): A sessão do banco de dados. Injetada por dependência.
-        usuario (Usuario, optional): O usuário autenticado. Injetado por dependência.
+        session (AsyncSession, optional): A sessão do banco de dados. Injetada por dependência.
+        usuario (UsuarioAutenticado, optional): O usuário autenticado. Injetado por dependência.
 
     Raises:
         HTTPException: Se o item do pedido não for encontrado.
@@ -192,14 +384,14 @@ async def remover_item_pedido(
         dict: Uma mensagem de sucesso, a quantidade de itens restantes no pedido e os detalhes do pedido atualizado.
     """
     # Fetch the item from the database
-    item_pedido = (
-        session.query(ItemPedido).filter(ItemPedido.id == id_item_pedido).first()
+    item_pedido = await session.scalar(
+        select(ItemPedido).where(ItemPedido.id == id_item_pedido)
     )
     if not item_pedido:
         raise HTTPException(status_code=404, detail="Item do pedido não encontrado")
 
     # Fetch the associated order
-    pedido = session.query(Pedido).filter(Pedido.id == item_pedido.pedido).first()
+    pedido = await session.scalar(select(Pedido).where(Pedido.id == item_pedido.pedido))
     if not pedido:
         raise HTTPException(status_code=404, detail="Pedido não encontrado")
 
@@ -217,31 +409,155 @@ async def remover_item_pedido(
             detail="Você não tem autorização para realizar esta operação",
         )
 
-    # Remove the item and update the order price
-    session.delete(item_pedido)
-    pedido.calcular_preco()
-    session.commit()
+    # Remove the item and subtract its total from the order price
+    await session.delete(item_pedido)
+    await session.flush()
+    pedido_atualizado = await _aplicar_delta_preco(
+        session, pedido.id, -item_pedido.quantidade * item_pedido.preco_unitario
+    )
+    set_committed_value(pedido, "preco", pedido_atualizado.preco)
+    set_committed_value(pedido, "versao", pedido_atualizado.versao)
+    await somar_vendas(session, pedido_atualizado.status, removidos=[item_pedido])
+    quantidade_itens = await session.scalar(
+        select(func.count()).where(ItemPedido.pedido == pedido.id)
+    )
+    await session.commit()
 
     return {
         "mensagem": "Item removido com sucesso",
-        "quantidade_itens_pedido": len(pedido.itens),
+        "quantidade_itens_pedido": quantidade_itens,
         "pedido": pedido,
     }
 
 
+@order_router.post(
+    "/pedido/alterar-itens/{id_pedido}", response_model=ItensAlteradosSchema
+)
+@orcamento_consultas(8)
+async def alterar_itens_pedido(
+    id_pedido: int,
+    alteracao_schema: AlteracaoItensSchema,
+    session: AsyncSession = Depends(pegar_sessao),
+    usuario: UsuarioAutenticado = Depends(verificar_token),
+):
+    """Adiciona e remove vários itens de um pedido em uma única transação.
+
+    O dono e o status do pedido são verificados uma única vez; as remoções são feitas
+    com um DELETE em lote, as inclusões com um INSERT em lote e o preço do pedido é
+    atualizado uma só vez com a diferença total.
+
+    Args:
+        id_pedido (int): O ID do pedido a ser alterado.
+        alteracao_schema (AlteracaoItensSchema): Os itens a adicionar e os IDs dos itens a remover.
+        session (AsyncSession, optional): A sessão do banco de dados. Injetada por dependência.
+        usuario (UsuarioAutenticado, optional): O usuário autenticado. Injetado por dependência.
+
+    Raises:
+        HTTPException: Se nenhuma alteração for informada.
+        HTTPException: Se o pedido não existir.
+        HTTPException: Se o pedido já estiver finalizado ou cancelado.
+        HTTPException: Se o usuário não tiver autorização para alterar o pedido.
+        HTTPException: Se algum dos itens a remover não pertencer ao pedido.
+
+    Returns:
+        dict: Uma mensagem de sucesso, os IDs dos itens adicionados e removidos e o preço final do pedido.
+    """
+    if not alteracao_schema.adicionar and not alteracao_schema.remover:
+        raise HTTPException(status_code=400, detail="Nenhuma alteração informada")
+
+    pedido = (
+        await session.execute(
+            select(Pedido.usuario, Pedido.status).where(Pedido.id == id_pedido)
+        )
+    ).first()
+    if not pedido:
+        raise HTTPException(status_code=400, detail="Pedido não existente")
+    if pedido.status in ["FINALIZADO", "CANCELADO"]:
+        raise HTTPException(
+            status_code=400,
+            detail="Não é possível alterar itens de pedidos FINALIZADO ou CANCELADO",
+        )
+    if not usuario.admin and pedido.usuario != usuario.id:
+        raise HTTPException(
+            status_code=401,
+            detail="Você não tem autorização para realizar esta operação",
+        )
+
+    delta = 0.0
+    removidos = []
+    itens_removidos = []
+    if alteracao_schema.remover:
+        ids_remover = set(alteracao_schema.remover)
+        removidos = (
+            await session.execute(
+                delete(ItemPedido)
+                .where(ItemPedido.id.in_(ids_remover), ItemPedido.pedido == id_pedido)
+                .returning(
+                    ItemPedido.id,
+                    ItemPedido.quantidade,
+                    ItemPedido.sabor,
+                    ItemPedido.tamanho,
+                    ItemPedido.preco_unitario,
+                )
+                .execution_options(synchronize_session=False)
+            )
+        ).all()
+        if len(removidos) != len(ids_remover):
+            # Sem commit: a sessão descarta o DELETE ao ser fechada.
+            nao_encontrados = sorted(ids_remover - {item.id for item in removidos})
+            raise HTTPException(
+                status_code=404,
+                detail=f"Itens não encontrados no pedido: {nao_encontrados}",
+            )
+        itens_removidos = sorted(item.id for item in removidos)
+        delta -= sum(item.quantidade * item.preco_unitario for item in removidos)
+
+    itens_adicionados = []
+    if alteracao_schema.adicionar:
+        itens_adicionados = sorted(
+            await session.scalars(
+                insert(ItemPedido).returning(ItemPedido.id),
+                [
+                    {**item.model_dump(), "pedido": id_pedido}
+                    for item in alteracao_schema.adicionar
+                ],
+            )
+        )
+        delta += sum(
+            item.quantidade * item.preco_unitario for item in alteracao_schema.adicionar
+        )
+
+    pedido_atualizado = await _aplicar_delta_preco(session, id_pedido, delta)
+    preco_pedido = pedido_atualizado.preco
+    await somar_vendas(
+        session,
+        pedido_atualizado.status,
+        alteracao_schema.adicionar,
+        removidos=removidos,
+    )
+    await session.commit()
+    return {
+        "mensagem": "Itens do pedido alterados com sucesso",
+        "itens_adicionados": itens_adicionados,
+        "itens_removidos": itens_removidos,
+        "preco_pedido": preco_pedido,
+    }
+
+
 # finalizar pedido
-@order_router.post("/pedido/finalizar/{id_pedido}")
+@order_router.post("/pedido/finalizar/{id_pedido}", response_model=PedidoAlteradoSchema)
+@orcamento_consultas(8)
 async def finalizar_pedido(
     id_pedido: int,
-    session: Session = Depends(pegar_sessao),
-    usuario: Usuario = Depends(verificar_token),
+    session: AsyncSession = Depends(pegar_sessao),
+    usuario: UsuarioAutenticado = Depends(verificar_token),
 ):
     """Finaliza um pedido, alterando seu status para 'FINALIZADO'.
 
     Args:
         id_pedido (int): O ID do pedido a ser finalizado.
-        session (Session, optional): A sessão do banco de dados. Injetada por dependência.
-        usuario (Usuario, optional): O usuário autenticado. Injetado por dependência.
+        session (AsyncSession, optional): A sessão do banco de dados. Injetada por dependência.
+        usuario (UsuarioAutenticado, optional): O usuário autenticado. Injetado por dependência.
 
     Raises:
         HTTPException: Se o pedido não for encontrado.
@@ -250,75 +566,278 @@ async def finalizar_pedido(
     Returns:
         dict: Uma mensagem de sucesso e os detalhes do pedido finalizado.
     """
-    pedido = session.query(Pedido).filter(Pedido.id == id_pedido).first()
+    pedido = await session.scalar(select(Pedido).where(Pedido.id == id_pedido))
     if not pedido:
         raise HTTPException(status_code=400, detail="Pedido não encontrado")
     if not usuario.admin and pedido.usuario != usuario.id:
         raise HTTPException(
             status_code=401, detail="Você não autorização para fazer essa modificação"
         )
-    pedido.status = "FINALIZADO"
-    session.commit()
+    await _alterar_status(session, pedido, "FINALIZADO")
+    await session.commit()
     return {
         "mensagem": f"Pedido número: {pedido.id} finalizado com sucesso",
         "pedido": pedido,
     }
 
 
-@order_router.get("/pedido/{id_pedido}")
+@order_router.post("/pedidos/status", response_model=TransicaoStatusRespostaSchema)
+@orcamento_consultas(8)
+async def alterar_status_pedidos(
+    transicao_schema: TransicaoStatusSchema,
+    session: AsyncSession = Depends(pegar_sessao),
+    usuario: UsuarioAutenticado = Depends(verificar_token),
+):
+    """Finaliza ou cancela vários pedidos com um único UPDATE.
+
+    Os pedidos são escolhidos por uma lista de IDs ou por um filtro (status, usuário e
+    faixa de IDs). Apenas pedidos ainda abertos mudam de status; administradores podem
+    alterar qualquer pedido e os demais usuários apenas os seus. Nenhum objeto ORM é
+    carregado.
+
+    Args:
+        transicao_schema (TransicaoStatusSchema): O status de destino e os IDs ou o filtro dos pedidos.
+        session (AsyncSession, optional): A sessão do banco de dados. Injetada por dependência.
+        usuario (UsuarioAutenticado, optional): O usuário autenticado. Injetado por dependência.
+
+    Raises:
+        HTTPException: Se não for informada exatamente uma entre a lista de IDs e o filtro.
+
+    Returns:
+        dict: O status aplicado, a quantidade de pedidos alterados e o resultado de cada pedido
+        ("atualizado", "nao_encontrado", "proibido" ou "ja_encerrado").
+    """
+    if (transicao_schema.ids is None) == (transicao_schema.filtro is None):
+        raise HTTPException(
+            status_code=400,
+            detail="Informe a lista de IDs ou um filtro de pedidos, mas não ambos",
+        )
+
+    condicoes = [Pedido.status.not_in(STATUS_FINAIS)]
+    resultados = {}
+    elegiveis = []
+    if transicao_schema.ids is not None:
+        ids = set(transicao_schema.ids)
+        encontrados = {
+            linha.id: linha
+            for linha in await session.execute(
+                select(Pedido.id, Pedido.usuario, Pedido.status).where(
+                    Pedido.id.in_(ids)
+                )
+            )
+        }
+        for id_pedido in ids:
+            linha = encontrados.get(id_pedido)
+            if linha is None:
+                resultados[id_pedido] = "nao_encontrado"
+            elif not usuario.admin and linha.usuario != usuario.id:
+                resultados[id_pedido] = "proibido"
+            elif linha.status in STATUS_FINAIS:
+                resultados[id_pedido] = "ja_encerrado"
+            else:
+                elegiveis.append(id_pedido)
+        condicoes.append(Pedido.id.in_(elegiveis))
+    else:
+        filtro = transicao_schema.filtro
+        if filtro.status is not None:
+            condicoes.append(Pedido.status == filtro.status)
+        if filtro.usuario is not None:
+            condicoes.append(Pedido.usuario == filtro.usuario)
+        if filtro.id_minimo is not None:
+            condicoes.append(Pedido.id >= filtro.id_minimo)
+        if filtro.id_maximo is not None:
+            condicoes.append(Pedido.id <= filtro.id_maximo)
+        if not usuario.admin:
+            condicoes.append(Pedido.usuario == usuario.id)
+
+    atualizados = []
+    if transicao_schema.filtro is not None or elegiveis:
+        await mover_status(session, condicoes, transicao_schema.status)
+        linhas = (
+            await session.execute(
+                update(Pedido)
+                .where(*condicoes)
+                .values(status=transicao_schema.status, versao=Pedido.versao + 1)
+                .returning(Pedido.id, Pedido.usuario)
+                .execution_options(synchronize_session=False)
+            )
+        ).all()
+        atualizados = [linha.id for linha in linhas]
+        await incrementar_versoes(session, [linha.usuario for linha in linhas])
+    # Pedidos elegíveis que não foram atualizados foram encerrados por outra requisição.
+    resultados.update(dict.fromkeys(elegiveis, "ja_encerrado"))
+    resultados.update(dict.fromkeys(atualizados, "atualizado"))
+    await session.commit()
+
+    return {
+        "status": transicao_schema.status,
+        "atualizados": len(atualizados),
+        "resultados": [
+            {"id": id_pedido, "resultado": resultados[id_pedido]}
+            for id_pedido in sorted(resultados)
+        ],
+    }
+
+
+@order_router.get(
+    "/pedido/{id_pedido}",
+    response_model=PedidoDetalhadoSchema,
+    response_class=RespostaJSON,
+)
+@orcamento_consultas(3)
 async def visualizar_pedido(
     id_pedido: int,
-    session: Session = Depends(pegar_sessao),
-    usuario: Usuario = Depends(verificar_token),
+    if_none_match: str | None = Header(default=None),
+    session: AsyncSession = Depends(pegar_sessao),
+    usuario: UsuarioAutenticado = Depends(verificar_token),
 ):
     """Visualiza os detalhes de um pedido específico.
 
+    A resposta traz uma ETag derivada da versão do pedido. Se o cliente enviar essa ETag
+    em `If-None-Match`, a rota responde 304 consultando apenas o dono e a versão do
+    pedido, sem carregar os itens.
+
     Args:
         id_pedido (int): O ID do pedido a ser visualizado.
-        session (Session, optional): A sessão do banco de dados. Injetada por dependência.
-        usuario (Usuario, optional): O usuário autenticado. Injetado por dependência.
+        if_none_match (str, optional): ETags já conhecidas pelo cliente.
+        session (AsyncSession, optional): A sessão do banco de dados. Injetada por dependência.
+        usuario (UsuarioAutenticado, optional): O usuário autenticado. Injetado por dependência.
 
     Raises:
         HTTPException: Se o pedido não for encontrado.
         HTTPException: Se o usuário não tiver autorização para acessar o pedido.
 
     Returns:
-        dict: Os detalhes do pedido, incluindo a quantidade de itens.
+        RespostaJSON: Os detalhes do pedido, incluindo a quantidade de itens, ou uma
+        resposta 304 vazia se o pedido não mudou.
     """
-    pedido = session.query(Pedido).filter(Pedido.id == id_pedido).first()
-    if not pedido:
+    if if_none_match:
+        atual = (
+            await session.execute(
+                select(Pedido.usuario, Pedido.versao).where(Pedido.id == id_pedido)
+            )
+        ).first()
+        if atual and (usuario.admin or atual.usuario == usuario.id):
+            etag = f'"pedido-{id_pedido}-v{atual.versao}"'
+            if _etag_corresponde(if_none_match, etag):
+                return Response(status_code=304, headers={"ETag": etag})
+
+    linha = (
+        await session.execute(select(*COLUNAS_PEDIDO).where(Pedido.id == id_pedido))
+    ).first()
+    if not linha:
         raise HTTPException(status_code=400, detail="Pedido não encontrado")
-    if not usuario.admin and usuario.id != pedido.usuario:
+    if not usuario.admin and usuario.id != linha.usuario:
         raise HTTPException(
             status_code=401, detail="Você não tem autorização para acessar este pedido"
         )
-    return {"quantidade_itens_pedido": len(pedido.itens), "pedido": pedido}
+    (pedido,) = await anexar_itens(session, [pedido_como_dicionario(linha)])
+    return RespostaJSON(
+        {"quantidade_itens_pedido": len(pedido["itens"]), "pedido": pedido},
+        headers={"ETag": f'"pedido-{linha.id}-v{linha.versao}"'},
+    )
+
+
+@order_router.get("/estatisticas", response_model=EstatisticasPedidosSchema)
+@orcamento_consultas(2)
+async def estatisticas_pedidos(
+    session: AsyncSession = Depends(pegar_sessao),
+    usuario: UsuarioAutenticado = Depends(verificar_token),
+):
+    """Resume os pedidos do usuário autenticado: quantidade por status e valores.
+
+    Lê os contadores mantidos pelas rotas de pedidos, uma linha por status, sem
+    percorrer os pedidos do usuário.
+
+    Args:
+        session (AsyncSession, optional): A sessão do banco de dados. Injetada por dependência.
+        usuario (UsuarioAutenticado, optional): O usuário autenticado. Injetado por dependência.
+
+    Returns:
+        dict: O total de pedidos, a quantidade por status, o valor total e o valor médio.
+    """
+    contadores = {
+        linha.status: linha
+        for linha in await session.execute(
+            select(
+                ContadorPedidos.status,
+                ContadorPedidos.pedidos,
+                ContadorPedidos.preco_total,
+            ).where(ContadorPedidos.usuario == usuario.id)
+        )
+    }
+    total_pedidos = sum(linha.pedidos for linha in contadores.values())
+    valor_total = sum(linha.preco_total for linha in contadores.values())
+
+    def _quantidade(status):
+        return contadores[status].pedidos if status in contadores else 0
+
+    return {
+        "total_pedidos": total_pedidos,
+        "pedidos_pendentes": _quantidade("PENDENTE"),
+        "pedidos_finalizados": _quantidade("FINALIZADO"),
+        "pedidos_cancelados": _quantidade("CANCELADO"),
+        "valor_total": round(valor_total, 2),
+        "valor_medio": round(valor_total / total_pedidos, 2) if total_pedidos else 0.0,
+    }
 
 
 # Visualizar todos os pedidos de um usuário
-@order_router.get("/listar/pedidos-usuario", response_model=list[ResponsePedidoSchema])
+@order_router.get(
+    "/listar/pedidos-usuario",
+    response_model=ListaPedidosSchema,
+    response_class=RespostaJSON,
+)
+@orcamento_consultas(4)
 async def listar_pedidos(
-    session: Session = Depends(pegar_sessao),
-    usuario: Usuario = Depends(verificar_token),
+    pagina: Pagina = Depends(parametros_paginacao),
+    if_none_match: str | None = Header(default=None),
+    session: AsyncSession = Depends(pegar_sessao),
+    usuario: UsuarioAutenticado = Depends(verificar_token),
 ):
-    """Lista todos os pedidos de um usuário específico.
+    """Lista os pedidos do usuário autenticado, paginados por cursor.
+
+    A ETag da resposta combina a versão dos pedidos do usuário com o cursor e o limite
+    da página. Se o cliente enviar essa ETag em `If-None-Match`, a rota responde 304
+    após uma única consulta pela chave primária do usuário.
 
     Args:
-        session (Session, optional): A sessão do banco de dados. Injetada por dependência.
-        usuario (Usuario, optional): O usuário autenticado. Injetado por dependência.
+        pagina (Pagina, optional): Cursor e limite da página. Injetados por dependência.
+        if_none_match (str, optional): ETags já conhecidas pelo cliente.
+        session (AsyncSession, optional): A sessão do banco de dados. Injetada por dependência.
+        usuario (UsuarioAutenticado, optional): O usuário autenticado. Injetado por dependência.
 
     Returns:
-        List[ResponsePedidoSchema]: Uma lista de pedidos do usuário. Retorna uma lista vazia se não houver pedidos.
+        RespostaJSON: Uma página de pedidos do usuário (`ListaPedidosSchema`) e o
+        `next_cursor` da próxima página (None na última), ou uma resposta 304 vazia se a
+        lista não mudou.
     """
-    pedidos = session.query(Pedido).filter(Pedido.usuario == usuario.id).all()
-    if not pedidos:
-        # Garante que uma lista vazia seja retornada se não houver pedidos
-        return []
-    return pedidos  # Retorna a lista de objetos Pedido diretamente.
+    versao = await session.scalar(
+        select(Usuario.versao_pedidos).where(Usuario.id == usuario.id)
+    )
+    etag = f'"pedidos-{usuario.id}-v{versao}-{pagina.apos_id}-{pagina.limite}"'
+    if _etag_corresponde(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    linhas = (
+        await session.execute(
+            select(*COLUNAS_PEDIDO)
+            .where(Pedido.usuario == usuario.id, Pedido.id > pagina.apos_id)
+            .order_by(Pedido.id)
+            .limit(pagina.limite + 1)
+        )
+    ).all()
+    linhas, next_cursor = pagina.fatiar(linhas)
+    pedidos = await anexar_itens(
+        session, [pedido_como_dicionario(linha) for linha in linhas]
+    )
+    return RespostaJSON(
+        {"pedidos": pedidos, "next_cursor": next_cursor}, headers={"ETag": etag}
+    )
 
 
-@order_router.post("/pedido/test")
-async def test_criar_pedido(session: Session = Depends(pegar_sessao)):
+@order_router.post("/pedido/test", response_model=dict[str, str])
+async def test_criar_pedido(session: AsyncSession = Depends(pegar_sessao)):
     """Test endpoint to check basic functionality."""
     try:
         # Simple test without schema validation
@@ -0,0 +1,80 @@
+"""Keyset (cursor) pagination helpers for the order listing endpoints.
+
+Pages are read with `WHERE id > :ultimo_id ORDER BY id LIMIT :limit`, so every page
+costs the same indexed range scan however deep the client pages. The cursor handed to
+clients is opaque: the last ID of the page, base64url-encoded.
+"""
+
+import base64
+import binascii
+
+from fastapi import HTTPException, Query
+
+from backend.config import PAGINACAO_LIMITE_MAXIMO, PAGINACAO_LIMITE_PADRAO
+
+
+def codificar_cursor(ultimo_id: int) -> str:
+    """Encodes the last ID of a page as an opaque cursor."""
+    return base64.urlsafe_b64encode(str(ultimo_id).encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: str) -> int:
+    """Decodes a cursor produced by `codificar_cursor`.
+
+    Raises:
+        HTTPException: If the cursor is malformed.
+
+    Returns:
+        int: The last ID of the previous page.
+    """
+    try:
+        preenchimento = "=" * (-len(cursor) % 4)
+        return int(base64.urlsafe_b64decode(cursor + preenchimento).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise HTTPException(
+            status_code=400, detail="Cursor de paginação inválido"
+        ) from e
+
+
+class Pagina:
+    """Pagination parameters of a listing request.
+
+    Attributes:
+        apos_id (int): Only rows with an ID greater than this are returned.
+        limite (int): Page size, capped at `PAGINACAO_LIMITE_MAXIMO`.
+    """
+
+    def __init__(self, apos_id: int, limite: int):
+        self.apos_id = apos_id
+        self.limite = limite
+
+    def fatiar(self, linhas: list) -> tuple[list, str | None]:
+        """Splits rows fetched with `limite + 1` into the page and the next cursor.
+
+        Args:
+            linhas (list): Rows ordered by ID, at most `limite + 1` of them. Each row
+                must expose an `id` attribute.
+
+        Returns:
+            tuple[list, str | None]: The page rows and the cursor of the next page,
+            or None when this is the last page.
+        """
+        if len(linhas) <= self.limite:
+            return linhas, None
+        pagina = linhas[: self.limite]
+        return pagina, codificar_cursor(pagina[-1].id)
+
+
+def parametros_paginacao(
+    cursor: str | None = Query(
+        None, description="Valor de next_cursor da página anterior"
+    ),
+    limit: int = Query(PAGINACAO_LIMITE_PADRAO, ge=1, description="Itens por página"),
+) -> Pagina:
+    """Dependency that reads the `cursor` and `limit` query parameters.
+
+    Returns:
+        Pagina: The decoded pagination parameters.
+    """
+    apos_id = decodificar_cursor(cursor) if cursor else 0
+    return Pagina(apos_id, min(limit, PAGINACAO_LIMITE_MAXIMO))
@@ -4,7 +4,11 @@ This module defines the data structures used for request and response bodies,
 ensuring data integrity and providing clear documentation for API endpoints.
 """
 
-from pydantic import BaseModel
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+from backend.config import LOTE_MAX_ITENS
 
 
 class UsuarioSchema(BaseModel):
@@ -75,20 +79,273 @@ class ItemPedidoSchema(BaseModel):
         from_attributes = True
 
 
-class ResponsePedidoSchema(BaseModel):
-    """Schema for representing an order in API responses.
+class PedidoComItensSchema(BaseModel):
+    """Schema for creating an order together with all of its items.
+
+    Attributes:
+        usuario (int): The ID of the user placing the order.
+        itens (List[ItemPedidoSchema]): The items of the order (1 to `LOTE_MAX_ITENS`).
+    """
+
+    usuario: int
+    itens: list[ItemPedidoSchema] = Field(min_length=1, max_length=LOTE_MAX_ITENS)
+
+    class Config:
+        from_attributes = True
+
+
+class AlteracaoItensSchema(BaseModel):
+    """Schema for a batch of item changes applied to one order.
+
+    Attributes:
+        adicionar (List[ItemPedidoSchema]): Items to add to the order.
+        remover (List[int]): IDs of the order items to remove.
+    """
+
+    adicionar: list[ItemPedidoSchema] = Field(default=[], max_length=LOTE_MAX_ITENS)
+    remover: list[int] = Field(default=[], max_length=LOTE_MAX_ITENS)
+
+    class Config:
+        from_attributes = True
+
+
+class FiltroPedidosSchema(BaseModel):
+    """Schema for selecting orders by attributes instead of by ID.
+
+    Attributes:
+        status (Optional[str]): Only orders currently in this status.
+        usuario (Optional[int]): Only orders of this user.
+        id_minimo (Optional[int]): Smallest order ID included.
+        id_maximo (Optional[int]): Largest order ID included.
+    """
+
+    status: str | None = None
+    usuario: int | None = None
+    id_minimo: int | None = None
+    id_maximo: int | None = None
+
+
+class TransicaoStatusSchema(BaseModel):
+    """Schema for moving many orders to a final status at once.
+
+    Exactly one of `ids` or `filtro` must be given.
+
+    Attributes:
+        status (str): The target status, "FINALIZADO" or "CANCELADO".
+        ids (Optional[List[int]]): The IDs of the orders to change.
+        filtro (Optional[FiltroPedidosSchema]): A filter selecting the orders to change.
+    """
+
+    status: Literal["FINALIZADO", "CANCELADO"]
+    ids: list[int] | None = Field(default=None, max_length=LOTE_MAX_ITENS)
+    filtro: FiltroPedidosSchema | None = None
+
+
+class MensagemSchema(BaseModel):
+    """Schema for responses that carry only a message.
+
+    Attributes:
+        mensagem (str): A human-readable message.
+    """
+
+    mensagem: str
+
+
+class ResponseItemPedidoSchema(ItemPedidoSchema):
+    """Schema for representing an order item in API responses.
+
+    Attributes:
+        id (int): The unique ID of the item.
+    """
+
+    id: int
+
+
+class ResumoPedidoSchema(BaseModel):
+    """Schema for an order without its items in API responses.
 
     Attributes:
         id (int): The unique ID of the order.
         status (str): The current status of the order (e.g., "PENDENTE", "CANCELADO", "FINALIZADO").
+        usuario (int): The ID of the user who placed the order.
         preco (float): The total price of the order.
-        itens (List[ItemPedidoSchema]): A list of items included in the order.
+        versao (int): The version of the order, incremented by every change.
     """
 
     id: int
     status: str
+    usuario: int
     preco: float
-    itens: list[ItemPedidoSchema]
+    versao: int
+
+    class Config:
+        from_attributes = True
+
+
+class ResponsePedidoSchema(ResumoPedidoSchema):
+    """Schema for representing an order with its items in API responses.
+
+    Attributes:
+        itens (List[ResponseItemPedidoSchema]): The items included in the order, ordered by ID.
+    """
+
+    itens: list[ResponseItemPedidoSchema]
+
+
+class ListaPedidosSchema(BaseModel):
+    """Schema for a page of orders in API responses.
+
+    Attributes:
+        pedidos (List[ResponsePedidoSchema]): The orders in this page, ordered by ID.
+        next_cursor (Optional[str]): Cursor of the next page, or None on the last page.
+    """
+
+    pedidos: list[ResponsePedidoSchema]
+    next_cursor: str | None
 
     class Config:
         from_attributes = True
+
+
+class ListaTodosPedidosSchema(BaseModel):
+    """Schema for a page of the administrative listing of every order.
+
+    Attributes:
+        pedidos (List[ResumoPedidoSchema]): The orders in this page, ordered by ID, without items.
+        next_cursor (Optional[str]): Cursor of the next page, or None on the last page.
+        total (int): Number of orders in the system.
+    """
+
+    pedidos: list[ResumoPedidoSchema]
+    next_cursor: str | None
+    total: int
+
+
+class PedidoDetalhadoSchema(BaseModel):
+    """Schema for the response of viewing one order.
+
+    Attributes:
+        quantidade_itens_pedido (int): Number of items in the order.
+        pedido (ResponsePedidoSchema): The order with its items.
+    """
+
+    quantidade_itens_pedido: int
+    pedido: ResponsePedidoSchema
+
+
+class PedidoAlteradoSchema(BaseModel):
+    """Schema for the response of cancelling or finalizing an order.
+
+    Attributes:
+        mensagem (str): A human-readable message.
+        pedido (ResumoPedidoSchema): The order after the change.
+    """
+
+    mensagem: str
+    pedido: ResumoPedidoSchema
+
+
+class PedidoCriadoSchema(BaseModel):
+    """Schema for the response of creating an order together with its items.
+
+    Attributes:
+        mensagem (str): A human-readable message.
+        id_pedido (int): The ID of the new order.
+        itens_ids (List[int]): The IDs of the new items, in the order they were sent.
+        preco_pedido (float): The total price of the order.
+    """
+
+    mensagem: str
+    id_pedido: int
+    itens_ids: list[int]
+    preco_pedido: float
+
+
+class ItemAdicionadoSchema(BaseModel):
+    """Schema for the response of adding an item to an order.
+
+    Attributes:
+        mensagem (str): A human-readable message.
+        item_id (int): The ID of the new item.
+        preco_pedido (float): The updated total price of the order.
+    """
+
+    mensagem: str
+    item_id: int
+    preco_pedido: float
+
+
+class ItemRemovidoSchema(BaseModel):
+    """Schema for the response of removing an item from an order.
+
+    Attributes:
+        mensagem (str): A human-readable message.
+        quantidade_itens_pedido (int): Number of items left in the order.
+        pedido (ResumoPedidoSchema): The order after the change.
+    """
+
+    mensagem: str
+    quantidade_itens_pedido: int
+    pedido: ResumoPedidoSchema
+
+
+class ItensAlteradosSchema(BaseModel):
+    """Schema for the response of a batch of item changes.
+
+    Attributes:
+        mensagem (str): A human-readable message.
+        itens_adicionados (List[int]): The IDs of the items added.
+        itens_removidos (List[int]): The IDs of the items removed.
+        preco_pedido (float): The final total price of the order.
+    """
+
+    mensagem: str
+    itens_adicionados: list[int]
+    itens_removidos: list[int]
+    preco_pedido: float
+
+
+class ResultadoTransicaoSchema(BaseModel):
+    """Schema for the outcome of a status change for one order.
+
+    Attributes:
+        id (int): The ID of the order.
+        resultado (str): "atualizado", "nao_encontrado", "proibido" or "ja_encerrado".
+    """
+
+    id: int
+    resultado: Literal["atualizado", "nao_encontrado", "proibido", "ja_encerrado"]
+
+
+class TransicaoStatusRespostaSchema(BaseModel):
+    """Schema for the response of moving many orders to a final status.
+
+    Attributes:
+        status (str): The status applied.
+        atualizados (int): Number of orders changed.
+        resultados (List[ResultadoTransicaoSchema]): The outcome for each order, ordered by ID.
+    """
+
+    status: str
+    atualizados: int
+    resultados: list[ResultadoTransicaoSchema]
+
+
+class EstatisticasPedidosSchema(BaseModel):
+    """Schema for the summary of a user's orders.
+
+    Attributes:
+        total_pedidos (int): Number of orders.
+        pedidos_pendentes (int): Number of orders with status "PENDENTE".
+        pedidos_finalizados (int): Number of orders with status "FINALIZADO".
+        pedidos_cancelados (int): Number of orders with status "CANCELADO".
+        valor_total (float): Sum of the orders' prices.
+        valor_medio (float): Average price per order.
+    """
+
+    total_pedidos: int
+    pedidos_pendentes: int
+    pedidos_finalizados: int
+    pedidos_cancelados: int
+    valor_total: float
+    valor_medio: float
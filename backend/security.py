@@ -0,0 +1,79 @@
+"""Password hashing for the FastAPI application.
+
+bcrypt is deliberately slow (~100–300 ms of CPU per call), so hashing and verification
+run in a dedicated, bounded thread pool instead of on the event loop. When too many
+operations are already waiting, new ones are rejected at once with 503 instead of
+queueing without limit.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+from backend.config import BCRYPT_MAX_QUEUE, BCRYPT_MAX_WORKERS
+
+# Criação do contexto bcrypt para hashing e verificação de senhas
+bcrypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+"""CryptContext for handling password hashing using the bcrypt scheme."""
+
+
+class PoolSenhas:
+    """Bounded thread pool that runs bcrypt operations.
+
+    Attributes:
+        max_workers (int): Operations running at the same time.
+        max_fila (int): Operations allowed to wait for a free thread.
+        pendentes (int): Operations currently running or waiting.
+        rejeitadas (int): Operations refused because the queue was full.
+    """
+
+    def __init__(self, max_workers: int, max_fila: int):
+        self.max_workers = max_workers
+        self.max_fila = max_fila
+        self.pendentes = 0
+        self.rejeitadas = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="bcrypt"
+        )
+
+    @property
+    def profundidade_fila(self) -> int:
+        """Operations waiting for a thread (not yet running)."""
+        return max(0, self.pendentes - self.max_workers)
+
+    async def executar(self, funcao, *args):
+        """Runs `funcao(*args)` in the pool and awaits its result.
+
+        Raises:
+            HTTPException: 503 if the pool already has `max_fila` operations waiting.
+        """
+        if self.pendentes >= self.max_workers + self.max_fila:
+            self.rejeitadas += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Servidor ocupado, tente novamente em instantes",
+                headers={"Retry-After": "1"},
+            )
+        self.pendentes += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, funcao, *args
+            )
+        finally:
+            self.pendentes -= 1
+
+
+pool_senhas = PoolSenhas(BCRYPT_MAX_WORKERS, BCRYPT_MAX_QUEUE)
+"""Process-wide pool used for every password hash and verification."""
+
+
+async def gerar_hash_senha(senha: str) -> str:
+    """Hashes a password with bcrypt in `pool_senhas`."""
+    return await pool_senhas.executar(bcrypt_context.hash, senha)
+
+
+async def verificar_senha(senha: str, hash_senha: str) -> bool:
+    """Checks a password against its bcrypt hash in `pool_senhas`."""
+    return await pool_senhas.executar(bcrypt_context.verify, senha, hash_senha)
@@ -0,0 +1,79 @@
+"""Fast-path serialization of order responses.
+
+The order read routes select plain column tuples instead of ORM objects, turn them into
+dicts and encode them with orjson through `RespostaJSON`. Returning the response object
+directly skips FastAPI's Pydantic validation and `jsonable_encoder`; each route still
+declares its `response_model`, which documents the shape in OpenAPI.
+"""
+
+import orjson
+from fastapi.responses import JSONResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models import ItemPedido, Pedido
+
+COLUNAS_PEDIDO = (Pedido.id, Pedido.status, Pedido.usuario, Pedido.preco, Pedido.versao)
+"""Columns selected for an order in responses, matching `ResumoPedidoSchema`."""
+
+COLUNAS_ITEM = (
+    ItemPedido.id,
+    ItemPedido.quantidade,
+    ItemPedido.sabor,
+    ItemPedido.tamanho,
+    ItemPedido.preco_unitario,
+)
+"""Columns selected for an item in responses, matching `ResponseItemPedidoSchema`."""
+
+_CAMPOS_PEDIDO = tuple(coluna.key for coluna in COLUNAS_PEDIDO)
+_CAMPOS_ITEM = tuple(coluna.key for coluna in COLUNAS_ITEM)
+
+
+class RespostaJSON(JSONResponse):
+    """JSON response encoded with orjson.
+
+    The content must already be made of dicts, lists, strings, numbers, booleans and
+    None; nothing is converted on the way.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
+
+
+def pedido_como_dicionario(linha) -> dict:
+    """Turns a row of `COLUNAS_PEDIDO` into the dict of an order.
+
+    Args:
+        linha (Row | tuple): The order's values, in `COLUNAS_PEDIDO` order.
+
+    Returns:
+        dict: The order, shaped like `ResumoPedidoSchema`.
+    """
+    return dict(zip(_CAMPOS_PEDIDO, linha, strict=True))
+
+
+async def anexar_itens(session: AsyncSession, pedidos: list[dict]) -> list[dict]:
+    """Loads the items of several orders with one query and adds them under "itens".
+
+    Args:
+        session (AsyncSession): The session to query with.
+        pedidos (list[dict]): Orders built with `pedido_como_dicionario`.
+
+    Returns:
+        list[dict]: The same orders, each with an "itens" list ordered by item ID.
+    """
+    itens_por_pedido = {}
+    for pedido in pedidos:
+        pedido["itens"] = itens_por_pedido[pedido["id"]] = []
+    if not itens_por_pedido:
+        return pedidos
+    linhas = await session.execute(
+        select(ItemPedido.pedido, *COLUNAS_ITEM)
+        .where(ItemPedido.pedido.in_(itens_por_pedido))
+        .order_by(ItemPedido.pedido, ItemPedido.id)
+    )
+    for id_pedido, *item in linhas:
+        itens_por_pedido[id_pedido].append(dict(zip(_CAMPOS_ITEM, item, strict=True)))
+    return pedidos
@@ -0,0 +1,118 @@
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+# Add project root to sys.path using pathlib
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+# The engine is built when backend.database is imported, so point it at a
+# throwaway SQLite file before any backend module is loaded.
+_diretorio_banco = Path(tempfile.mkdtemp(prefix="order-system-tests-"))
+os.environ["DATABASE_URL"] = f"sqlite:///{_diretorio_banco / 'testes.db'}"
+os.environ.setdefault("SECRET_KEY", "chave-secreta-de-testes")
+os.environ.setdefault("ALGORITHM", "HS256")
+# Fail any test whose requests exceed their route's query budget or repeat a query
+os.environ.setdefault("AUDITORIA_CONSULTAS", "erro")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import create_engine, event  # noqa: E402
+
+from backend.auth_routes import criar_token  # noqa: E402
+from backend.config import DATABASE_URL  # noqa: E402
+from backend.database import engine  # noqa: E402
+from backend.dependencies import cache_principais  # noqa: E402
+from backend.main import app  # noqa: E402
+from backend.models import Base, Usuario  # noqa: E402
+from backend.security import bcrypt_context  # noqa: E402
+
+SENHA_PADRAO = "senha123"
+_hash_senha_padrao = bcrypt_context.hash(SENHA_PADRAO)
+
+
+@pytest.fixture
+def engine_sincrono():
+    """Synchronous engine on the test database, used to prepare data."""
+    engine = create_engine(DATABASE_URL)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    # IDs restart with every database, so tokens from earlier tests could collide
+    cache_principais.limpar()
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def senha_padrao():
+    return SENHA_PADRAO
+
+
+@pytest.fixture
+def client(engine_sincrono):
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def criar_usuario(engine_sincrono):
+    """Inserts a user and returns `(id, auth headers)` for it."""
+
+    def _criar_usuario(email="cliente@teste.com", admin=False):
+        with engine_sincrono.begin() as conexao:
+            resultado = conexao.execute(
+                Usuario.__table__.insert().values(
+                    nome=email.split("@")[0],
+                    email=email,
+                    senha=_hash_senha_padrao,
+                    ativo=True,
+                    admin=admin,
+                )
+            )
+            id_usuario = resultado.inserted_primary_key[0]
+        headers = {"Authorization": f"Bearer {criar_token(id_usuario)}"}
+        return id_usuario, headers
+
+    return _criar_usuario
+
+
+@pytest.fixture
+def criar_pedido(client):
+    """Opens an order through the API, adds `itens` to it and returns its ID."""
+
+    def _criar_pedido(id_usuario, headers, itens=()):
+        resposta = client.post(
+            "/pedidos/pedido", json={"usuario": id_usuario}, headers=headers
+        )
+        assert resposta.status_code == 200
+        # The route only reports the new ID in its message
+        id_pedido = int(resposta.json()["mensagem"].rsplit(" ", 1)[-1])
+        for item in itens:
+            url = f"/pedidos/pedido/adicionar-item/{id_pedido}"
+            resposta = client.post(url, json=item, headers=headers)
+            assert resposta.status_code == 200
+        return id_pedido
+
+    return _criar_pedido
+
+
+@pytest.fixture
+def contar_consultas():
+    """Context manager that collects the SQL statements the application executes."""
+
+    @contextmanager
+    def _contar_consultas():
+        consultas = []
+
+        def _registrar(conexao, cursor, sql, parametros, contexto, executemany):
+            consultas.append(sql)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", _registrar)
+        try:
+            yield consultas
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", _registrar)
+
+    return _contar_consultas
@@ -0,0 +1,137 @@
+import asyncio
+import io
+import json
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import select, update
+
+import backend.config
+from backend.database import criar_engine
+from backend.exportacao import exportar_snapshot, pedidos_ndjson
+from backend.models import Pedido
+
+ITEM = {"quantidade": 3, "sabor": "Frango", "tamanho": "M", "preco_unitario": 12.5}
+
+
+def test_recalcular_precos_corrige_divergencia(
+    client, criar_usuario, criar_pedido, engine_sincrono
+):
+    id_usuario, headers = criar_usuario()
+    _, headers_admin = criar_usuario("admin@teste.com", admin=True)
+    id_pedido = criar_pedido(id_usuario, headers, [ITEM])
+    criar_pedido(id_usuario, headers)
+    with engine_sincrono.begin() as conexao:
+        conexao.execute(update(Pedido).where(Pedido.id == id_pedido).values(preco=1.0))
+
+    resultado = client.post("/admin/pedidos/recalcular-precos", headers=headers_admin)
+
+    assert resultado.json()["pedidos_corrigidos"] == 1
+    with engine_sincrono.connect() as conexao:
+        preco = conexao.scalar(select(Pedido.preco).where(Pedido.id == id_pedido))
+    assert preco == 37.5
+
+
+def test_recalcular_precos_exige_admin(client, criar_usuario):
+    _, headers = criar_usuario()
+
+    resposta = client.post("/admin/pedidos/recalcular-precos", headers=headers)
+
+    assert resposta.status_code == 401
+
+
+def test_exportar_pedidos_em_ndjson(client, criar_usuario, criar_pedido):
+    id_usuario, headers = criar_usuario()
+    _, headers_admin = criar_usuario("admin@teste.com", admin=True)
+    ids = [
+        criar_pedido(id_usuario, headers, [ITEM] * quantidade)
+        for quantidade in (2, 0, 3)
+    ]
+
+    resposta = client.get("/admin/pedidos/exportar", headers=headers_admin)
+
+    assert resposta.headers["content-type"] == "application/x-ndjson"
+    pedidos = [json.loads(linha) for linha in resposta.text.splitlines()]
+    assert [p["id"] for p in pedidos] == ids
+    assert [len(p["itens"]) for p in pedidos] == [2, 0, 3]
+    assert pedidos[2]["preco"] == 3 * 37.5
+    assert pedidos[0]["usuario"] == id_usuario
+
+
+def test_exportacao_agrupa_itens_entre_lotes(client, criar_usuario, criar_pedido):
+    id_usuario, headers = criar_usuario()
+    for quantidade in (3, 1, 4):
+        criar_pedido(id_usuario, headers, [ITEM] * quantidade)
+
+    async def _exportar():
+        engine_banco = criar_engine(backend.config.DATABASE_URL)
+        linhas = [linha async for linha in pedidos_ndjson(engine_banco, tamanho_lote=2)]
+        await engine_banco.dispose()
+        return linhas
+
+    linhas = asyncio.run(_exportar())
+
+    assert [len(json.loads(linha)["itens"]) for linha in linhas] == [3, 1, 4]
+
+
+def test_exportar_pedidos_exige_admin(client, criar_usuario):
+    _, headers = criar_usuario()
+
+    assert client.get("/admin/pedidos/exportar", headers=headers).status_code == 401
+
+
+def test_exportar_tabela_em_parquet_e_arrow(client, criar_usuario, criar_pedido):
+    id_usuario, headers = criar_usuario()
+    _, headers_admin = criar_usuario("admin@teste.com", admin=True)
+    ids = [criar_pedido(id_usuario, headers, [ITEM] * 2) for _ in range(3)]
+
+    parquet = client.get("/admin/exportar/pedidos", headers=headers_admin)
+    arrow = client.get(
+        "/admin/exportar/itens_pedido?formato=arrow&apos_id=2", headers=headers_admin
+    )
+
+    pedidos = pq.read_table(io.BytesIO(parquet.content))
+    assert pedidos.column("id").to_pylist() == ids
+    assert pedidos.column("preco").to_pylist() == [75.0] * 3
+    itens = pa.ipc.open_stream(arrow.content).read_all()
+    assert itens.column("id").to_pylist() == [3, 4, 5, 6]
+    assert set(itens.column("pedido").to_pylist()) == set(ids[1:])
+
+
+def test_exportar_snapshot_incremental(client, criar_usuario, criar_pedido, tmp_path):
+    id_usuario, headers = criar_usuario()
+    criar_pedido(id_usuario, headers, [ITEM] * 3)
+
+    def _exportar():
+        async def _executar():
+            engine_banco = criar_engine(backend.config.DATABASE_URL)
+            resumo = await exportar_snapshot(
+                tmp_path, incremental=True, engine_banco=engine_banco, tamanho_lote=2
+            )
+            await engine_banco.dispose()
+            return resumo
+
+        return asyncio.run(_executar())
+
+    primeiro = _exportar()
+    id_pedido = criar_pedido(id_usuario, headers, [ITEM] * 1)
+    segundo = _exportar()
+    terceiro = _exportar()
+
+    assert primeiro["itens_pedido"] == {
+        "arquivo": "itens_pedido_1-3.parquet",
+        "linhas": 3,
+        "ultimo_id": 3,
+    }
+    assert segundo["pedidos"]["arquivo"] == f"pedidos_{id_pedido}-{id_pedido}.parquet"
+    assert segundo["itens_pedido"]["linhas"] == 1
+    assert terceiro["pedidos"] == {"arquivo": None, "linhas": 0, "ultimo_id": id_pedido}
+    itens = pq.read_table(tmp_path / "itens_pedido_1-3.parquet")
+    assert itens.num_rows == 3
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "itens_pedido_1-3.parquet",
+        "itens_pedido_4-4.parquet",
+        "manifesto.json",
+        "pedidos_1-1.parquet",
+        f"pedidos_{id_pedido}-{id_pedido}.parquet",
+    ]
@@ -0,0 +1,222 @@
+import asyncio
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import backend.config
+import backend.order_routes
+from backend.agregados import reconstruir_agregados
+from backend.database import criar_engine
+from backend.models import ContadorPedidos, ItemPedido, Pedido, ResumoVendas
+
+CALABRESA = {
+    "quantidade": 2,
+    "sabor": "Calabresa",
+    "tamanho": "G",
+    "preco_unitario": 40.0,
+}
+MUSSARELA = {
+    "quantidade": 1,
+    "sabor": "Mussarela",
+    "tamanho": "M",
+    "preco_unitario": 30.0,
+}
+
+
+def _resumo(engine_sincrono):
+    with engine_sincrono.connect() as conexao:
+        linhas = conexao.execute(
+            select(ResumoVendas.__table__).where(ResumoVendas.itens != 0)
+        )
+        return {
+            (linha.sabor, linha.tamanho, linha.status): (
+                linha.quantidade,
+                linha.receita,
+                linha.itens,
+            )
+            for linha in linhas
+        }
+
+
+def _contadores(engine_sincrono):
+    with engine_sincrono.connect() as conexao:
+        linhas = conexao.execute(
+            select(ContadorPedidos.__table__).where(ContadorPedidos.pedidos != 0)
+        )
+        return {
+            (linha.usuario, linha.status): (linha.pedidos, linha.preco_total)
+            for linha in linhas
+        }
+
+
+def _reconstruir():
+    async def _executar():
+        engine_banco = criar_engine(backend.config.DATABASE_URL)
+        async with AsyncSession(bind=engine_banco) as session:
+            await reconstruir_agregados(session)
+            await session.commit()
+        await engine_banco.dispose()
+
+    asyncio.run(_executar())
+
+
+def _movimentar_pedidos(client, id_usuario, headers):
+    ids = []
+    for _ in range(4):
+        resposta = client.post(
+            "/pedidos/pedido/completo",
+            json={"usuario": id_usuario, "itens": [CALABRESA, CALABRESA, MUSSARELA]},
+            headers=headers,
+        )
+        ids.append(resposta.json()["id_pedido"])
+    client.post(
+        f"/pedidos/pedido/adicionar-item/{ids[0]}", json=MUSSARELA, headers=headers
+    )
+    itens = client.get(f"/pedidos/pedido/{ids[1]}", headers=headers).json()
+    client.delete(
+        f"/pedidos/pedido/remover-item/{itens['pedido']['itens'][0]['id']}",
+        headers=headers,
+    )
+    itens = client.get(f"/pedidos/pedido/{ids[2]}", headers=headers).json()
+    client.post(
+        f"/pedidos/pedido/alterar-itens/{ids[2]}",
+        json={"adicionar": [MUSSARELA], "remover": [itens["pedido"]["itens"][0]["id"]]},
+        headers=headers,
+    )
+    client.post(f"/pedidos/pedido/cancelar/{ids[1]}", headers=headers)
+    client.post(f"/pedidos/pedido/finalizar/{ids[0]}", headers=headers)
+    client.post(f"/pedidos/pedido/cancelar/{ids[0]}", headers=headers)
+    client.post(
+        "/pedidos/pedidos/status",
+        json={"status": "FINALIZADO", "filtro": {"id_minimo": ids[2]}},
+        headers=headers,
+    )
+    return ids
+
+
+def test_resumo_incremental_igual_a_reconstrucao(
+    client, criar_usuario, engine_sincrono
+):
+    id_usuario, headers = criar_usuario()
+    _movimentar_pedidos(client, id_usuario, headers)
+
+    incremental = _resumo(engine_sincrono)
+    contadores = _contadores(engine_sincrono)
+    _reconstruir()
+
+    assert incremental == _resumo(engine_sincrono)
+    assert contadores == _contadores(engine_sincrono)
+    assert incremental[("Calabresa", "G", "CANCELADO")] == (6, 240.0, 3)
+    assert incremental[("Mussarela", "M", "FINALIZADO")] == (3, 90.0, 3)
+
+
+def test_resumo_usa_o_status_lido_pelo_update(
+    client, criar_usuario, engine_sincrono, monkeypatch
+):
+    id_usuario, headers = criar_usuario()
+    id_pedido = client.post(
+        "/pedidos/pedido/completo",
+        json={"usuario": id_usuario, "itens": [CALABRESA]},
+        headers=headers,
+    ).json()["id_pedido"]
+    aplicar_delta_preco = backend.order_routes._aplicar_delta_preco
+
+    async def _status_muda_antes_do_update(session, id_pedido, delta):
+        # Another request finalizes the order between the route's read and its UPDATE
+        await session.execute(
+            update(Pedido)
+            .where(Pedido.id == id_pedido)
+            .values(status="FINALIZADO")
+            .execution_options(synchronize_session=False)
+        )
+        return await aplicar_delta_preco(session, id_pedido, delta)
+
+    monkeypatch.setattr(
+        backend.order_routes, "_aplicar_delta_preco", _status_muda_antes_do_update
+    )
+    client.post(
+        f"/pedidos/pedido/adicionar-item/{id_pedido}", json=MUSSARELA, headers=headers
+    )
+
+    # The new item lands in the status the UPDATE saw, like the order counters
+    assert _resumo(engine_sincrono) == {
+        ("Calabresa", "G", "PENDENTE"): (2, 80.0, 1),
+        ("Mussarela", "M", "FINALIZADO"): (1, 30.0, 1),
+    }
+
+
+def test_resumo_de_vendas_para_admin(client, criar_usuario):
+    id_usuario, headers = criar_usuario()
+    _, headers_admin = criar_usuario("admin@teste.com", admin=True)
+    _movimentar_pedidos(client, id_usuario, headers)
+
+    por_sabor = client.get(
+        "/admin/vendas/resumo?agrupar_por=sabor", headers=headers_admin
+    ).json()
+    finalizados = client.get(
+        "/admin/vendas/resumo?agrupar_por=tamanho&status=FINALIZADO",
+        headers=headers_admin,
+    ).json()
+
+    assert por_sabor["grupos"] == [
+        {"sabor": "Calabresa", "quantidade": 12, "receita": 480.0, "itens": 6},
+        {"sabor": "Mussarela", "quantidade": 6, "receita": 180.0, "itens": 6},
+    ]
+    assert por_sabor["totais"] == {"quantidade": 18, "receita": 660.0, "itens": 12}
+    assert finalizados["grupos"] == [
+        {"tamanho": "G", "quantidade": 6, "receita": 240.0, "itens": 3},
+        {"tamanho": "M", "quantidade": 3, "receita": 90.0, "itens": 3},
+    ]
+
+
+def test_resumo_de_vendas_exige_admin(client, criar_usuario):
+    _, headers = criar_usuario()
+
+    assert client.get("/admin/vendas/resumo", headers=headers).status_code == 401
+
+
+def test_estatisticas_do_usuario(client, criar_usuario):
+    id_usuario, headers = criar_usuario()
+    id_outro, headers_outro = criar_usuario("outro@teste.com")
+    _movimentar_pedidos(client, id_usuario, headers)
+    client.post("/pedidos/pedido", json={"usuario": id_usuario}, headers=headers)
+    client.post("/pedidos/pedido", json={"usuario": id_outro}, headers=headers_outro)
+
+    estatisticas = client.get("/pedidos/estatisticas", headers=headers).json()
+
+    assert estatisticas == {
+        "total_pedidos": 5,
+        "pedidos_pendentes": 1,
+        "pedidos_finalizados": 2,
+        "pedidos_cancelados": 2,
+        "valor_total": 660.0,
+        "valor_medio": 132.0,
+    }
+
+
+def test_listagem_do_admin_mostra_total(client, criar_usuario, contar_consultas):
+    id_usuario, headers = criar_usuario()
+    _, headers_admin = criar_usuario("admin@teste.com", admin=True)
+    for _ in range(3):
+        client.post("/pedidos/pedido", json={"usuario": id_usuario}, headers=headers)
+
+    with contar_consultas() as consultas:
+        resposta = client.get("/pedidos/pedidos/listar?limit=1", headers=headers_admin)
+
+    assert resposta.json()["total"] == 3
+    assert not [sql for sql in consultas if "count(*)" in sql.lower()], consultas
+
+
+def test_recalcular_precos_corrige_contadores(client, criar_usuario, engine_sincrono):
+    id_usuario, headers = criar_usuario()
+    _, headers_admin = criar_usuario("admin@teste.com", admin=True)
+    id_pedido = _movimentar_pedidos(client, id_usuario, headers)[0]
+    with engine_sincrono.begin() as conexao:
+        conexao.execute(insert(ItemPedido).values(**MUSSARELA, pedido=id_pedido))
+
+    client.post("/admin/pedidos/recalcular-precos", headers=headers_admin)
+
+    contadores = _contadores(engine_sincrono)
+    assert contadores[(id_usuario, "CANCELADO")] == (2, 330.0 + 30.0)
+    _reconstruir()
+    assert contadores == _contadores(engine_sincrono)
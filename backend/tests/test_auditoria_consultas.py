@@ -0,0 +1,72 @@
+import logging
+from collections import Counter
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from backend.auditoria_consultas import (
+    ConsultasExcessivas,
+    MiddlewareAuditoriaConsultas,
+    avaliar_consultas,
+    orcamento_consultas,
+)
+from backend.database import SessionLocal
+from backend.models import ItemPedido
+from backend.order_routes import visualizar_pedido
+
+
+def _app_com_n_mais_1(modo):
+    app = FastAPI()
+    app.add_middleware(MiddlewareAuditoriaConsultas, modo=modo)
+
+    @app.get("/itens")
+    @orcamento_consultas(100)
+    async def itens_pedido_a_pedido():
+        async with SessionLocal() as session:
+            for id_pedido in (1, 2, 3):
+                await session.scalars(
+                    select(ItemPedido).where(ItemPedido.pedido == id_pedido)
+                )
+        return {}
+
+    return app
+
+
+def test_rota_acima_do_orcamento_falha(
+    client, criar_usuario, criar_pedido, monkeypatch
+):
+    id_usuario, headers = criar_usuario()
+    id_pedido = criar_pedido(id_usuario, headers)
+    monkeypatch.setattr(visualizar_pedido, "orcamento_consultas", 1)
+
+    with pytest.raises(ConsultasExcessivas, match="acima do orçamento de 1"):
+        client.get(f"/pedidos/pedido/{id_pedido}", headers=headers)
+
+
+def test_consulta_repetida_com_parametros_diferentes_falha(engine_sincrono):
+    with TestClient(_app_com_n_mais_1("erro")) as client:
+        with pytest.raises(ConsultasExcessivas, match="repetida 3 vezes"):
+            client.get("/itens")
+
+
+def test_modo_aviso_registra_e_responde(engine_sincrono, caplog):
+    with (
+        TestClient(_app_com_n_mais_1("aviso")) as client,
+        caplog.at_level(logging.WARNING),
+    ):
+        resposta = client.get("/itens")
+
+    assert resposta.status_code == 200
+    assert "GET /itens: consulta repetida 3 vezes" in caplog.text
+
+
+def test_avaliar_consultas_dentro_dos_limites():
+    consultas = Counter({"SELECT a": 2, "SELECT b": 1})
+
+    assert avaliar_consultas(consultas, orcamento=3, repeticoes=3) == []
+    assert avaliar_consultas(consultas, orcamento=2, repeticoes=2) == [
+        "3 consultas, acima do orçamento de 2",
+        "consulta repetida 2 vezes (N+1?): SELECT a",
+    ]
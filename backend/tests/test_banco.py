@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from backend.database import (
+    PERFIL_SQLITE,
+    PoolMonitorado,
+    criar_engine,
+    engine,
+    url_assincrona,
+)
+
+
+@pytest.mark.parametrize(
+    ("url", "esperada"),
+    [
+        ("sqlite:///banco.db", "sqlite+aiosqlite:///banco.db"),
+        ("postgresql://u:s@host/db", "postgresql+asyncpg://u:s@host/db"),
+        ("postgresql+psycopg://u:s@host/db", "postgresql+psycopg://u:s@host/db"),
+    ],
+)
+def test_url_assincrona(url, esperada):
+    assert url_assincrona(url) == esperada
+
+
+def test_url_assincrona_sem_driver_conhecido():
+    with pytest.raises(ValueError):
+        url_assincrona("oracle://u:s@host/db")
+
+
+def test_engine_usa_pool_monitorado():
+    assert isinstance(engine.pool, PoolMonitorado)
+
+
+def test_estatisticas_do_pool_para_admin(client, criar_usuario):
+    _, headers = criar_usuario("admin@teste.com", admin=True)
+
+    estatisticas = client.get("/admin/banco/pool", headers=headers).json()
+
+    assert estatisticas["pool"] == "PoolMonitorado"
+    assert estatisticas["checkouts"] >= 1
+    assert estatisticas["em_uso"] >= 1
+
+
+def test_estatisticas_do_pool_exigem_admin(client, criar_usuario):
+    _, headers = criar_usuario()
+
+    assert client.get("/admin/banco/pool", headers=headers).status_code == 401
+
+
+def _ler_pragmas(url, pragmas_sqlite):
+    async def _ler():
+        engine_banco = criar_engine(url, pragmas_sqlite)
+        async with engine_banco.connect() as conexao:
+            valores = {
+                nome: (await conexao.exec_driver_sql(f"PRAGMA {nome}")).scalar()
+                for nome in (
+                    "journal_mode",
+                    "synchronous",
+                    "busy_timeout",
+                    "temp_store",
+                )
+            }
+        await engine_banco.dispose()
+        return valores
+
+    return asyncio.run(_ler())
+
+
+def test_perfil_sqlite_aplicado_nas_conexoes(tmp_path):
+    valores = _ler_pragmas(f"sqlite:///{tmp_path / 'perfil.db'}", PERFIL_SQLITE)
+
+    assert valores == {
+        "journal_mode": "wal",
+        "synchronous": 1,  # NORMAL
+        "busy_timeout": 5000,
+        "temp_store": 2,  # MEMORY
+    }
+
+
+def test_perfil_sqlite_desativado(tmp_path):
+    valores = _ler_pragmas(f"sqlite:///{tmp_path / 'padrao.db'}", {})
+
+    assert valores["journal_mode"] == "delete"
@@ -0,0 +1,60 @@
+import asyncio
+import time
+
+from sqlalchemy import select
+
+from backend.database import SessionLocal
+from backend.dependencies import CachePrincipais, UsuarioAutenticado, cache_principais
+from backend.models import Usuario
+
+
+def test_segunda_requisicao_nao_consulta_usuario(
+    client, criar_usuario, contar_consultas
+):
+    _, headers = criar_usuario()
+    client.get("/pedidos/", headers=headers)
+
+    with contar_consultas() as consultas:
+        resposta = client.get("/pedidos/", headers=headers)
+
+    assert resposta.status_code == 200
+    assert not [sql for sql in consultas if "FROM usuarios" in sql], consultas
+    assert cache_principais.estatisticas()["hits"] >= 1
+
+
+def test_entrada_nunca_passa_do_exp_do_token():
+    cache = CachePrincipais(max_entradas=10, ttl=3600)
+    cache.guardar("token", UsuarioAutenticado(1, False, True), time.time() - 1)
+
+    assert cache.obter("token") is None
+    assert cache.estatisticas()["entradas"] == 0
+
+
+def test_cache_limitado_descarta_menos_usado():
+    cache = CachePrincipais(max_entradas=2, ttl=60)
+    expiracao = time.time() + 60
+    for n in range(3):
+        cache.guardar(f"t{n}", UsuarioAutenticado(n, False, True), expiracao)
+
+    assert cache.obter("t0") is None
+    assert cache.obter("t2").id == 2
+    assert cache.estatisticas()["evictions"] == 1
+
+
+def test_alterar_usuario_invalida_cache(client, criar_usuario):
+    id_usuario, headers = criar_usuario()
+    assert client.get("/admin/cache/usuarios", headers=headers).status_code == 401
+
+    async def _promover():
+        async with SessionLocal() as session:
+            usuario = await session.scalar(
+                select(Usuario).where(Usuario.id == id_usuario)
+            )
+            usuario.admin = True
+            await session.commit()
+
+    asyncio.run(_promover())
+    resposta = client.get("/admin/cache/usuarios", headers=headers)
+
+    assert resposta.status_code == 200
+    assert resposta.json()["invalidacoes"] == 1
@@ -0,0 +1,227 @@
+import pytest
+
+ITEM = {"quantidade": 1, "sabor": "Mussarela", "tamanho": "M", "preco_unitario": 30.0}
+
+
+@pytest.mark.parametrize("quantidade_pedidos", [1, 10])
+def test_listar_pedidos_custa_consultas_constantes(
+    client, criar_usuario, criar_pedido, contar_consultas, quantidade_pedidos
+):
+    id_usuario, headers = criar_usuario()
+    for _ in range(quantidade_pedidos):
+        criar_pedido(id_usuario, headers, [ITEM] * 3)
+
+    with contar_consultas() as consultas:
+        resposta = client.get("/pedidos/listar/pedidos-usuario", headers=headers)
+
+    assert len(resposta.json()["pedidos"]) == quantidade_pedidos
+    # versão da lista (ETag), página de pedidos e itens de todos os pedidos da página
+    # (usuário em cache)
+    assert len(consultas) == 3, consultas
+
+
+def test_visualizar_pedido_carrega_itens_em_uma_consulta(
+    client, criar_usuario, criar_pedido, contar_consultas
+):
+    id_usuario, headers = criar_usuario()
+    id_pedido = criar_pedido(id_usuario, headers, [ITEM] * 3)
+
+    with contar_consultas() as consultas:
+        resposta = client.get(f"/pedidos/pedido/{id_pedido}", headers=headers)
+
+    assert resposta.json()["quantidade_itens_pedido"] == 3
+    assert len(consultas) == 2, consultas
+
+
+def test_remover_item_nao_recarrega_itens(
+    client, criar_usuario, criar_pedido, contar_consultas
+):
+    id_usuario, headers = criar_usuario()
+    id_pedido = criar_pedido(id_usuario, headers, [ITEM] * 3)
+    itens = client.get(f"/pedidos/pedido/{id_pedido}", headers=headers).json()
+    id_item = itens["pedido"]["itens"][0]["id"]
+
+    with contar_consultas() as consultas:
+        resposta = client.delete(
+            f"/pedidos/pedido/remover-item/{id_item}", headers=headers
+        )
+
+    assert resposta.json()["quantidade_itens_pedido"] == 2
+    # item, pedido, DELETE do item, UPDATE do preço, contadores e versão do usuário,
+    # resumo de vendas, COUNT dos itens
+    assert len(consultas) == 8, consultas
+
+
+@pytest.mark.parametrize("itens_existentes", [0, 30])
+def test_adicionar_item_custa_o_mesmo_para_qualquer_tamanho(
+    client, criar_usuario, criar_pedido, contar_consultas, itens_existentes
+):
+    id_usuario, headers = criar_usuario()
+    id_pedido = criar_pedido(id_usuario, headers, [ITEM] * itens_existentes)
+
+    with contar_consultas() as consultas:
+        resposta = client.post(
+            f"/pedidos/pedido/adicionar-item/{id_pedido}", json=ITEM, headers=headers
+        )
+
+    assert resposta.json()["preco_pedido"] == 30.0 * (itens_existentes + 1)
+    # pedido, INSERT do item, UPDATE ... RETURNING do preço, contadores e versão do
+    # usuário, resumo de vendas
+    assert len(consultas) == 6, consultas
+
+
+def test_cancelar_pedido_nao_carrega_itens(
+    client, criar_usuario, criar_pedido, contar_consultas
+):
+    id_usuario, headers = criar_usuario()
+    id_pedido = criar_pedido(id_usuario, headers, [ITEM] * 3)
+
+    with contar_consultas() as consultas:
+        client.post(f"/pedidos/pedido/cancelar/{id_pedido}", headers=headers)
+
+    # o resumo de vendas é movido com INSERT ... SELECT, sem trazer os itens
+    carregam_itens = [
+        sql
+        for sql in consultas
+        if sql.startswith("SELECT") and "FROM itens_pedido" in sql
+    ]
+    assert not carregam_itens, consultas
+
+
+def test_criar_pedido_com_itens_em_uma_transacao(
+    client, criar_usuario, contar_consultas
+):
+    id_usuario, headers = criar_usuario()
+    itens = [dict(ITEM, quantidade=n) for n in range(1, 21)]
+
+    with contar_consultas() as consultas:
+        resposta = client.post(
+            "/pedidos/pedido/completo",
+            json={"usuario": id_usuario, "itens": itens},
+            headers=headers,
+        )
+
+    corpo = resposta.json()
+    assert corpo["preco_pedido"] == 30.0 * sum(range(1, 21))
+    assert len(corpo["itens_ids"]) == 20
+    # usuário, INSERT do pedido, INSERT em lote dos itens, resumo de vendas,
+    # contadores e versão do usuário
+    assert len(consultas) == 6, consultas
+    pedido = client.get(f"/pedidos/pedido/{corpo['id_pedido']}", headers=headers).json()
+    assert pedido["quantidade_itens_pedido"] == 20
+    assert [i["id"] for i in pedido["pedido"]["itens"]] == corpo["itens_ids"]
+
+
+def test_criar_pedido_com_itens_exige_itens(client, criar_usuario):
+    id_usuario, headers = criar_usuario()
+
+    resposta = client.post(
+        "/pedidos/pedido/completo",
+        json={"usuario": id_usuario, "itens": []},
+        headers=headers,
+    )
+
+    assert resposta.status_code == 422
+
+
+def test_alterar_itens_em_lote(client, criar_usuario, criar_pedido, contar_consultas):
+    id_usuario, headers = criar_usuario()
+    id_pedido = criar_pedido(id_usuario, headers, [ITEM] * 3)
+    itens = client.get(f"/pedidos/pedido/{id_pedido}", headers=headers).json()
+    ids_atuais = [item["id"] for item in itens["pedido"]["itens"]]
+
+    with contar_consultas() as consultas:
+        resposta = client.post(
+            f"/pedidos/pedido/alterar-itens/{id_pedido}",
+            json={"adicionar": [ITEM] * 5, "remover": ids_atuais[:2]},
+            headers=headers,
+        )
+
+    corpo = resposta.json()
+    assert resposta.status_code == 200, corpo
+    assert corpo["itens_removidos"] == ids_atuais[:2]
+    assert len(corpo["itens_adicionados"]) == 5
+    assert corpo["preco_pedido"] == 30.0 * 6
+    # pedido, DELETE em lote, INSERT em lote, UPDATE do preço, contadores e versão do
+    # usuário e resumo de vendas
+    assert len(consultas) == 7, consultas
+
+
+def test_alterar_itens_desfaz_tudo_se_item_nao_pertence_ao_pedido(
+    client, criar_usuario, criar_pedido
+):
+    id_usuario, headers = criar_usuario()
+    id_pedido = criar_pedido(id_usuario, headers, [ITEM])
+    outro_pedido = criar_pedido(id_usuario, headers, [ITEM])
+    item_alheio = client.get(f"/pedidos/pedido/{outro_pedido}", headers=headers).json()
+    id_item_alheio = item_alheio["pedido"]["itens"][0]["id"]
+
+    resposta = client.post(
+        f"/pedidos/pedido/alterar-itens/{id_pedido}",
+        json={"adicionar": [ITEM], "remover": [id_item_alheio]},
+        headers=headers,
+    )
+
+    assert resposta.status_code == 404
+    pedido = client.get(f"/pedidos/pedido/{id_pedido}", headers=headers).json()
+    assert pedido["quantidade_itens_pedido"] == 1
+    assert pedido["pedido"]["preco"] == 30.0
+
+
+def test_alterar_status_em_lote_usa_um_update(
+    client, criar_usuario, criar_pedido, contar_consultas
+):
+    id_usuario, headers = criar_usuario()
+    ids = [criar_pedido(id_usuario, headers) for _ in range(20)]
+
+    with contar_consultas() as consultas:
+        client.post(
+            "/pedidos/pedidos/status",
+            json={"status": "FINALIZADO", "ids": ids},
+            headers=headers,
+        )
+
+    # situação dos pedidos, bloqueio dos pedidos, resumo de vendas e contadores
+    # (saída e entrada de cada), um único UPDATE e a versão dos pedidos do usuário
+    assert len(consultas) == 8, consultas
+    assert consultas[1].startswith("SELECT pedidos.id")
+    assert consultas[6].startswith("UPDATE pedidos")
+
+
+def test_visualizar_pedido_inalterado_responde_304_sem_itens(
+    client, criar_usuario, criar_pedido, contar_consultas
+):
+    id_usuario, headers = criar_usuario()
+    id_pedido = criar_pedido(id_usuario, headers, [ITEM] * 3)
+    etag = client.get(f"/pedidos/pedido/{id_pedido}", headers=headers).headers["ETag"]
+
+    with contar_consultas() as consultas:
+        resposta = client.get(
+            f"/pedidos/pedido/{id_pedido}", headers={**headers, "If-None-Match": etag}
+        )
+
+    assert resposta.status_code == 304
+    assert resposta.headers["ETag"] == etag
+    # apenas dono e versão do pedido
+    assert len(consultas) == 1, consultas
+
+
+def test_listar_pedidos_inalterados_responde_304_com_uma_consulta(
+    client, criar_usuario, criar_pedido, contar_consultas
+):
+    id_usuario, headers = criar_usuario()
+    for _ in range(3):
+        criar_pedido(id_usuario, headers, [ITEM] * 3)
+    etag = client.get("/pedidos/listar/pedidos-usuario", headers=headers).headers[
+        "ETag"
+    ]
+
+    with contar_consultas() as consultas:
+        resposta = client.get(
+            "/pedidos/listar/pedidos-usuario",
+            headers={**headers, "If-None-Match": etag},
+        )
+
+    assert resposta.status_code == 304
+    assert len(consultas) == 1, consultas
+    assert "FROM usuarios" in consultas[0]
@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+
+import backend.config
+from backend.database import criar_engine
+from backend.gerador_dados import gerar_dados
+from backend.models import (
+    Base,
+    ContadorPedidos,
+    ItemPedido,
+    Pedido,
+    ResumoVendas,
+    Usuario,
+)
+
+
+def _gerar(**kwargs):
+    async def _executar():
+        engine_banco = criar_engine(backend.config.DATABASE_URL)
+        try:
+            return await gerar_dados(engine_banco=engine_banco, **kwargs)
+        finally:
+            await engine_banco.dispose()
+
+    return asyncio.run(_executar())
+
+
+def _linhas(engine_sincrono):
+    with engine_sincrono.connect() as conexao:
+        return {
+            tabela.name: conexao.execute(
+                select(tabela).order_by(*tabela.primary_key)
+            ).all()
+            for tabela in (Usuario.__table__, Pedido.__table__, ItemPedido.__table__)
+        }
+
+
+def test_mesma_semente_gera_os_mesmos_dados(engine_sincrono, monkeypatch):
+    monkeypatch.setattr("backend.gerador_dados.PEDIDOS_POR_BLOCO", 50)
+    resumo = _gerar(usuarios=20, pedidos=300, semente=7, tamanho_lote=100)
+    primeira = _linhas(engine_sincrono)
+    Base.metadata.drop_all(engine_sincrono)
+    Base.metadata.create_all(engine_sincrono)
+    _gerar(usuarios=20, pedidos=300, semente=7, pedidos_por_transacao=100)
+    segunda = _linhas(engine_sincrono)
+
+    assert primeira == segunda
+    assert len(primeira["pedidos"]) == 300
+    assert len(primeira["itens_pedido"]) == resumo["itens"]
+    assert 300 <= resumo["itens"] <= 300 * 6
+
+
+def test_precos_e_agregados_consistentes(engine_sincrono):
+    _gerar(usuarios=5, pedidos=200, semente=3)
+
+    with engine_sincrono.connect() as conexao:
+        preco_itens = dict(
+            conexao.execute(
+                select(
+                    ItemPedido.pedido,
+                    func.sum(ItemPedido.quantidade * ItemPedido.preco_unitario),
+                ).group_by(ItemPedido.pedido)
+            ).all()
+        )
+        precos = dict(conexao.execute(select(Pedido.id, Pedido.preco)).all())
+        receita = conexao.scalar(select(func.sum(ResumoVendas.receita)))
+        contadores = conexao.scalar(select(func.sum(ContadorPedidos.pedidos)))
+
+    assert precos == pytest.approx(preco_itens)
+    assert receita == pytest.approx(sum(precos.values()))
+    assert contadores == 200
+
+
+def test_acrescenta_depois_dos_dados_existentes(client, criar_usuario, engine_sincrono):
+    id_usuario, headers = criar_usuario()
+    client.post("/pedidos/pedido", json={"usuario": id_usuario}, headers=headers)
+
+    resumo = _gerar(usuarios=2, pedidos=10, semente=1)
+
+    with engine_sincrono.connect() as conexao:
+        primeiro_gerado = conexao.scalar(
+            select(func.min(Usuario.id)).where(Usuario.id != id_usuario)
+        )
+        assert primeiro_gerado == id_usuario + 1
+        assert conexao.scalar(select(func.count()).select_from(Pedido)) == 11
+        assert (
+            conexao.scalar(select(func.count()).select_from(ItemPedido))
+            == resumo["itens"]
+        )
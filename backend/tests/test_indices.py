@@ -0,0 +1,70 @@
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, select
+
+from backend.models import Base, ItemPedido, Pedido, Usuario
+
+ALEMBIC_INI = Path(__file__).parent.parent / "alembic.ini"
+
+CONSULTAS_QUENTES = {
+    "autenticar_usuario": select(Usuario).where(Usuario.email == "ana@teste.com"),
+    "listar_pedidos": select(Pedido)
+    .where(Pedido.usuario == 1, Pedido.id > 500)
+    .order_by(Pedido.id)
+    .limit(51),
+    "listar_todos_pedidos": select(Pedido)
+    .where(Pedido.id > 500)
+    .order_by(Pedido.id)
+    .limit(51),
+    "pedidos_por_status": select(Pedido).where(
+        Pedido.usuario == 1, Pedido.status == "PENDENTE"
+    ),
+    "pedido_itens": select(ItemPedido).where(ItemPedido.pedido == 1),
+}
+
+
+def _schema_por_migracao(engine):
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(ALEMBIC_INI.parent / "alembic"))
+    with engine.begin() as conexao:
+        config.attributes["connection"] = conexao
+        command.upgrade(config, "head")
+
+
+def _schema_por_metadata(engine):
+    Base.metadata.create_all(engine)
+
+
+@pytest.fixture(params=[_schema_por_migracao, _schema_por_metadata])
+def engine_indexado(request, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'indices.db'}")
+    request.param(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.parametrize("nome", CONSULTAS_QUENTES)
+def test_consulta_quente_usa_indice(engine_indexado, nome):
+    sql = CONSULTAS_QUENTES[nome].compile(
+        engine_indexado, compile_kwargs={"literal_binds": True}
+    )
+    with engine_indexado.connect() as conexao:
+        plano = [
+            linha.detail
+            for linha in conexao.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")
+        ]
+
+    assert not [passo for passo in plano if passo.startswith("SCAN")], plano
+    assert not [passo for passo in plano if "TEMP B-TREE" in passo], plano
+
+
+def test_email_unico(engine_indexado):
+    dados = {"nome": "Ana", "email": "ana@teste.com", "senha": "x"}
+    with engine_indexado.begin() as conexao:
+        conexao.execute(Usuario.__table__.insert(), dados)
+
+    with pytest.raises(Exception, match="UNIQUE"), engine_indexado.begin() as conexao:
+        conexao.execute(Usuario.__table__.insert(), dados)
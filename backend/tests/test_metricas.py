@@ -0,0 +1,63 @@
+import pytest
+
+from backend.metricas import Histograma, registro_metricas
+
+
+@pytest.fixture(autouse=True)
+def metricas_zeradas():
+    registro_metricas.limpar()
+
+
+def _amostras(client):
+    resposta = client.get("/metrics")
+    assert resposta.status_code == 200
+    assert resposta.headers["content-type"].startswith("text/plain; version=0.0.4")
+    amostras = {}
+    for linha in resposta.text.splitlines():
+        if linha and not linha.startswith("#"):
+            nome, valor = linha.rsplit(" ", 1)
+            amostras[nome] = float(valor)
+    return amostras
+
+
+def test_metricas_por_rota_e_status(client, criar_usuario, criar_pedido):
+    id_usuario, headers = criar_usuario()
+    id_pedido = criar_pedido(id_usuario, headers)
+    for _ in range(3):
+        client.get(f"/pedidos/pedido/{id_pedido}", headers=headers)
+    client.get("/pedidos/pedido/999", headers=headers)
+    client.get("/nao-existe")
+
+    amostras = _amostras(client)
+
+    rota = 'method="GET",route="/pedidos/pedido/{id_pedido}"'
+    assert amostras[f'http_requests_total{{{rota},status="200"}}'] == 3
+    assert amostras[f'http_requests_total{{{rota},status="400"}}'] == 1
+    assert amostras[f"http_request_duration_seconds_count{{{rota}}}"] == 4
+    assert amostras[f'http_request_duration_seconds_bucket{{{rota},le="+Inf"}}'] == 4
+    assert (
+        amostras['http_requests_total{method="GET",route="desconhecida",status="404"}']
+        == 1
+    )
+    # Each successful read runs two queries: the order and its items
+    assert amostras[f'http_request_db_queries_bucket{{{rota},le="2"}}'] == 4
+    assert amostras[f"http_request_db_queries_sum{{{rota}}}"] == 3 * 2 + 1
+    assert amostras["db_queries_total"] >= 7
+    assert amostras["bcrypt_queue_depth"] == 0
+    assert amostras["db_pool_checkouts_total"] > 0
+
+
+def test_histograma_e_cumulativo():
+    histograma = Histograma((1, 5))
+    for valor in (0.5, 1, 3, 7):
+        histograma.observar(valor)
+
+    linhas = histograma.linhas("x", 'route="/"')
+
+    assert linhas == [
+        'x_bucket{route="/",le="1"} 2',
+        'x_bucket{route="/",le="5"} 3',
+        'x_bucket{route="/",le="+Inf"} 4',
+        'x_sum{route="/"} 11.5',
+        'x_count{route="/"} 4',
+    ]
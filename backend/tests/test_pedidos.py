@@ -0,0 +1,302 @@
+from backend.schemas import (
+    ListaPedidosSchema,
+    ListaTodosPedidosSchema,
+    PedidoDetalhadoSchema,
+)
+
+
+def _item(quantidade=2, preco_unitario=10.0):
+    return {
+        "quantidade": quantidade,
+        "sabor": "Calabresa",
+        "tamanho": "G",
+        "preco_unitario": preco_unitario,
+    }
+
+
+def test_login_retorna_tokens(client, criar_usuario, senha_padrao):
+    criar_usuario("ana@teste.com")
+
+    resposta = client.post(
+        "/auth/login", json={"email": "ana@teste.com", "senha": senha_padrao}
+    )
+
+    assert resposta.status_code == 200
+    assert resposta.json()["token_type"] == "Bearer"
+
+
+def test_criar_conta_rejeita_email_duplicado(client, criar_usuario):
+    criar_usuario("ana@teste.com")
+    dados = {
+        "nome": "Ana",
+        "email": "ana@teste.com",
+        "senha": "x",
+        "ativo": True,
+        "admin": False,
+    }
+
+    resposta = client.post("/auth/criar_conta", json=dados)
+
+    assert resposta.status_code == 400
+
+
+def test_fluxo_de_itens_atualiza_preco(client, criar_usuario, criar_pedido):
+    id_usuario, headers = criar_usuario()
+    id_pedido = criar_pedido(id_usuario, headers)
+
+    adicionado = client.post(
+        f"/pedidos/pedido/adicionar-item/{id_pedido}", json=_item(), headers=headers
+    ).json()
+    client.post(
+        f"/pedidos/pedido/adicionar-item/{id_pedido}",
+        json=_item(1, 5.0),
+        headers=headers,
+    )
+    removido = client.delete(
+        f"/pedidos/pedido/remover-item/{adicionado['item_id']}", headers=headers
+    ).json()
+
+    assert adicionado["preco_pedido"] == 20.0
+    assert removido["quantidade_itens_pedido"] == 1
+    assert removido["pedido"]["preco"] == 5.0
+
+
+def test_listar_pedidos_do_usuario(client, criar_usuario, criar_pedido):
+    id_usuario, headers = criar_usuario()
+    id_pedido = criar_pedido(id_usuario, headers)
+    client.post(
+        f"/pedidos/pedido/adicionar-item/{id_pedido}", json=_item(), headers=headers
+    )
+
+    pagina = client.get("/pedidos/listar/pedidos-usuario", headers=headers).json()
+
+    assert [p["id"] for p in pagina["pedidos"]] == [id_pedido]
+    assert pagina["pedidos"][0]["itens"][0]["sabor"] == "Calabresa"
+    assert pagina["next_cursor"] is None
+
+
+def test_respostas_rapidas_seguem_o_response_model(client, criar_usuario, criar_pedido):
+    id_usuario, headers = criar_usuario()
+    _, headers_admin = criar_usuario("admin@teste.com", admin=True)
+    id_pedido = criar_pedido(id_usuario, headers)
+    criar_pedido(id_usuario, headers)
+    for item in (_item(), _item(1, 5.0)):
+        client.post(
+            f"/pedidos/pedido/adicionar-item/{id_pedido}", json=item, headers=headers
+        )
+
+    casos = [
+        (f"/pedidos/pedido/{id_pedido}", headers, PedidoDetalhadoSchema),
+        ("/pedidos/listar/pedidos-usuario", headers, ListaPedidosSchema),
+        ("/pedidos/pedidos/listar", headers_admin, ListaTodosPedidosSchema),
+    ]
+    for url, headers_caso, schema in casos:
+        resposta = client.get(url, headers=headers_caso)
+        assert resposta.status_code == 200
+        assert resposta.headers["content-type"] == "application/json"
+        corpo = resposta.json()
+        assert schema.model_validate(corpo).model_dump(mode="json") == corpo
+
+    detalhe = client.get(f"/pedidos/pedido/{id_pedido}", headers=headers).json()
+    assert detalhe["quantidade_itens_pedido"] == 2
+    assert [i["preco_unitario"] for i in detalhe["pedido"]["itens"]] == [10.0, 5.0]
+    assert detalhe["pedido"]["preco"] == 25.0
+
+
+def _percorrer_paginas(client, url, headers, limit):
+    ids, cursor = [], None
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        pagina = client.get(url, params=params, headers=headers).json()
+        ids.extend(p["id"] for p in pagina["pedidos"])
+        cursor = pagina["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+def test_listar_pedidos_paginado_por_cursor(client, criar_usuario, criar_pedido):
+    id_usuario, headers = criar_usuario()
+    id_outro, headers_outro = criar_usuario("outro@teste.com")
+    ids = [criar_pedido(id_usuario, headers) for _ in range(5)]
+    criar_pedido(id_outro, headers_outro)
+
+    vistos = _percorrer_paginas(client, "/pedidos/listar/pedidos-usuario", headers, 2)
+
+    assert vistos == ids
+
+
+def test_listar_todos_pedidos_paginado_para_admin(client, criar_usuario, criar_pedido):
+    id_usuario, headers = criar_usuario()
+    _, headers_admin = criar_usuario("admin@teste.com", admin=True)
+    ids = [criar_pedido(id_usuario, headers) for _ in range(3)]
+
+    vistos = _percorrer_paginas(client, "/pedidos/pedidos/listar", headers_admin, 1)
+
+    assert vistos == ids
+
+
+def test_limite_da_pagina_respeita_maximo(
+    client, criar_usuario, criar_pedido, monkeypatch
+):
+    monkeypatch.setattr("backend.paginacao.PAGINACAO_LIMITE_MAXIMO", 2)
+    id_usuario, headers = criar_usuario()
+    for _ in range(3):
+        criar_pedido(id_usuario, headers)
+
+    pagina = client.get(
+        "/pedidos/listar/pedidos-usuario", params={"limit": 100}, headers=headers
+    ).json()
+
+    assert len(pagina["pedidos"]) == 2
+    assert pagina["next_cursor"] is not None
+
+
+def test_cursor_invalido(client, criar_usuario):
+    _, headers = criar_usuario()
+
+    resposta = client.get(
+        "/pedidos/listar/pedidos-usuario", params={"cursor": "%%%"}, headers=headers
+    )
+
+    assert resposta.status_code == 400
+
+
+def test_usuario_nao_acessa_pedido_de_outro(client, criar_usuario, criar_pedido):
+    id_dono, headers_dono = criar_usuario("dono@teste.com")
+    _, headers_outro = criar_usuario("outro@teste.com")
+    id_pedido = criar_pedido(id_dono, headers_dono)
+
+    resposta = client.get(f"/pedidos/pedido/{id_pedido}", headers=headers_outro)
+
+    assert resposta.status_code == 401
+
+
+def test_finalizar_e_cancelar_pedido(client, criar_usuario, criar_pedido):
+    id_usuario, headers = criar_usuario()
+    id_finalizado = criar_pedido(id_usuario, headers)
+    id_cancelado = criar_pedido(id_usuario, headers)
+
+    finalizado = client.post(
+        f"/pedidos/pedido/finalizar/{id_finalizado}", headers=headers
+    )
+    cancelado = client.post(f"/pedidos/pedido/cancelar/{id_cancelado}", headers=headers)
+
+    assert finalizado.json()["pedido"]["status"] == "FINALIZADO"
+    assert cancelado.json()["pedido"]["status"] == "CANCELADO"
+
+
+def test_alterar_status_em_lote_por_ids(client, criar_usuario, criar_pedido):
+    id_usuario, headers = criar_usuario()
+    id_outro, headers_outro = criar_usuario("outro@teste.com")
+    aberto, encerrado = (criar_pedido(id_usuario, headers) for _ in range(2))
+    alheio = criar_pedido(id_outro, headers_outro)
+    client.post(f"/pedidos/pedido/cancelar/{encerrado}", headers=headers)
+
+    resposta = client.post(
+        "/pedidos/pedidos/status",
+        json={"status": "FINALIZADO", "ids": [aberto, encerrado, alheio, 9999]},
+        headers=headers,
+    )
+
+    corpo = resposta.json()
+    assert corpo["atualizados"] == 1
+    assert {r["id"]: r["resultado"] for r in corpo["resultados"]} == {
+        aberto: "atualizado",
+        encerrado: "ja_encerrado",
+        alheio: "proibido",
+        9999: "nao_encontrado",
+    }
+    pedido = client.get(f"/pedidos/pedido/{aberto}", headers=headers).json()
+    assert pedido["pedido"]["status"] == "FINALIZADO"
+
+
+def test_alterar_status_em_lote_por_filtro(client, criar_usuario, criar_pedido):
+    id_usuario, headers = criar_usuario()
+    _, headers_admin = criar_usuario("admin@teste.com", admin=True)
+    ids = [criar_pedido(id_usuario, headers) for _ in range(4)]
+    client.post(f"/pedidos/pedido/finalizar/{ids[1]}", headers=headers)
+
+    resposta = client.post(
+        "/pedidos/pedidos/status",
+        json={
+            "status": "CANCELADO",
+            "filtro": {"usuario": id_usuario, "id_minimo": ids[0], "id_maximo": ids[2]},
+        },
+        headers=headers_admin,
+    )
+
+    assert [r["id"] for r in resposta.json()["resultados"]] == [ids[0], ids[2]]
+    status = {
+        id_pedido: client.get(f"/pedidos/pedido/{id_pedido}", headers=headers).json()[
+            "pedido"
+        ]["status"]
+        for id_pedido in ids
+    }
+    assert status == {
+        ids[0]: "CANCELADO",
+        ids[1]: "FINALIZADO",
+        ids[2]: "CANCELADO",
+        ids[3]: "PENDENTE",
+    }
+
+
+def test_alterar_status_em_lote_exige_ids_ou_filtro(client, criar_usuario):
+    _, headers = criar_usuario()
+
+    resposta = client.post(
+        "/pedidos/pedidos/status", json={"status": "CANCELADO"}, headers=headers
+    )
+
+    assert resposta.status_code == 400
+
+
+def test_etag_muda_a_cada_alteracao_do_pedido(client, criar_usuario, criar_pedido):
+    id_usuario, headers = criar_usuario()
+    id_pedido = criar_pedido(id_usuario, headers)
+
+    def _etags():
+        pedido = client.get(f"/pedidos/pedido/{id_pedido}", headers=headers)
+        lista = client.get("/pedidos/listar/pedidos-usuario", headers=headers)
+        return pedido.headers["ETag"], lista.headers["ETag"]
+
+    etags = [_etags()]
+    client.post(
+        f"/pedidos/pedido/adicionar-item/{id_pedido}", json=_item(), headers=headers
+    )
+    etags.append(_etags())
+    client.post(
+        f"/pedidos/pedido/alterar-itens/{id_pedido}",
+        json={"adicionar": [_item()]},
+        headers=headers,
+    )
+    etags.append(_etags())
+    client.post(f"/pedidos/pedido/finalizar/{id_pedido}", headers=headers)
+    etags.append(_etags())
+    criar_pedido(id_usuario, headers)
+    etags.append(_etags())
+
+    etags_pedido = [pedido for pedido, _ in etags]
+    etags_lista = [lista for _, lista in etags]
+    assert len(set(etags_pedido[:4])) == 4
+    assert etags_pedido[4] == etags_pedido[3]
+    assert len(set(etags_lista)) == 5
+    desatualizado = client.get(
+        f"/pedidos/pedido/{id_pedido}",
+        headers={**headers, "If-None-Match": etags_pedido[0]},
+    )
+    assert desatualizado.status_code == 200
+
+
+def test_etag_da_lista_depende_da_pagina(client, criar_usuario, criar_pedido):
+    id_usuario, headers = criar_usuario()
+    for _ in range(3):
+        criar_pedido(id_usuario, headers)
+
+    primeira = client.get("/pedidos/listar/pedidos-usuario?limit=2", headers=headers)
+    segunda = client.get(
+        f"/pedidos/listar/pedidos-usuario?limit=2&cursor={primeira.json()['next_cursor']}",
+        headers={**headers, "If-None-Match": primeira.headers["ETag"]},
+    )
+
+    assert segunda.status_code == 200
+    assert len(segunda.json()["pedidos"]) == 1
@@ -0,0 +1,123 @@
+import sqlite3
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+import backend.dependencies
+from backend.config import DATABASE_URL
+from backend.database import SessionLocal
+from backend.dependencies import JanelaLeituraPropria, RoteadorSessoes
+
+ARQUIVO_PRIMARIA = DATABASE_URL.removeprefix("sqlite:///")
+
+
+@pytest.fixture
+def replicar(tmp_path, monkeypatch):
+    """Copies the test database to a replica file and routes reads to it.
+
+    Returns a function `(janela_segundos) -> None`; later writes on the primary are
+    not seen by the replica until it is called again.
+    """
+
+    def _replicar(janela_segundos=0):
+        copia = tmp_path / "replica.db"
+        copia.unlink(missing_ok=True)
+        with (
+            sqlite3.connect(ARQUIVO_PRIMARIA) as origem,
+            sqlite3.connect(copia) as destino,
+        ):
+            origem.backup(destino)
+        # No pooled connections, so nothing outlives the TestClient's event loop
+        engine_replica = create_async_engine(
+            f"sqlite+aiosqlite:///{copia}", poolclass=NullPool
+        )
+        roteador = RoteadorSessoes(
+            SessionLocal,
+            [async_sessionmaker(bind=engine_replica, expire_on_commit=False)],
+            JanelaLeituraPropria(janela_segundos),
+        )
+        monkeypatch.setattr(backend.dependencies, "roteador_sessoes", roteador)
+
+    return _replicar
+
+
+def _ids_pedidos(client, headers):
+    pagina = client.get("/pedidos/listar/pedidos-usuario", headers=headers).json()
+    return [pedido["id"] for pedido in pagina["pedidos"]]
+
+
+def test_leituras_vao_para_a_replica_e_escritas_para_a_primaria(
+    client, criar_usuario, criar_pedido, replicar
+):
+    id_usuario, headers = criar_usuario()
+    primeiro = criar_pedido(id_usuario, headers)
+    replicar()
+
+    segundo = criar_pedido(id_usuario, headers)
+    client.post(
+        f"/pedidos/pedido/adicionar-item/{segundo}",
+        json={
+            "quantidade": 1,
+            "sabor": "Calabresa",
+            "tamanho": "G",
+            "preco_unitario": 42.5,
+        },
+        headers=headers,
+    )
+
+    assert _ids_pedidos(client, headers) == [primeiro]
+    # 400 is "Pedido não encontrado": the replica does not have the new order yet
+    assert client.get(f"/pedidos/pedido/{segundo}", headers=headers).status_code == 400
+    replicar()
+    assert _ids_pedidos(client, headers) == [primeiro, segundo]
+
+
+def test_janela_de_leitura_propria_mantem_quem_escreveu_na_primaria(
+    client, criar_usuario, criar_pedido, replicar
+):
+    id_usuario, headers = criar_usuario()
+    _, headers_outro = criar_usuario("outro@teste.com")
+    criar_pedido(id_usuario, headers)
+    replicar(janela_segundos=60)
+
+    novo = criar_pedido(id_usuario, headers)
+
+    assert novo in _ids_pedidos(client, headers)
+    roteador = backend.dependencies.roteador_sessoes
+    assert roteador.janela.recente(id_usuario)
+    assert not roteador.janela.recente(id_usuario + 1)
+    # Someone else's order would be 401 on the primary; the replica does not have it
+    assert (
+        client.get(f"/pedidos/pedido/{novo}", headers=headers_outro).status_code == 400
+    )
+
+
+def test_janela_expira_e_replicas_se_alternam(monkeypatch):
+    agora = [1000.0]
+    monkeypatch.setattr(backend.dependencies.time, "monotonic", lambda: agora[0])
+    primaria, replica_a, replica_b = object(), object(), object()
+    roteador = RoteadorSessoes(
+        primaria, [replica_a, replica_b], JanelaLeituraPropria(5)
+    )
+
+    assert [roteador.escolher("GET") for _ in range(3)] == [
+        replica_a,
+        replica_b,
+        replica_a,
+    ]
+    assert roteador.escolher("POST", 1) is primaria
+
+    roteador.janela.registrar_escrita(1)
+    assert roteador.escolher("GET", 1) is primaria
+    assert roteador.escolher("GET", 2) is replica_b
+    agora[0] += 5
+    assert roteador.escolher("GET", 1) is replica_a
+
+
+def test_sem_replicas_tudo_vai_para_a_primaria():
+    primaria = object()
+    roteador = RoteadorSessoes(primaria, [], JanelaLeituraPropria(0))
+
+    assert roteador.escolher("GET") is primaria
+    assert roteador.escolher("DELETE", 1) is primaria
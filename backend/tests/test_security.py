@@ -0,0 +1,51 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from backend.security import PoolSenhas, pool_senhas
+
+
+def test_pool_senhas_rejeita_quando_fila_cheia():
+    liberar = threading.Event()
+
+    async def _cenario():
+        pool = PoolSenhas(max_workers=1, max_fila=1)
+        ocupadas = [asyncio.create_task(pool.executar(liberar.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        assert pool.profundidade_fila == 1
+        with pytest.raises(HTTPException) as erro:
+            await pool.executar(liberar.wait)
+        liberar.set()
+        await asyncio.gather(*ocupadas)
+        return pool, erro.value
+
+    pool, erro = asyncio.run(_cenario())
+
+    assert erro.status_code == 503
+    assert pool.rejeitadas == 1
+    assert pool.pendentes == 0
+
+
+def test_login_com_senha_errada_retorna_400(client, criar_usuario):
+    criar_usuario("ana@teste.com")
+
+    resposta = client.post(
+        "/auth/login", json={"email": "ana@teste.com", "senha": "errada"}
+    )
+
+    assert resposta.status_code == 400
+
+
+def test_login_com_fila_cheia_retorna_503(client, criar_usuario, monkeypatch):
+    criar_usuario("ana@teste.com")
+    monkeypatch.setattr(pool_senhas, "max_workers", 0)
+    monkeypatch.setattr(pool_senhas, "max_fila", 0)
+
+    resposta = client.post(
+        "/auth/login", json={"email": "ana@teste.com", "senha": "senha123"}
+    )
+
+    assert resposta.status_code == 503
+    assert resposta.headers["retry-after"] == "1"
@@ -0,0 +1,78 @@
+import threading
+import time
+
+import pytest
+
+from backend import token_store as modulo_token_store
+from backend.token_store import (
+    TokenStoreArquivo,
+    TokenStoreMemoria,
+    TokenStoreNulo,
+    criar_token_store,
+)
+
+
+def test_criar_token_store_por_modo():
+    assert isinstance(criar_token_store("nulo"), TokenStoreNulo)
+    assert isinstance(criar_token_store("memoria"), TokenStoreMemoria)
+    with pytest.raises(ValueError):
+        criar_token_store("disco")
+
+
+def test_login_entrega_tokens_ao_store(
+    client, criar_usuario, senha_padrao, monkeypatch
+):
+    store = TokenStoreMemoria()
+    monkeypatch.setattr("backend.auth_routes.token_store", store)
+    criar_usuario("ana@teste.com")
+
+    resposta = client.post(
+        "/auth/login", json={"email": "ana@teste.com", "senha": senha_padrao}
+    ).json()
+
+    assert store.ultimo["access_token"] == resposta["access_token"]
+    assert store.ultimo["refresh_token"] == resposta["refresh_token"]
+
+
+def test_store_arquivo_grava_em_segundo_plano_e_agrupa():
+    gravados = []
+    liberar = threading.Event()
+
+    def _gravar(access_token, refresh_token=None):
+        liberar.wait(5)
+        gravados.append(access_token)
+
+    store = TokenStoreArquivo(gravar=_gravar)
+    for n in range(5):
+        store.salvar(f"access-{n}", "refresh")
+    liberar.set()
+    store.fechar()
+
+    # the first write may have started before the rest were queued
+    assert gravados[-1] == "access-4"
+    assert len(gravados) <= 2
+
+
+def test_store_arquivo_sobrevive_a_erro_de_gravacao(caplog):
+    gravados = []
+
+    def _gravar(access_token, refresh_token=None):
+        if access_token == "access-falha":
+            raise OSError("No space left on device")
+        gravados.append(access_token)
+
+    store = TokenStoreArquivo(gravar=_gravar)
+    store.salvar("access-falha", "refresh")
+    store.fechar()
+    store.salvar("access-depois", "refresh")
+
+    inicio = time.perf_counter()
+    store.fechar()
+
+    assert time.perf_counter() - inicio < 1
+    assert gravados == ["access-depois"]
+    assert "Erro ao gravar tokens" in caplog.text
+
+
+def test_store_padrao_nao_grava_nada():
+    assert isinstance(modulo_token_store.token_store, TokenStoreNulo)
@@ -0,0 +1,115 @@
+"""Server-side persistence of issued tokens.
+
+Login and token refresh hand their tokens to `token_store`, which is chosen by the
+`TOKEN_STORE` setting:
+
+- "nulo": tokens are not kept anywhere (production).
+- "memoria": the latest tokens are kept in memory, for tests and debugging.
+- "arquivo": the latest tokens are written to the `tokens/` folder by a background
+  thread, so the request never waits for the filesystem.
+"""
+
+import logging
+import queue
+import threading
+from datetime import datetime
+
+from backend.config import TOKEN_STORE
+from backend.utils import save_token_to_file
+
+
+class TokenStoreNulo:
+    """Token store that discards every token."""
+
+    def salvar(self, access_token: str, refresh_token: str | None = None):
+        """Discards the tokens."""
+
+    def fechar(self):
+        """Nothing to write."""
+
+
+class TokenStoreMemoria:
+    """Token store that keeps the latest tokens in memory.
+
+    Attributes:
+        ultimo (dict | None): The latest access/refresh tokens and when they were saved.
+    """
+
+    def __init__(self):
+        self.ultimo = None
+
+    def salvar(self, access_token: str, refresh_token: str | None = None):
+        """Replaces the latest tokens."""
+        self.ultimo = {
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "created_at": datetime.now().isoformat(),
+        }
+
+    def fechar(self):
+        """Nothing to write."""
+
+
+class TokenStoreArquivo:
+    """Write-behind token store that saves the latest tokens to files.
+
+    `salvar` only enqueues the tokens; a single background thread writes them with
+    `save_token_to_file`. Tokens queued while a write is in progress are coalesced, so
+    only the most recent pair is written and concurrent logins never race on the files.
+    A failed write is logged and skipped, so the thread keeps serving later tokens.
+    """
+
+    def __init__(self, gravar=save_token_to_file):
+        self._gravar = gravar
+        self._fila = queue.SimpleQueue()
+        self._thread = threading.Thread(
+            target=self._executar, name="token-store", daemon=True
+        )
+        self._thread.start()
+
+    def salvar(self, access_token: str, refresh_token: str | None = None):
+        """Schedules the tokens to be written and returns immediately."""
+        self._fila.put((access_token, refresh_token))
+
+    def fechar(self, timeout: float = 5.0):
+        """Waits until the tokens queued so far have been written."""
+        gravado = threading.Event()
+        self._fila.put(gravado)
+        gravado.wait(timeout)
+
+    def _executar(self):
+        while True:
+            pendentes = [self._fila.get()]
+            while True:
+                try:
+                    pendentes.append(self._fila.get_nowait())
+                except queue.Empty:
+                    break
+            tokens = [item for item in pendentes if isinstance(item, tuple)]
+            if tokens:
+                try:
+                    self._gravar(*tokens[-1])
+                except Exception:
+                    logging.exception("Erro ao gravar tokens em segundo plano")
+            for item in pendentes:
+                if isinstance(item, threading.Event):
+                    item.set()
+
+
+def criar_token_store(modo: str):
+    """Builds the token store for a `TOKEN_STORE` mode.
+
+    Raises:
+        ValueError: If the mode is unknown.
+    """
+    if modo == "nulo":
+        return TokenStoreNulo()
+    if modo == "memoria":
+        return TokenStoreMemoria()
+    if modo == "arquivo":
+        return TokenStoreArquivo()
+    raise ValueError(f"TOKEN_STORE inválido: {modo!r} (use nulo, memoria ou arquivo)")
+
+
+token_store = criar_token_store(TOKEN_STORE)
+"""Process-wide token store used by the authentication routes."""
@@ -90,6 +90,21 @@ def api_get(endpoint):
         messagebox.showerror("Erro", str(e))
 
 
+def api_get_paginado(endpoint):
+    """Segue `next_cursor` até a última página e devolve todos os `pedidos`."""
+    pedidos = []
+    cursor = None
+    while True:
+        url = f"{endpoint}?cursor={cursor}" if cursor else endpoint
+        pagina = api_get(url)
+        if not pagina:
+            return pedidos
+        pedidos.extend(pagina["pedidos"])
+        cursor = pagina.get("next_cursor")
+        if not cursor:
+            return pedidos
+
+
 def api_delete(endpoint):
     token = get_token()
     if not token:
@@ -142,7 +157,7 @@ def run():
             return
 
         # resultado = api_get(f"/pedidos/usuario_id={id_usuario}")  # Pass
-        resultado = api_get("/pedidos/listar/pedidos-usuario")
+        resultado = api_get_paginado("/pedidos/listar/pedidos-usuario")
         if resultado:
             pedidos = "\n".join(
                 [f"ID {p['id']} - Status: {p['status']}" for p in resultado]
@@ -365,12 +365,15 @@ def listar_pedidos():
     try:
         result = api_request("GET", "/pedidos/listar/pedidos-usuario")
         if result:
-            # Fix: result is already a list, not a dict with 'pedidos' key
-            if isinstance(result, list):
-                pedidos = result
-            else:
-                # Fallback for dict response format
-                pedidos = result.get("pedidos", [])
+            # A resposta é paginada: segue next_cursor até a última página
+            pedidos = list(result["pedidos"])
+            while result and result.get("next_cursor"):
+                result = api_request(
+                    "GET",
+                    f"/pedidos/listar/pedidos-usuario?cursor={result['next_cursor']}",
+                )
+                if result:
+                    pedidos.extend(result["pedidos"])
 
             if not pedidos:
                 st.info("Você não tem nenhum pedido registrado.")